@@ -0,0 +1,132 @@
+"""
+Centralized prioritized planning vs the greedy per-robot behaviour.
+
+Greedy: every robot takes its shortest path and waits until it can reserve
+every lane of it exclusively (TrafficManager.reserve_path), as the movement
+threads do. A greedy run succeeds only if no robot drives through a vertex
+where another robot is parked (on its start before leaving, on its goal after
+arriving); lane exclusivity itself never conflicts.
+
+Prioritized: PrioritizedPlanner plans every robot at once; a run succeeds if
+it returns a complete collision-free set of schedules within the budget.
+
+Makespan is the arrival time of the last robot, in seconds at constant speed.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_planner
+"""
+import heapq
+import json
+import random
+import statistics
+import time
+from benchmarks.bench_bidirectional import make_grid
+from src.controllers.traffic_manager import TrafficManager
+from src.models.compiled_graph import CompiledGraph
+from src.utils.helper import PathFinder
+from src.utils.multi_agent_planner import PrioritizedPlanner
+
+BUNDLED_GRAPHS = ["data/nav_graph_1.json", "data/nav_graph_2.json", "data/nav_graph_3.json"]
+SYNTHETIC_SIZES = [1_600, 2_500]
+SYNTHETIC_ROBOTS = 200
+SEEDS = 5
+SPEED = 1.0
+BUDGET = 10.0
+
+
+def load_graph(path: str) -> CompiledGraph:
+    with open(path) as file:
+        data = json.load(file)
+    return CompiledGraph.from_nav_graph(data["levels"][next(iter(data["levels"]))])
+
+
+def make_requests(graph: CompiledGraph, robots: int, seed: int) -> dict:
+    """Distinct starts and distinct goals, each robot moving somewhere else"""
+    rng = random.Random(seed)
+    vertices = rng.sample(range(graph.num_vertices), 2 * robots)
+    return {f"R{i}": (vertices[i], vertices[robots + i]) for i in range(robots)}
+
+
+def simulate_greedy(graph: CompiledGraph, requests: dict):
+    """Event-driven run of shortest paths with exclusive whole-path reservations"""
+    manager = TrafficManager()
+    paths = {robot_id: PathFinder.find_path(graph, s, e) for robot_id, (s, e) in requests.items()}
+    waiting = [robot_id for robot_id in requests if paths[robot_id]]
+    timelines, driving, now = {}, [], 0.0
+
+    while waiting or driving:
+        for robot_id in list(waiting):
+            path = paths[robot_id]
+            if manager.reserve_path(robot_id, path):
+                waiting.remove(robot_id)
+                arrivals = [now]
+                for u, v in zip(path, path[1:]):
+                    arrivals.append(arrivals[-1] + graph.lane_length(u, v) / SPEED)
+                timelines[robot_id] = arrivals
+                heapq.heappush(driving, (arrivals[-1], robot_id))
+        if not driving:
+            break
+        now, robot_id = heapq.heappop(driving)
+        manager.release_path(robot_id, paths[robot_id])
+
+    # Parked robots block their start until departure and their goal after arrival
+    parked = {}
+    for robot_id, (start_idx, end_idx) in requests.items():
+        arrivals = timelines.get(robot_id)
+        if arrivals is None:
+            continue
+        parked.setdefault(start_idx, []).append((0.0, arrivals[0], robot_id))
+        parked.setdefault(end_idx, []).append((arrivals[-1], float('inf'), robot_id))
+    conflicts = 0
+    for robot_id, arrivals in timelines.items():
+        for vertex, t in zip(paths[robot_id], arrivals):
+            conflicts += sum(1 for start, end, other in parked.get(vertex, ())
+                             if other != robot_id and start <= t < end)
+
+    unreachable = len(requests) - len(timelines)
+    makespan = max((arrivals[-1] for arrivals in timelines.values()), default=0.0)
+    return conflicts == 0 and unreachable == 0, makespan
+
+
+def run_prioritized(graph: CompiledGraph, requests: dict):
+    planner = PrioritizedPlanner(graph, default_speed=SPEED, margin=0.5, time_budget=BUDGET)
+    start = time.perf_counter()
+    plans = planner.plan(requests)
+    elapsed = time.perf_counter() - start
+    if plans is None:
+        return False, None, elapsed
+    return True, max(schedule[-1][1] for schedule in plans.values()), elapsed
+
+
+def compare(name: str, graph: CompiledGraph, robots: int):
+    greedy_ok, greedy_span, prio_ok, prio_span, prio_time = [], [], [], [], []
+    for seed in range(SEEDS):
+        requests = make_requests(graph, robots, seed)
+        ok, span = simulate_greedy(graph, requests)
+        greedy_ok.append(ok)
+        greedy_span.append(span)
+        ok, span, elapsed = run_prioritized(graph, requests)
+        prio_ok.append(ok)
+        prio_time.append(elapsed)
+        if ok:
+            prio_span.append(span)
+
+    def mean(values):
+        return f"{statistics.mean(values):7.1f}" if values else "    n/a"
+
+    print(f"{name:22s} robots={robots:3d}  "
+          f"greedy: success {sum(greedy_ok)}/{SEEDS} makespan {mean(greedy_span)}s  |  "
+          f"prioritized: success {sum(prio_ok)}/{SEEDS} makespan {mean(prio_span)}s "
+          f"plan time {mean(prio_time)}s")
+
+
+def main():
+    for path in BUNDLED_GRAPHS:
+        graph = load_graph(path)
+        compare(path.split("/")[-1], graph, max(2, graph.num_vertices // 4))
+    for size in SYNTHETIC_SIZES:
+        compare(f"grid {size}", make_grid(size, seed=3, drop_rate=0.05), SYNTHETIC_ROBOTS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Bidirectional vs unidirectional A* on synthetic grids.
+
+Run from the repository root:
+    python -m benchmarks.bench_bidirectional
+"""
+import random
+import time
+from src.models.compiled_graph import CompiledGraph
+from src.models.congestion_map import cost_factors
+from src.utils.helper import PathFinder
+
+SIZES = [1_000, 10_000, 100_000]
+QUERIES = {1_000: 200, 10_000: 50, 100_000: 10}
+# Fraction of grid lanes removed: an open floor and an aisle-like layout with dead ends
+LAYOUTS = {"open": 0.1, "blocked": 0.35}
+
+
+def make_grid(num_vertices: int, seed: int = 0, drop_rate: float = 0.1) -> CompiledGraph:
+    """Jittered square grid with a fraction of lanes removed"""
+    rng = random.Random(seed)
+    width = int(num_vertices ** 0.5)
+    height = num_vertices // width
+    vertices = [[x + rng.uniform(-0.2, 0.2), y + rng.uniform(-0.2, 0.2), {}]
+                for y in range(height) for x in range(width)]
+    lanes = []
+    for y in range(height):
+        for x in range(width):
+            idx = y * width + x
+            if x + 1 < width and rng.random() > drop_rate:
+                lanes.append([idx, idx + 1, {"speed_limit": 0}])
+            if y + 1 < height and rng.random() > drop_rate:
+                lanes.append([idx, idx + width, {"speed_limit": 0}])
+    return CompiledGraph(vertices, lanes)
+
+
+def make_congestion(graph: CompiledGraph, seed: int = 0, fraction: float = 0.2) -> list:
+    """Cost factor per lane id, for congestion on a random fraction of lanes"""
+    rng = random.Random(seed)
+    levels = [rng.uniform(0.1, 2.0) if rng.random() < fraction else 0.0 for _ in range(graph.num_lanes)]
+    return cost_factors(levels).tolist()
+
+
+def path_cost(graph: CompiledGraph, path, congestion) -> float:
+    total = 0.0
+    for u, v in zip(path, path[1:]):
+        factor = congestion[graph.lane_id(u, v)] if congestion is not None else 1
+        total += graph.lane_length(u, v) * factor
+    return total
+
+
+def run(search, graph, queries, congestion):
+    expanded, paths = 0, []
+    start_time = time.perf_counter()
+    for start_idx, end_idx in queries:
+        stats = {}
+        paths.append(search(graph, start_idx, end_idx, congestion, stats))
+        expanded += stats["expanded"]
+    elapsed = time.perf_counter() - start_time
+    return paths, expanded / len(queries), elapsed / len(queries)
+
+
+def main():
+    print(f"{'vertices':>9} {'layout':>8} {'weights':>10} {'uni exp':>9} {'bi exp':>9} "
+          f"{'uni ms':>9} {'bi ms':>9} {'speedup':>8}")
+    for size in SIZES:
+        for layout, drop_rate in LAYOUTS.items():
+            graph = make_grid(size, drop_rate=drop_rate)
+            rng = random.Random(size)
+            queries = [(rng.randrange(graph.num_vertices), rng.randrange(graph.num_vertices))
+                       for _ in range(QUERIES[size])]
+            for label, congestion in (("distance", None), ("congested", make_congestion(graph))):
+                uni_paths, uni_exp, uni_time = run(PathFinder._a_star_search, graph, queries, congestion)
+                bi_paths, bi_exp, bi_time = run(PathFinder._bidirectional_search, graph, queries, congestion)
+
+                for uni, bi in zip(uni_paths, bi_paths):
+                    assert bool(uni) == bool(bi)
+                    assert abs(path_cost(graph, uni, congestion) - path_cost(graph, bi, congestion)) < 1e-6
+
+                print(f"{graph.num_vertices:>9} {layout:>8} {label:>10} {uni_exp:>9.0f} {bi_exp:>9.0f} "
+                      f"{uni_time * 1e3:>9.2f} {bi_time * 1e3:>9.2f} {uni_time / bi_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
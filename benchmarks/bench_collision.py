@@ -0,0 +1,131 @@
+"""
+Per-tick collision checking for large fleets.
+
+Robots drive along the lanes of a grid (lanes 10 map units long) at 2 units/s
+and are checked every 0.1 s tick with the 2 unit collision distance.
+"pairwise" is the previous TrafficManager.detect_collision: a Python spatial
+hash with per-pair distance checks, on current positions only. "vectorized"
+is CollisionChecker, which also checks the segment every robot sweeps during
+the tick. Its results are verified against a brute-force all-pairs check.
+
+Run from the repository root:
+    python -m benchmarks.bench_collision
+"""
+import statistics
+import time
+from collections import defaultdict
+import numpy as np
+from benchmarks.bench_bidirectional import make_grid
+from src.utils.collision_checker import CollisionChecker
+
+FLEET_SIZES = [500, 1_000, 2_000, 5_000]
+GRID_VERTICES = 10_000
+SCALE = 10.0
+SPEED = 2.0
+TICK = 0.1
+TICKS = 50
+THRESHOLD = 2.0
+
+
+def pairwise(robot_positions: dict, threshold: float):
+    """The spatial-hash check TrafficManager.detect_collision used before"""
+    grid_size = threshold * 2
+    spatial_grid = defaultdict(list)
+    for robot_id, pos in robot_positions.items():
+        spatial_grid[(int(pos[0] / grid_size), int(pos[1] / grid_size))].append((robot_id, pos))
+
+    def distance(p1, p2):
+        return ((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5
+
+    collisions = []
+    for (grid_x, grid_y), robots in spatial_grid.items():
+        for i in range(len(robots)):
+            id1, pos1 = robots[i]
+            for j in range(i + 1, len(robots)):
+                id2, pos2 = robots[j]
+                if distance(pos1, pos2) < threshold:
+                    collisions.append((id1, id2))
+        for dx, dy in [(1, 0), (0, 1), (1, 1), (-1, 1)]:
+            for id1, pos1 in robots:
+                for id2, pos2 in spatial_grid.get((grid_x + dx, grid_y + dy), ()):
+                    if distance(pos1, pos2) < threshold:
+                        collisions.append((id1, id2))
+    return collisions
+
+
+def brute_force(positions: np.ndarray, next_positions: np.ndarray, threshold: float) -> set:
+    """Every pair whose closest approach during the tick is below threshold"""
+    motion = next_positions - positions
+    d0 = positions[None, :, :] - positions[:, None, :]
+    dv = motion[None, :, :] - motion[:, None, :]
+    dv_sq = (dv * dv).sum(axis=2)
+    s = np.clip(-(d0 * dv).sum(axis=2) / np.maximum(dv_sq, 1e-12), 0.0, 1.0)
+    closest = d0 + s[:, :, None] * dv
+    i, j = np.nonzero(np.triu((closest * closest).sum(axis=2) < threshold ** 2, k=1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+class Fleet:
+    """Robots driving random lanes; a robot reaching the end of its lane picks a new one"""
+
+    def __init__(self, graph, robots: int, seed: int):
+        self.rng = np.random.default_rng(seed)
+        coords = np.array(graph.coords) * SCALE
+        lanes = np.array(graph.lane_keys)
+        self.starts, self.ends = coords[lanes[:, 0]], coords[lanes[:, 1]]
+        self.lengths = np.hypot(*(self.ends - self.starts).T)
+        self.lane = self.rng.integers(len(lanes), size=robots)
+        self.progress = self.rng.random(robots)
+
+    def positions(self, progress: np.ndarray) -> np.ndarray:
+        start, end = self.starts[self.lane], self.ends[self.lane]
+        return start + progress[:, None] * (end - start)
+
+    def tick(self):
+        """Current positions and positions one tick later"""
+        progress_next = np.minimum(self.progress + SPEED * TICK / self.lengths[self.lane], 1.0)
+        current, after = self.positions(self.progress), self.positions(progress_next)
+        self.progress = progress_next
+        done = self.progress >= 1.0
+        self.lane[done] = self.rng.integers(len(self.starts), size=int(done.sum()))
+        self.progress[done] = 0.0
+        return current, after
+
+
+def run(graph, robots: int):
+    fleet = Fleet(graph, robots, seed=robots)
+    checker = CollisionChecker(THRESHOLD)
+    pairwise_times, vector_times, mismatches, points, swept = [], [], 0, 0, 0
+    for tick in range(TICKS):
+        current, after = fleet.tick()
+        robot_positions = {f"R{i}": tuple(p) for i, p in enumerate(current.tolist())}
+
+        start = time.perf_counter()
+        pairwise(robot_positions, THRESHOLD)
+        pairwise_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        report = checker.check(current, after)
+        vector_times.append(time.perf_counter() - start)
+
+        points += len(report.point_pairs())
+        swept += len(report.swept_pairs())
+        if tick % 10 == 0 and robots <= 2_000:
+            found = set(map(tuple, report.pairs.tolist()))
+            mismatches += len(found ^ brute_force(current, after, THRESHOLD))
+
+    print(f"robots={robots:5d}  pairwise {statistics.median(pairwise_times) * 1e3:7.3f} ms  "
+          f"vectorized {statistics.median(vector_times) * 1e3:6.3f} ms "
+          f"(p95 {np.percentile(vector_times, 95) * 1e3:6.3f})  "
+          f"conflicts/tick point {points / TICKS:5.1f} swept {swept / TICKS:4.1f}  "
+          f"mismatches vs brute force {mismatches if robots <= 2_000 else 'n/a'}")
+
+
+def main():
+    graph = make_grid(GRID_VERTICES, seed=4, drop_rate=0.05)
+    for robots in FLEET_SIZES:
+        run(graph, robots)
+
+
+if __name__ == "__main__":
+    main()
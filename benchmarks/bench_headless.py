@@ -0,0 +1,81 @@
+"""
+Headless fleet run: FleetManager, robots and the tick scheduler with no GUI.
+
+Robots are spawned on a grid navigation graph (tkinter is never imported)
+and sent to random free vertices; the scheduler then ticks at its normal
+rate for a fixed wall-clock time. Reports spawn time, the cost of the first
+tick (which plans every robot) and of the ticks after it, and how many robots
+arrived. Robot logs go to a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_headless
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks.bench_bidirectional import make_grid
+from src.controllers.fleet_manager import FleetManager
+from src.utils.logger import robot_logger
+
+FLEET_SIZES = [25, 100, 200]
+GRID_VERTICES = 900
+SCALE = 1.0
+RUN_SECONDS = 30.0
+
+
+def grid_level(num_vertices: int) -> dict:
+    """Navigation graph level in the nav_graph JSON layout"""
+    graph = make_grid(num_vertices, seed=5, drop_rate=0.05)
+    vertices = [[x * SCALE, y * SCALE, {"name": f"V{i}"}] for i, (x, y) in enumerate(graph.coords)]
+    lanes = [[u, v, {"speed_limit": 0}] for u, v in graph.lane_keys]
+    return {"vertices": vertices, "lanes": lanes}
+
+
+def run(level: dict, robots: int):
+    rng = random.Random(robots)
+    fleet = FleetManager()
+    fleet.set_nav_graph(level)
+    starts = rng.sample(range(len(level["vertices"])), 2 * robots)
+
+    start = time.perf_counter()
+    for vertex_idx in starts[:robots]:
+        fleet.spawn_robot(vertex_idx)
+    spawn_time = time.perf_counter() - start
+    for robot, vertex_idx in zip(fleet.robots, starts[robots:]):
+        fleet.set_robot_destination(robot.robot_id, vertex_idx)
+
+    scheduler = fleet.scheduler
+    for robot in fleet.robots:
+        scheduler.add(robot, fleet.robot_destinations[robot.robot_id])
+    tick_times = []
+    period = 1.0 / scheduler.tick_rate
+    deadline = time.monotonic() + RUN_SECONDS
+    while scheduler.active() and time.monotonic() < deadline:
+        started = time.perf_counter()
+        scheduler.tick()
+        elapsed = time.perf_counter() - started
+        tick_times.append(elapsed)
+        time.sleep(max(0.0, period - elapsed))
+
+    statuses = [status for _, status in scheduler.snapshot()["robots"].values()]
+    first, rest = tick_times[0], tick_times[1:] or [0.0]
+    print(f"robots={robots:4d}  spawn {spawn_time * 1e3 / robots:6.3f} ms/robot  "
+          f"first tick {first * 1e3:8.1f} ms  "
+          f"then mean {statistics.mean(rest) * 1e3:6.2f} ms max {max(rest) * 1e3:7.2f} ms "
+          f"over {len(rest)} ticks  "
+          f"arrived {statuses.count('idle')}/{robots} in {RUN_SECONDS:.0f}s  "
+          f"tkinter loaded: {'tkinter' in sys.modules}")
+
+
+def main():
+    level = grid_level(GRID_VERTICES)
+    with tempfile.TemporaryDirectory() as log_dir:
+        robot_logger.log_dir = log_dir
+        for robots in FLEET_SIZES:
+            run(level, robots)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Process-pool planning of a 10k-query wave against in-process planning.
+
+The same congested batch is planned with PathFinder in this process and
+with ProcessPlanner at 1, 2, 4, ... workers (up to the CPU count); each
+pool is started, and its workers attached to the shared graph, before
+timing. Results are checked against the in-process paths.
+
+Run from the repository root:
+    python -m benchmarks.bench_process_planner
+"""
+import os
+import random
+import time
+from benchmarks.bench_bidirectional import make_grid
+from src.models.congestion_map import CongestionMap
+from src.utils.helper import PathFinder
+from src.utils.process_planner import ProcessPlanner
+
+GRID_VERTICES = 2_500
+QUERIES = 10_000
+
+
+def worker_counts():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main():
+    graph = make_grid(GRID_VERTICES, seed=11, drop_rate=0.1)
+    rng = random.Random(11)
+    queries = [(rng.randrange(graph.num_vertices), rng.randrange(graph.num_vertices))
+               for _ in range(QUERIES)]
+    congestion = CongestionMap(graph.num_lanes)
+    congestion.record(rng.sample(range(graph.num_lanes), graph.num_lanes // 5), 0.5)
+    snapshot = congestion.snapshot()
+
+    factors = snapshot.factors()
+    start = time.perf_counter()
+    expected = [PathFinder._bidirectional_search(graph, s, e, factors) if s != e else []
+                for s, e in queries]
+    serial = time.perf_counter() - start
+    print(f"{QUERIES} queries on {graph.num_vertices} vertices, {os.cpu_count()} CPUs")
+    print(f"  in process  {serial:7.2f}s")
+
+    baseline = None
+    for workers in worker_counts():
+        with ProcessPlanner(graph, workers) as planner:
+            # Start every worker (attaching it to the shared graph) before timing
+            planner.plan_batch([(0, 1)] * workers * 4)
+            start = time.perf_counter()
+            paths = planner.plan_batch(queries, snapshot)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        mismatches = sum(path != want for path, want in zip(paths, expected))
+        print(f"  {workers:2d} workers  {elapsed:7.2f}s  speedup {baseline / elapsed:5.2f}x "
+              f"(ideal {workers}x)  mismatches {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
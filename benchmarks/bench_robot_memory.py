@@ -0,0 +1,54 @@
+"""
+Memory held per robot by a headless fleet.
+
+Spawns robots on a grid navigation graph with no GUI and measures, with
+tracemalloc, the Python memory the fleet gains per robot; then measures it
+again once each robot has been asked its position and status (as the tick
+scheduler does every tick) and has a path history. Robot logs go to a
+temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_robot_memory
+"""
+import gc
+import random
+import tempfile
+import tracemalloc
+from benchmarks.bench_headless import grid_level
+from src.controllers.fleet_manager import FleetManager
+from src.utils.logger import robot_logger
+
+ROBOTS = 10_000
+GRID_VERTICES = 2_500
+
+
+def traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    robot_logger.log_dir = tempfile.mkdtemp(prefix="robot_logs_")
+    fleet = FleetManager()
+    fleet.set_nav_graph(grid_level(GRID_VERTICES))
+    rng = random.Random(25)
+    vertices = [rng.randrange(GRID_VERTICES) for _ in range(ROBOTS)]
+
+    tracemalloc.start()
+    before = traced_bytes()
+    for vertex_idx in vertices:
+        fleet.spawn_robot(vertex_idx)
+    spawned = traced_bytes()
+    for robot in fleet.robots:
+        robot.position, robot.status
+        robot.path_history.extend(range(8))
+    used = traced_bytes()
+    tracemalloc.stop()
+
+    print(f"{ROBOTS} robots")
+    print(f"  spawned        {(spawned - before) / ROBOTS:7.0f} bytes per robot")
+    print(f"  with history   {(used - before) / ROBOTS:7.0f} bytes per robot")
+
+
+if __name__ == "__main__":
+    main()
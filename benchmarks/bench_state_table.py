@@ -0,0 +1,91 @@
+"""
+Shared-memory robot state table: writer cost and cross-process reads.
+
+This process writes every row of a RobotStateTable at a fixed rate, as the
+tick scheduler does after each tick, while a reader process attached to it
+takes snapshots as fast as it can. Every write keeps y == -x and
+lane == x % 1000 within a row, so the reader can check that no snapshot
+ever holds a torn row. Reports write and snapshot cost and any torn rows
+the reader saw.
+
+Run from the repository root:
+    python -m benchmarks.bench_state_table
+"""
+import multiprocessing
+import time
+import numpy as np
+from src.models.robot_state_table import ROW, RobotStateTable
+
+FLEETS = [1_000, 10_000]
+WRITES = 200
+TICK_RATE = 100.0
+
+
+class StubRobot:
+    """The attributes of a Robot the table writes"""
+
+    def __init__(self, robot_id):
+        self.robot_id = robot_id
+        self.status = "moving"
+        self.battery_level = 100.0
+        self.lane = 0
+
+    def current_lane(self, now):
+        return self.lane
+
+
+def read_until_done(name, capacity, done, results):
+    table = RobotStateTable.attach(name, capacity)
+    snapshots = torn = 0
+    elapsed = 0.0
+    while not done.is_set():
+        start = time.perf_counter()
+        rows = table.snapshot()
+        elapsed += time.perf_counter() - start
+        snapshots += 1
+        torn += int(np.count_nonzero((rows["y"] != -rows["x"]) |
+                                     (rows["lane"] != rows["x"].astype(np.int64) % 1000) |
+                                     (rows["seq"] & 1).astype(bool)))
+    table.close()
+    results.put((snapshots, elapsed, torn))
+
+
+def run(count):
+    table = RobotStateTable.create(count)
+    robots = [StubRobot(f"R{i + 1}") for i in range(count)]
+    table.write_robots(robots, [(0.0, 0.0)] * count, 0.0)
+
+    done, results = multiprocessing.Event(), multiprocessing.Queue()
+    reader = multiprocessing.Process(target=read_until_done, args=(table.name, count, done, results))
+    reader.start()
+    time.sleep(0.5)
+
+    period = 1.0 / TICK_RATE
+    writing = 0.0
+    for k in range(1, WRITES + 1):
+        for robot in robots:
+            robot.lane = k % 1000
+            robot.battery_level = 100.0 - k % 100
+        positions = [(float(k), float(-k))] * count
+        start = time.perf_counter()
+        table.write_robots(robots, positions, float(k))
+        writing += time.perf_counter() - start
+        time.sleep(period)
+    done.set()
+    snapshots, reading, torn = results.get()
+    reader.join()
+    table.close()
+
+    print(f"{count} robots, {ROW.itemsize} bytes per row")
+    print(f"  write  {writing / WRITES * 1e3:7.3f} ms per tick ({writing / WRITES / count * 1e9:.0f} ns per robot)")
+    print(f"  read   {reading / max(snapshots, 1) * 1e3:7.3f} ms per snapshot, {snapshots} snapshots")
+    print(f"  torn rows seen by the reader: {torn}")
+
+
+def main():
+    for count in FLEETS:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Local harness for zone-sharded traffic management.
+
+Starts one worker process per zone on this machine (2x2 and 4x2 grids of
+zones over a grid navigation graph), books random paths for a fleet of
+robots in waves (each wave what the zones grant), and drives every booked
+robot through its zones, handing it off at each zone border. Reports booking
+time and cross-zone handoff latency, and checks through the zones'
+congestion that every lane driven was recorded by the zone that owns it.
+
+Run from the repository root:
+    python -m benchmarks.bench_zone_handoff
+"""
+import random
+import statistics
+import time
+from benchmarks.bench_bidirectional import make_grid
+from src.controllers.zone_traffic import ZonedTrafficManager
+from src.utils.helper import PathFinder
+
+GRID_VERTICES = 2_500
+ROBOTS = 400
+ZONE_GRIDS = [(2, 2), (4, 2)]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(graph, paths, columns, rows):
+    waiting = dict(paths)
+    booking = 0.0
+    waves = crossing = 0
+    driven = set()
+    with ZonedTrafficManager(graph, columns, rows) as traffic:
+        # Book what the zones grant, drive it to completion, then book the rest
+        while waiting:
+            start = time.perf_counter()
+            granted = traffic.reserve_paths(waiting)
+            booking += time.perf_counter() - start
+            waves += 1
+            moving = [robot_id for robot_id, ok in granted.items() if ok]
+            for robot_id in moving:
+                del waiting[robot_id]
+                crossing += len(traffic.segments[robot_id]) > 1
+                for _, lane_ids in traffic.segments[robot_id]:
+                    driven.update(lane_ids)
+            while moving:
+                zones = traffic.handoff(moving)
+                moving = [robot_id for robot_id, zone in zones.items() if zone is not None]
+        levels = traffic.congestion_levels(driven)
+
+    latencies = [latency * 1e3 for latency in traffic.handoff_latencies]
+    print(f"{traffic.partition.num_zones} zones ({columns}x{rows}), "
+          f"{len(traffic.partition.border_lanes)} border lanes")
+    print(f"  booked {len(paths)} paths in {waves} waves, {booking * 1e3:.1f} ms booking, "
+          f"{crossing} crossing zone borders")
+    if latencies:
+        print(f"  {len(latencies)} handoffs: p50 {percentile(latencies, 0.5):.3f} ms  "
+              f"p95 {percentile(latencies, 0.95):.3f} ms  p99 {percentile(latencies, 0.99):.3f} ms  "
+              f"mean {statistics.mean(latencies):.3f} ms")
+    unrecorded = sum(level <= 0 for level in levels.values())
+    print(f"  driven lanes without congestion: {unrecorded}/{len(levels)}")
+
+
+def main():
+    graph = make_grid(GRID_VERTICES, seed=23, drop_rate=0.1)
+    rng = random.Random(23)
+    paths = {}
+    while len(paths) < ROBOTS:
+        start_idx, end_idx = rng.randrange(graph.num_vertices), rng.randrange(graph.num_vertices)
+        path = PathFinder.search(graph, start_idx, end_idx) if start_idx != end_idx else []
+        if len(path) > 1:
+            paths[f"R{len(paths) + 1}"] = path
+    for columns, rows in ZONE_GRIDS:
+        run(graph, paths, columns, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,94 @@
 import json
 import random
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from src.models.robots import Robot
 import time
 from collections import deque
 import threading
 from collections import defaultdict
 from src.controllers.traffic_manager import TrafficManager
+from src.controllers.tick_scheduler import TickScheduler
+from src.controllers.task_manager import TaskManager
 from src.utils.helper import PathFinder
+from src.models.compiled_graph import CompiledGraph
+from src.models.spatial_index import SpatialIndex
+from src.models.lane_polylines import LanePolylines
+from src.models.trajectory import Trajectory
+from src.models.vertex_occupancy import VertexOccupancy
+from src.models.robot_state_table import RobotStateTable
+from src.models.robot_store import RobotStore
+from src.utils.multi_agent_planner import PrioritizedPlanner, Schedule
+from src.utils.distance_table import DistanceTable
+from src.utils.path_cache import PathCache
+from src.utils.process_planner import ProcessPlanner
 import math
-from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from src.utils.logger import robot_logger
-from src.utils.logger import *
-import tkinter as tk
 class FleetManager:
-    def __init__(self):
+    # Smallest planning wave worth sending to the process planner
+    PROCESS_PLANNING_MIN = 256
+    # Fill color of a robot per status, shared by every robot and view
+    STATUS_COLORS = {
+        "moving": "#00FF00",
+        "waiting": "#FFFF00",
+        "charging": "#0000FF",
+        "idle": "#AAAAAA",
+        "blocked": "#FF0000",
+        "error": "#FFA500",
+        "task_assigned": "#FF00FF"
+    }
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        # Seconds used for trajectories, reservations and congestion decay; a
+        # VirtualClock when the fleet runs in the event simulator
+        self.clock = clock
         self.robots: List[Robot] = []
+        # Positions, status, battery and lanes of every robot; Robot objects are views of its rows
+        self.robot_store = RobotStore()
+        # Views of every robot (e.g. a canvas renderer), shared by all robots; empty when headless
+        self.robot_observers: list = []
         self.robot_counter: int = 0
         self.vertex_colors: Dict[int, str] = {}
         self.vertex_names: Dict[int, str] = {}
         self.nav_graph: Optional[dict] = None
+        self.graph: Optional[CompiledGraph] = None
+        self.vertex_index: Optional[SpatialIndex] = None
+        self.distance_table: Optional[DistanceTable] = None
+        self.polylines: Optional[LanePolylines] = None
+        self.path_resolution: float = 10.0
+        self.default_speed: float = 2.0
+        self.max_acceleration: float = 1.0
+        # "exclusive": hold every lane of the path until arrival
+        # "timed": book each lane only for the interval the robot is planned to be on it
+        self.reservation_mode: str = "exclusive"
+        # Plan every robot with a destination centrally before moving; falls back
+        # to per-robot planning when no complete plan is found within the budget
+        self.batch_planning: bool = False
+        self.batch_planning_budget: float = 1.0
+        # Seconds a robot queues for its path before replanning around the holders
+        self.reservation_wait_timeout: float = 2.0
         self.robot_destinations: Dict[str, tuple] = {}
         self.selected_robot: Optional[Robot] = None
         self.navigation_delay = 2.0  
         self.navigation_steps = 10
         self.traffic_manager = TrafficManager(self)     
-        self.path_cache = {}   
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        self.vertex_occupancy = {}
-
+        # Destinations queued per robot; the scheduler starts the next one on arrival
+        self.task_manager = TaskManager()
+        self.path_cache = PathCache(maxsize=1000)
+        # Worker processes for large planning waves; 0 plans every wave in this process
+        self.planning_workers: int = 0
+        self.process_planner: Optional[ProcessPlanner] = None
+        # Moves every robot from one thread; robots no longer get a thread each
+        self.tick_rate: float = 20.0
+        self.scheduler = TickScheduler(self, self.tick_rate, clock)
+        # Robots per vertex, updated as robots are placed and start trajectories
+        self.occupancy = VertexOccupancy(clock)
+        # Robot state in shared memory for readers in other processes; see share_robot_states
+        self.state_table: Optional[RobotStateTable] = None
+
+        # Lane key -> traffic light color, for lanes that were ever reserved
         self.lane_status = {}
+        self.lane_status_version: Optional[int] = None
         
         self.padding: int = 50
         self.vertex_radius: int = 15
@@ -48,13 +107,32 @@ class FleetManager:
             with open(file_path, "r") as file:
                 data = json.load(file)
                 level_name = next(iter(data["levels"]))
-                self.nav_graph = data["levels"][level_name]
-                self._initialize_vertex_data()
-                self._calculate_scaling_factors()
+                self.set_nav_graph(data["levels"][level_name])
             return True, "Graph loaded successfully"
         except Exception as e:
             return False, f"Error loading file: {str(e)}"
 
+    def set_nav_graph(self, nav_graph: dict):
+        """Use an already parsed level ({"vertices": [...], "lanes": [...]}) as the navigation graph"""
+        self.nav_graph = nav_graph
+        self.graph = CompiledGraph.from_nav_graph(self.nav_graph)
+        self.vertex_index = SpatialIndex(self.graph.coords)
+        self.distance_table = None
+        self.polylines = LanePolylines(self.graph, self.path_resolution)
+        self.path_cache.clear()
+        self.close_process_planner()
+        self._initialize_vertex_data()
+        self._calculate_scaling_factors()
+        self.update_vertex_occupancy()
+
+    def precompute_distance_tables(self, cache_dir: str = "cache", workers: Optional[int] = None) -> Tuple[bool, str]:
+        """Build (or load from cache) all-pairs distance and next-hop tables"""
+        if not self.nav_graph:
+            return False, "No graph loaded"
+        self.distance_table, cached = DistanceTable.load_or_build(
+            self.nav_graph, self.graph, cache_dir, workers)
+        return True, "Distance tables loaded from cache" if cached else "Distance tables computed"
+
     def _initialize_vertex_data(self):
         """Initialize vertex colors and names with  naming """
         self.vertex_colors = {}
@@ -102,7 +180,16 @@ class FleetManager:
 
     ### ROBOT MANAGEMENT FUNCTIONS 
 
-    def spawn_robot(self, vertex_idx: int, canvas) -> Tuple[Optional[Robot], str]:
+    def add_robot_observer(self, observer):
+        """
+        Attach a view (robot_spawned(robot), robot_changed(robot)) to every
+        robot, including those already spawned
+        """
+        self.robot_observers.append(observer)
+        for robot in self.robots:
+            observer.robot_spawned(robot)
+
+    def spawn_robot(self, vertex_idx: int) -> Tuple[Optional[Robot], str]:
         """Spawn a new robot with logging"""
         if not self.nav_graph or vertex_idx >= len(self.nav_graph["vertices"]):
             return None, "Invalid vertex index"
@@ -115,17 +202,9 @@ class FleetManager:
         robot = Robot(
             robot_id=robot_id,
             position=vertex,
-            canvas=canvas,
-            vertex_colors=self.vertex_colors,
-            fleet_manager=self,
-            padding=self.padding,
-            min_x=self.min_x,
-            min_y=self.min_y,
-            scale_x=self.scale_x,
-            scale_y=self.scale_y
+            fleet_manager=self
         )
         
-        robot.spawn()
         self.robots.append(robot)
         
         return robot, f"Spawned at {vertex_name}"
@@ -135,10 +214,9 @@ class FleetManager:
         if not self.nav_graph or vertex_idx >= len(self.nav_graph["vertices"]):
             return False, "Invalid vertex index"
         
-        for robot in self.robots:
-            if (self.get_vertex_index(robot.position) == vertex_idx and 
-                robot.robot_id != robot_id):  
-                return False, f"Vertex {self.vertex_names.get(vertex_idx, '')} occupied by {robot.robot_id}"
+        occupant = next((r for r in self.occupancy.occupants(vertex_idx) if r != robot_id), None)
+        if occupant:
+            return False, f"Vertex {self.vertex_names.get(vertex_idx, '')} occupied by {occupant}"
         
         robot = next((r for r in self.robots if r.robot_id == robot_id), None)
         if not robot:
@@ -160,10 +238,20 @@ class FleetManager:
         """Get robot by its ID"""
         return next((r for r in self.robots if r.robot_id == robot_id), None)
     
-    def spawn_robot_threadsafe(self, vertex_idx: int, canvas) -> Tuple[Optional[Robot], str]:
+    def assign_task(self, robot_id: str, destination) -> bool:
+        """Queue a destination for a robot; it drives there once its current tasks are done"""
+        robot = self.get_robot_by_id(robot_id)
+        if not robot:
+            return False
+        self.task_manager.add_task(robot_id, destination)
+        self.scheduler.add_task(robot)
+        self.scheduler.start()
+        return True
+
+    def spawn_robot_threadsafe(self, vertex_idx: int) -> Tuple[Optional[Robot], str]:
         """Thread-safe robot spawning"""
         with threading.Lock():
-            robot, message = self.spawn_robot(vertex_idx, canvas)
+            robot, message = self.spawn_robot(vertex_idx)
             if robot:
                 self._assign_initial_task(robot)
             return robot, message
@@ -190,22 +278,12 @@ class FleetManager:
         self.selected_robot = None
         return None
     
-    def on_canvas_click(self, event):
-        """Handle general canvas clicks for robot selection"""
-        if not self.fleet_manager.nav_graph or not self.fleet_manager.robots:
-            return
-            
-        for robot in self.fleet_manager.robots:
-            x, y = self.fleet_manager.get_canvas_coords(robot.position)
-            if ((event.x - x)**2 + (event.y - y)**2) <= (self.fleet_manager.vertex_radius**2):
-                self.select_robot(robot)
-                return
-            
-        self.deselect_robot()
-
     def clear_all(self) -> str:
         """Clear all robots and reset state"""
         self.robots = []
+        # A new store: robots still referenced elsewhere keep their rows in the old one
+        self.robot_store = RobotStore()
+        self.occupancy.clear()
         self.robot_counter = 0
         self.robot_destinations = {}
         self.selected_robot = None
@@ -219,11 +297,12 @@ class FleetManager:
     
     def find_path(self, start_idx: int, end_idx: int) -> List[int]:
         """Find path through edges using BFS"""
-        cache_key = (start_idx, end_idx)
-        if cache_key in self.path_cache:
-            return self.path_cache[cache_key]
         if start_idx == end_idx:
             return []
+        cache_key = (self.graph.version, start_idx, end_idx, 0)
+        cached = self.path_cache.get(cache_key)
+        if cached is not None:
+            return cached
             
         queue = deque()
         queue.append((start_idx, [start_idx]))  
@@ -233,130 +312,126 @@ class FleetManager:
         while queue:
             current_idx, path = queue.popleft()
             
-            for lane in self.nav_graph["lanes"]:
-                if lane[0] == current_idx:
-                    neighbor = lane[1]
-                elif lane[1] == current_idx:  
-                    neighbor = lane[0]
-                else:
-                    continue
-                    
+            for neighbor in self.graph.neighbors(current_idx):
                 if neighbor == end_idx:
-                    return path + [neighbor]
+                    path = path + [neighbor]
+                    self.path_cache.put(cache_key, path)
+                    return path
                     
                 if neighbor not in visited:
                     visited.add(neighbor)
                     queue.append((neighbor, path + [neighbor]))
-        self.path_cache[cache_key] = path
         return path
     
-    def calculate_path_along_edges(self, start_idx: int, end_idx: int) -> List[tuple]:
+    def plan_batch(self, requests: List[Tuple[int, int]]) -> List[Tuple[List[int], float]]:
         """
-        Generate smooth path points between two vertices
+        Plan many (start_idx, end_idx) queries at once. Queries are grouped by
+        destination and each distinct destination gets one reverse Dijkstra, so
+        every robot heading there reads its path from the same shortest-path tree.
+        Returns (path, cost) per request, ([], inf) when unreachable.
         """
-        path_indices = PathFinder.find_path(
-            self.nav_graph,
-            start_idx,
-            end_idx
-        )
-        
-        if not path_indices:
-            return []
+        by_target = defaultdict(list)
+        for i, (start_idx, end_idx) in enumerate(requests):
+            by_target[end_idx].append(i)
+
+        results: List[Tuple[List[int], float]] = [([], float('inf'))] * len(requests)
+        for end_idx, request_ids in by_target.items():
+            dist, next_hop = PathFinder.shortest_path_tree(
+                self.graph, end_idx, self.traffic_manager.congestion_cost)
+            for i in request_ids:
+                start_idx = requests[i][0]
+                if next_hop[start_idx] == -1:
+                    continue
+                path = [start_idx]
+                while path[-1] != end_idx:
+                    path.append(next_hop[path[-1]])
+                results[i] = (path, dist[start_idx])
+        return results
+
+    def plan_destinations(self) -> Dict[str, List[int]]:
+        """Batch-plan initial paths for every robot with a destination"""
+        robot_ids, requests = [], []
+        for robot in self.robots:
+            if robot.robot_id not in self.robot_destinations:
+                continue
+            start_idx = self.get_vertex_index(robot.position)
+            end_idx = self.get_vertex_index(self.robot_destinations[robot.robot_id])
+            if start_idx != -1 and end_idx != -1:
+                robot_ids.append(robot.robot_id)
+                requests.append((start_idx, end_idx))
+        if self.planning_workers and len(requests) >= self.PROCESS_PLANNING_MIN:
+            paths = self.plan_in_processes(requests)
+        else:
+            paths = [path for path, _ in self.plan_batch(requests)]
+        return dict(zip(robot_ids, paths))
+
+    def plan_in_processes(self, requests: List[Tuple[int, int]]) -> List[List[int]]:
+        """
+        Congestion-aware paths for many (start_idx, end_idx) queries, searched
+        by planning_workers processes over the graph in shared memory
+        """
+        if self.process_planner is None:
+            self.process_planner = ProcessPlanner(self.graph, self.planning_workers)
+        return self.process_planner.plan_batch(requests, self.traffic_manager.congestion_snapshot())
 
-        path_points = []
-        vertices = self.nav_graph["vertices"]
-        
-        for i in range(len(path_indices)-1):
-            start = vertices[path_indices[i]]
-            end = vertices[path_indices[i+1]]
-            
-            steps = max(3, int(self.distance(start, end) / 10)) 
-            
-            for j in range(steps + 1):
-                ratio = j / steps
-                x = start[0] + (end[0] - start[0]) * ratio
-                y = start[1] + (end[1] - start[1]) * ratio
-                path_points.append((x, y))
-        
-        return path_points
-    
-    def find_and_interpolate_path(self, start_idx: int, end_idx: int) -> List[tuple]:
-        """Find path and interpolate points (combines both operations)"""
-        path_indices = PathFinder.find_path(
-            self.nav_graph,
-            start_idx,
-            end_idx
-        )
-        return self.calculate_path_along_edges(path_indices) if path_indices else []
-    
-    def move_robot_concurrently(self, robot, target_pos, gui_update_callback):
-        """Thread-safe movement with proper destination handling"""
-        try:
+    def close_process_planner(self):
+        """Stop the planning workers and free their shared memory"""
+        if self.process_planner is not None:
+            self.process_planner.close()
+            self.process_planner = None
+
+    def shutdown(self):
+        """Stop moving robots and release planning workers and shared robot state"""
+        self.scheduler.stop()
+        self.close_process_planner()
+        self.close_state_table()
+
+    ### SHARED ROBOT STATE
+
+    def share_robot_states(self, capacity: int = 1024) -> RobotStateTable:
+        """
+        Publish robot state to a shared memory table for up to capacity robots,
+        written on spawn, on status changes and after every scheduler tick.
+        Other processes read it with RobotStateTable.attach(table.name, capacity).
+        """
+        if self.state_table is None:
+            self.state_table = RobotStateTable.create(capacity)
+            self.add_robot_observer(self.state_table)
+        return self.state_table
+
+    def close_state_table(self):
+        """Stop publishing robot state and free its shared memory"""
+        table, self.state_table = self.state_table, None
+        if table is not None:
+            self.robot_observers.remove(table)
+            table.close()
+
+    def plan_fleet(self) -> Optional[Dict[str, Schedule]]:
+        """
+        Collision-free timed schedules for every robot with a destination, from
+        the centralized prioritized planner. None when it cannot plan them all
+        within batch_planning_budget seconds.
+        """
+        requests = {}
+        for robot in self.robots:
+            if robot.robot_id not in self.robot_destinations:
+                continue
             start_idx = self.get_vertex_index(robot.position)
-            end_idx = self.get_vertex_index(target_pos) 
-            path_indices = self.find_path_to_destination(robot.position, target_pos)
-            path_names = self.get_path_with_vertex_names(path_indices)
-            path_display = self.get_path_with_vertex_names(path_indices)
-        
-            print(f"Robot {robot.robot_id} starting movement along: {path_names}")
-            robot_logger.log_event(
-            robot_id=robot.robot_id,
-            action="MOVE_START",
-            path=path_display,
-            status="IN_PROGRESS",
-            battery=robot.battery_level
+            end_idx = self.get_vertex_index(self.robot_destinations[robot.robot_id])
+            if start_idx == -1 or end_idx == -1:
+                return None
+            requests[robot.robot_id] = (start_idx, end_idx)
+        if not requests:
+            return None
+
+        planner = PrioritizedPlanner(
+            self.graph,
+            default_speed=self.default_speed,
+            margin=self.traffic_manager.RESERVATION_MARGIN,
+            time_budget=self.batch_planning_budget,
+            distance_table=self.distance_table
         )
-            while True:
-                if self.has_reached_destination(robot.position, target_pos):
-                    robot.set_status("idle")
-                    if hasattr(robot, 'path_history') and robot.path_history:
-                        path_released = self.traffic_manager.release_path(robot.robot_id, robot.path_history)
-                        if not path_released:
-                            print(f"Warning: Incomplete path release for {robot.robot_id}")
-                        robot.path_history = []
-                    
-                        dest_name = self.get_vertex_name(target_pos)
-                        robot_logger.log_event(
-                            robot_id=robot.robot_id,
-                            action="MOVE_COMPLETE",
-                            path=path_display,
-                            status="SUCCESS",
-                            battery=robot.battery_level
-                        )
-                        gui_update_callback(robot, "idle")
-                        break
-                    gui_update_callback(robot, "idle")
-                    break
-                    
-                path_indices = self.find_path_to_destination(robot.position, target_pos)
-                if not path_indices:
-                    robot.set_status("blocked")
-                    gui_update_callback(robot, "blocked")
-                    time.sleep(1)
-                    continue
-                    
-                if not self.traffic_manager.reserve_path(robot.robot_id, path_indices):
-                    robot.set_status("waiting")
-                    gui_update_callback(robot, "waiting")
-                    time.sleep(0.5)
-                    continue
-                    
-                path_points = self.calculate_path_along_edges(path_indices)
-                for point in path_points:
-                    if self.has_reached_destination(robot.position, target_pos):
-                        break
-                        
-                    robot.position = point
-                    robot.set_status("moving")
-                    gui_update_callback(robot, "moving")
-                    time.sleep(0.1)
-                    
-                self.traffic_manager.release_path(robot.robot_id, path_indices)
-                
-        except Exception as e:
-            robot.set_status("error")
-            gui_update_callback(robot, "error")
-            print(f"Movement error for {robot.robot_id}: {str(e)}")
+        return planner.plan(requests, dict(self.traffic_manager.priority_weights))
 
     def calculate_path(self, start_pos: tuple, end_pos: tuple) -> List[tuple]:
         """Calculate path from start to end position"""
@@ -367,69 +442,14 @@ class FleetManager:
             path.append((x, y))
         return path
 
-    def start_movement(self, gui_callback) -> Tuple[bool, List[str]]:
-        """Move robots along graph edges"""
-        if not self.robot_destinations:
-            return False, ["No destinations set"]
-        
-        movement_logs = []
-        for robot in self.robots:
-            if robot.robot_id in self.robot_destinations:
-                start_idx = self.get_vertex_index(robot.position)
-                end_idx = self.get_vertex_index(self.robot_destinations[robot.robot_id])
-                
-                if start_idx == -1 or end_idx == -1:
-                    movement_logs.append(f"{robot.robot_id}: Invalid start/end position")
-                    continue
-                    
-                path_points = self.calculate_path_along_edges(start_idx, end_idx)
-                
-                if not path_points:
-                    movement_logs.append(f"{robot.robot_id} cannot reach destination")
-                    continue
-                    
-                for point in path_points:
-                    robot.position = point
-                    gui_callback(robot)
-                    time.sleep(self.navigation_delay/len(path_points))
-                
-                movement_logs.append(
-                    f"{robot.robot_id} reached {self.get_vertex_name_by_index(end_idx)}"
-                )
-        
-        self.robot_destinations.clear()
-        return True, movement_logs
-    
-    def interpolate_path_points(self, vertex_path: List[int]) -> List[tuple]:
-        """Convert vertex indices to smooth path points"""
-        if not vertex_path or not self.nav_graph:
-            return []
-            
-        path_points = []
-        vertices = self.nav_graph["vertices"]
-        
-        for i in range(len(vertex_path)-1):
-            start = vertices[vertex_path[i]]
-            end = vertices[vertex_path[i+1]]
-            steps = max(3, int(self.distance(start, end) / 10))
-            
-            for j in range(steps + 1):
-                ratio = j / steps
-                x = start[0] + (end[0] - start[0]) * ratio
-                y = start[1] + (end[1] - start[1]) * ratio
-                path_points.append((x, y))
-                
-        return path_points
-
-    def find_and_interpolate_path(self, start_idx: int, end_idx: int) -> List[tuple]:
-        """Combined pathfinding and interpolation"""
+    def find_and_interpolate_path(self, start_idx: int, end_idx: int) -> np.ndarray:
+        """Find path and interpolate points (combines both operations)"""
         path_indices = PathFinder.find_path(
-            self.nav_graph,
+            self.graph,
             start_idx,
             end_idx
         )
-        return self.interpolate_path_points(path_indices) if path_indices else []
-
+        return self.calculate_path_along_edges(path_indices)
 
     def distance(self, p1: tuple, p2: tuple) -> float:
         """Calculate Euclidean distance between two points"""
@@ -477,9 +497,20 @@ class FleetManager:
         end_idx = self.get_vertex_index(target_pos)
         if start_idx == -1 or end_idx == -1:
             return None
+        snapshot = self.traffic_manager.congestion_snapshot()
+        if self.distance_table is not None and (snapshot is None or snapshot.is_clear()):
+            return self.distance_table.path(start_idx, end_idx)
         return self.traffic_manager.find_least_congested_path(
             self.nav_graph, start_idx, end_idx)
     
+    def replan_path(self, robot, target_pos) -> Optional[List[int]]:
+        """Repair the robot's previous search instead of planning from scratch"""
+        start_idx = self.get_vertex_index(robot.position)
+        end_idx = self.get_vertex_index(target_pos)
+        if start_idx == -1 or end_idx == -1:
+            return None
+        return self.traffic_manager.plan_incremental(robot.robot_id, start_idx, end_idx)
+    
     ### VISUALIZATION 
 
     def get_canvas_coords(self, vertex: tuple) -> tuple:
@@ -490,10 +521,24 @@ class FleetManager:
         )
     
     def update_visualization(self):
-        """Update lane colors for visualization."""
-        for lane in self.nav_graph.get("lanes", []):
-            status = self.get_lane_status(lane)
-            self.lane_status[lane] = status
+        """Update lane colors for visualization from one snapshot of the lanes that changed"""
+        snapshot = self.traffic_manager.snapshot(self.lane_status_version)
+        if snapshot["complete"]:
+            self.lane_status = {}
+        for lane, (state, _) in snapshot["lanes"].items():
+            self.lane_status[lane] = self.traffic_manager.LANE_STATE_COLORS[state]
+        self.lane_status_version = snapshot["version"]
+
+    def check_collisions(self, horizon: float = 0.0) -> List[Tuple[str, str, str]]:
+        """
+        Robots that are, or within the next horizon seconds of their
+        trajectories will be, too close: (robot_id1, robot_id2, "point"|"swept")
+        """
+        robots = list(self.robots)
+        robot_ids = [robot.robot_id for robot in robots]
+        positions = [robot.position for robot in robots]
+        next_positions = [robot.position_after(horizon) for robot in robots] if horizon > 0 else None
+        return self.traffic_manager.detect_motion_conflicts(robot_ids, positions, next_positions)
 
     def clear_path_reservations(self, robot_id):
         """Clear all path reservations for a robot"""
@@ -518,41 +563,58 @@ class FleetManager:
     
     ### CONCURRENT MOVEMENT 
 
-    def start_concurrent_movement(self, gui_update_callback):
-        """Start all robot movements in separate threads"""
-        futures = []
+    def start_concurrent_movement(self, gui_update_callback=None) -> List[str]:
+        """
+        Hand every robot with a destination to the tick scheduler and start it.
+        Progress is published in scheduler snapshots; returns the robot ids
+        scheduled.
+        """
+        if self.batch_planning:
+            schedules = self.plan_fleet()
+            if schedules is not None:
+                departure = self.scheduler.clock()
+                for robot in self.robots:
+                    if robot.robot_id in schedules:
+                        self.scheduler.add_schedule(robot, schedules[robot.robot_id], departure)
+                self.scheduler.start()
+                return list(schedules)
+            robot_logger.log_event(
+                robot_id="FLEET",
+                action="BATCH_PLANNING",
+                status="FALLBACK",
+                reason="No complete plan within the budget, planning per robot",
+                budget=self.batch_planning_budget
+            )
+
+        initial_paths = self.plan_destinations()
+        scheduled = []
         for robot in self.robots:
             if robot.robot_id in self.robot_destinations:
-                target = self.robot_destinations[robot.robot_id]
-                future = self.executor.submit(
-                    self.move_robot_concurrently,
-                    robot, target, gui_update_callback
-                )
-                futures.append(future)
-        return futures
-
-    def calculate_path_along_edges(self, vertex_path: List[int]) -> List[tuple]:
-        """Generate interpolated points from existing vertex path"""
-        if not vertex_path:
-            return []
-            
-        path_points = []
-        vertices = self.nav_graph["vertices"]
-        
-        for i in range(len(vertex_path)-1):
-            start = vertices[vertex_path[i]]
-            end = vertices[vertex_path[i+1]]
-            
-            steps = max(3, int(self.distance(start, end) / 10))
-            for j in range(steps + 1):
-                ratio = j / steps
-                x = start[0] + (end[0] - start[0]) * ratio
-                y = start[1] + (end[1] - start[1]) * ratio
-                path_points.append((x, y))
-        
-        
-        return path_points
-
+                self.scheduler.add(robot, self.robot_destinations[robot.robot_id],
+                                   initial_paths.get(robot.robot_id))
+                scheduled.append(robot.robot_id)
+        self.scheduler.start()
+        return scheduled
+
+    def calculate_path_along_edges(self, vertex_path: List[int]) -> np.ndarray:
+        """Interpolated (N, 2) points along a vertex path from the precomputed lane polylines"""
+        if not vertex_path or self.polylines is None:
+            return np.empty((0, 2))
+        return self.polylines.path_points(vertex_path)
+
+    def build_trajectory(self, vertex_path: List[int]) -> Trajectory:
+        """Timed trajectory along a vertex path from lane lengths and speed limits"""
+        return Trajectory.from_path(self.graph, vertex_path, self.max_acceleration, self.default_speed)
+
+    def estimate_travel_time(self, vertex_path: List[int]) -> float:
+        """ETA in seconds for driving a vertex path from rest to rest"""
+        return self.build_trajectory(vertex_path).duration
+
+    def set_path_resolution(self, resolution: float):
+        """Resample every lane polyline at a new spatial resolution"""
+        self.path_resolution = resolution
+        if self.graph is not None:
+            self.polylines = LanePolylines(self.graph, resolution)
 
     def _assign_initial_task(self, robot: Robot) -> None:
         """Assign first task to newly spawned robot"""
@@ -562,15 +624,8 @@ class FleetManager:
         if available:
             dest_idx = random.choice(available)
             self.set_robot_destination(robot.robot_id, dest_idx)
-            self.start_robot_thread(robot)
-
-    def start_robot_thread(self, robot: Robot) -> None:
-        """Start movement thread for a robot"""
-        threading.Thread(
-            target=self.move_robot_concurrently,
-            args=(robot, self.robot_destinations[robot.robot_id], self.safe_gui_update),
-            daemon=True
-        ).start()
+            self.scheduler.add(robot, self.robot_destinations[robot.robot_id])
+            self.scheduler.start()
 
     ### GET VERTEX 
 
@@ -578,17 +633,13 @@ class FleetManager:
         """Find index of vertex by position coordinates with dimension safety"""
         if not self.nav_graph:
             return -1
-            
-        pos_x = position[0]
-        pos_y = position[1] if len(position) > 1 else 0
-        
-        for idx, vertex in enumerate(self.nav_graph["vertices"]):
-            vertex_x = vertex[0]
-            vertex_y = vertex[1] if len(vertex) > 1 else 0
-            if (abs(vertex_x - pos_x) < 0.001 and 
-                abs(vertex_y - pos_y) < 0.001):
-                return idx
-        return -1
+        return self.vertex_index.find(position)
+
+    def get_nearest_vertex_index(self, position: tuple) -> int:
+        """Find index of the vertex closest to an arbitrary position"""
+        if not self.nav_graph:
+            return -1
+        return self.vertex_index.nearest(position)[0]
 
     def get_vertex_name(self, vertex: tuple) -> str:
         """Get name from vertex coordinates"""
@@ -604,37 +655,28 @@ class FleetManager:
         idx = self.get_vertex_index(position)
         return self.get_vertex_name_by_index(idx)
 
-    def on_vertex_click(self, vertex_idx):
-        """Handle vertex clicks to spawn robots"""
-        if not self.fleet_manager.nav_graph:
-            return
-            
-        robot, message = self.fleet_manager.spawn_robot(vertex_idx, self.canvas)
-        if robot:
-            self.add_history_entry(robot.robot_id, message)
-            self.prompt_destination(robot)
-            self.start_button.config(state=tk.NORMAL)
-
     def has_reached_destination(self, current_pos, target_pos):
         """Public method for destination checking"""
         return self._has_reached_destination(current_pos, target_pos)
     
     def _has_reached_destination(self, current_pos, target_pos, threshold=0.05):
         """Exact position matching with rounding"""
-        current = (round(current_pos[0], round(current_pos[1])) if len(current_pos) > 1 
+        current = ((round(current_pos[0]), round(current_pos[1])) if len(current_pos) > 1 
                  else (round(current_pos[0]), 0))
         target = (round(target_pos[0]), round(target_pos[1]) if len(target_pos) > 1 
                 else (round(target_pos[0]), 0))
         return current == target
     
     def update_vertex_occupancy(self):
-        """More efficient occupancy tracking"""
-        new_occupancy = defaultdict(set)
-        
+        """
+        Re-place every robot in the occupancy index from its position. Only
+        needed when vertex indices change (a new graph); otherwise robots keep
+        the index current as they move.
+        """
+        self.occupancy.clear()
         for robot in self.robots:
-            vertex_idx = self.get_vertex_index(robot.position)
-            if vertex_idx != -1:
-                new_occupancy[vertex_idx].add(robot.robot_id)
-        
-        self.vertex_occupancy = new_occupancy
+            if robot.trajectory is not None:
+                robot.follow(robot.trajectory, robot.trajectory_start)
+            else:
+                robot.place(robot.position)
     
\ No newline at end of file
@@ -0,0 +1,475 @@
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from src.models.trajectory import Trajectory
+from src.utils.logger import robot_logger
+
+# Phase of each scheduled robot
+IDLE = 0      # not scheduled, or arrived
+PLAN = 1      # needs a path to its target
+RESERVE = 2   # has a path, trying to reserve it
+DEPART = 3    # timed booking made, waiting for its departure slot
+DRIVE = 4     # following its trajectory
+
+# How a driven leg was reserved, and so how it is released on arrival
+EXCLUSIVE, TIMED, SCHEDULED = "exclusive", "timed", "scheduled"
+
+
+class TickScheduler:
+    """
+    Drives every moving robot from one thread at a fixed tick rate, instead
+    of a thread with its own sleep loop per robot.
+
+    Robot state lives in arrays indexed by slot (phase, and the time each
+    robot next needs attention), so a tick only touches the robots that are
+    due: finished legs are released first, then robots are planned, and
+    robots waiting for their lanes are handled oldest first. A robot whose
+    path is taken joins the traffic manager's FIFO lane queues and wait-for
+    graph (queue_for_path) and is picked up once it is granted the path,
+    picked to break a deadlock, or out of patience. Positions follow from
+    the robots' trajectories; after each tick the scheduler publishes an
+    immutable snapshot of every robot's position and status, plus the status
+    changes so far, for the GUI and other readers (and writes the fleet's
+    shared robot state table, when there is one).
+    """
+
+    # Seconds a robot with no path to its target waits before replanning
+    BLOCKED_RETRY = 1.0
+    # Status changes kept for snapshot readers that fall behind
+    EVENT_HISTORY = 4096
+
+    def __init__(self, fleet_manager, tick_rate: float = 20.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.fleet_manager = fleet_manager
+        self.tick_rate = tick_rate
+        self.clock = clock
+        self.lock = threading.Lock()
+        self._pending: deque = deque()
+
+        capacity = 64
+        self.phase = np.zeros(capacity, dtype=np.int8)
+        self.wake = np.full(capacity, np.inf)
+        self.waiting_since = np.zeros(capacity)
+        self.robots: List = []
+        self.targets: List[Optional[tuple]] = []
+        self.paths: List[Optional[List[int]]] = []
+        self.legs: List[Optional[str]] = []
+        # Per slot: event of the path the robot is queued for in the traffic manager
+        self.grants: List[Optional[threading.Event]] = []
+        self.slots: Dict[str, int] = {}
+
+        self.tick_count = 0
+        self.overruns = 0
+        self._events: deque = deque(maxlen=self.EVENT_HISTORY)
+        self._snapshot = {"tick": 0, "time": clock(), "robots": {}, "events": []}
+        self.trips_completed = 0
+        self.tasks_completed = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._work = threading.Event()
+        # False when the owner calls tick() itself (the event simulator); start() is then a no-op
+        self.autostart = True
+
+    ### SCHEDULING
+
+    def add(self, robot, target: tuple, initial_path: Optional[List[int]] = None):
+        """Drive robot to target, starting from initial_path when given"""
+        self._submit(robot, target, initial_path, None)
+
+    def add_schedule(self, robot, schedule, departure: float):
+        """Drive a batch-planned (vertex, arrive, depart) schedule from departure on"""
+        self._submit(robot, None, None, (schedule, departure))
+
+    def add_task(self, robot):
+        """Start robot on its next queued task if it is idle (otherwise it does on arrival)"""
+        self._submit(robot, None, None, None)
+
+    def _submit(self, robot, target, path, schedule):
+        with self.lock:
+            self._pending.append((robot, target, path, schedule))
+        self._work.set()
+
+    def _slot(self, robot) -> int:
+        slot = self.slots.get(robot.robot_id)
+        if slot is not None:
+            return slot
+        slot = len(self.robots)
+        if slot == len(self.phase):
+            grow = len(self.phase)
+            self.phase = np.concatenate((self.phase, np.zeros(grow, dtype=np.int8)))
+            self.wake = np.concatenate((self.wake, np.full(grow, np.inf)))
+            self.waiting_since = np.concatenate((self.waiting_since, np.zeros(grow)))
+        self.robots.append(robot)
+        self.targets.append(None)
+        self.paths.append(None)
+        self.legs.append(None)
+        self.grants.append(None)
+        self.slots[robot.robot_id] = slot
+        return slot
+
+    def _admit(self, now: float):
+        """Take robots added since the last tick into the state arrays"""
+        with self.lock:
+            pending, self._pending = self._pending, deque()
+        fleet = self.fleet_manager
+        for robot, target, path, schedule in pending:
+            slot = self._slot(robot)
+            if target is None and schedule is None:
+                if self.phase[slot] == IDLE:
+                    self._next_task(slot, now)
+                continue
+            if self.phase[slot] == DRIVE:
+                self._release_leg(slot)
+            self._unqueue(slot)
+            if schedule is not None:
+                self._start_schedule(slot, *schedule, now)
+                continue
+            self.targets[slot] = target
+            self.paths[slot] = path
+            self.phase[slot] = RESERVE if path else PLAN
+            self.wake[slot] = now
+            self.waiting_since[slot] = now
+            robot_logger.log_event(
+                robot_id=robot.robot_id,
+                action="MOVE_START",
+                path=fleet.get_path_with_vertex_names(path) if path else fleet.get_vertex_name(target),
+                status="IN_PROGRESS",
+                battery=robot.battery_level
+            )
+
+    def active(self) -> int:
+        """Number of robots still being driven"""
+        return int(np.count_nonzero(self.phase[:len(self.robots)] != IDLE)) + len(self._pending)
+
+    def next_wake(self, now: float) -> float:
+        """
+        Earliest time at which a tick after the one at now can change anything:
+        now itself when robots are already due, otherwise the next time a robot
+        falls due or a robot queued for its lanes reaches its replan timeout.
+        Queued robots are otherwise only granted their lanes when another
+        robot's arrival releases them, which is itself a wake time. inf when
+        nothing is scheduled.
+        """
+        if self._pending:
+            return now
+        n = len(self.robots)
+        phase, wake = self.phase[:n], self.wake[:n]
+        scheduled = phase != IDLE
+        queued = scheduled & (phase == RESERVE) & (wake <= now)
+        if (scheduled & ~queued & (wake <= now)).any() or self._reservable(n, now).any():
+            return now
+        later = wake[scheduled & (wake > now)]
+        next_time = later.min() if len(later) else np.inf
+        if queued.any():
+            timeouts = self.waiting_since[:n][queued] + self.fleet_manager.reservation_wait_timeout
+            next_time = min(next_time, timeouts.min())
+        return float(next_time)
+
+    def stats(self) -> Dict[str, int]:
+        """Tick, overrun and completion counters"""
+        return {
+            "ticks": self.tick_count,
+            "overruns": self.overruns,
+            "trips_completed": self.trips_completed,
+            "tasks_completed": self.tasks_completed,
+        }
+
+    ### TICKING
+
+    def tick(self, now: Optional[float] = None):
+        """Advance every robot that is due at now (the scheduler clock by default)"""
+        now = self.clock() if now is None else now
+        self._admit(now)
+        n = len(self.robots)
+        phase = self.phase[:n]
+        due = phase != IDLE
+        due &= self.wake[:n] <= now
+
+        arriving = np.flatnonzero(due & (phase == DRIVE)).tolist()
+        departing = np.flatnonzero(due & (phase == DEPART)).tolist()
+        planning = np.flatnonzero(due & (phase == PLAN)).tolist()
+
+        # Arrivals first, so the lanes they free can be reserved in this tick
+        for slot in arriving:
+            self._arrive(slot, now)
+        for slot in departing:
+            robot = self.robots[slot]
+            self._set_status(slot, "moving")
+            self.phase[slot] = DRIVE
+            self.wake[slot] = robot.trajectory_start + robot.trajectory.duration
+        for slot in planning:
+            self._plan(slot, now)
+        # Re-read the phase: robots planned above try to reserve straight away
+        reserving = np.flatnonzero(self._reservable(n, now))
+        for slot in reserving[np.argsort(self.waiting_since[reserving], kind='stable')].tolist():
+            self._reserve(slot, now)
+
+        self.tick_count += 1
+        self._publish(now)
+
+    def _reservable(self, n: int, now: float) -> np.ndarray:
+        """Mask of robots due to reserve: not queued yet, granted or picked out of the queue, or timed out"""
+        reserving = (self.phase[:n] == RESERVE) & (self.wake[:n] <= now)
+        ready = reserving & (self.waiting_since[:n] + self.fleet_manager.reservation_wait_timeout <= now)
+        grants = self.grants
+        for slot in np.flatnonzero(reserving & ~ready).tolist():
+            grant = grants[slot]
+            ready[slot] = grant is None or grant.is_set()
+        return ready
+
+    def _plan(self, slot: int, now: float):
+        robot, target = self.robots[slot], self.targets[slot]
+        fleet = self.fleet_manager
+        if fleet.has_reached_destination(robot.position, target):
+            self._finish(slot, now)
+            return
+        path = fleet.replan_path(robot, target)
+        if not path:
+            self._set_status(slot, "blocked")
+            self.wake[slot] = now + self.BLOCKED_RETRY
+            return
+        self.paths[slot] = path
+        self.phase[slot] = RESERVE
+        self.waiting_since[slot] = now
+
+    def _reserve(self, slot: int, now: float):
+        robot, path = self.robots[slot], self.paths[slot]
+        fleet = self.fleet_manager
+        traffic = fleet.traffic_manager
+
+        if fleet.reservation_mode == "timed":
+            trajectory = fleet.build_trajectory(path)
+            departure = traffic.reserve_trajectory(robot.robot_id, fleet.graph, trajectory, now)
+            if departure is None:
+                self._set_status(slot, "waiting")
+                self.wake[slot] = now + 0.5
+                return
+            self._drive(slot, trajectory, departure, TIMED, now)
+            return
+
+        grant = self.grants[slot]
+        if grant is None:
+            grant = traffic.queue_for_path(robot.robot_id, path, fleet.reservation_wait_timeout)
+            if not grant.is_set():
+                self.grants[slot] = grant
+                self._set_status(slot, "waiting")
+                return
+        self.grants[slot] = None
+        if traffic.leave_queue(robot.robot_id, grant):
+            self._drive(slot, fleet.build_trajectory(path), now, EXCLUSIVE, now)
+        else:
+            # Waited long enough, or gave way to break a deadlock: replan around the lanes' holders
+            self.phase[slot] = PLAN
+
+    def _drive(self, slot: int, trajectory: Trajectory, departure: float, leg: str, now: float):
+        self.robots[slot].follow(trajectory, start_time=departure)
+        self.legs[slot] = leg
+        if departure > now:
+            self._set_status(slot, "waiting")
+            self.phase[slot] = DEPART
+            self.wake[slot] = departure
+        else:
+            self._set_status(slot, "moving")
+            self.phase[slot] = DRIVE
+            self.wake[slot] = departure + trajectory.duration
+
+    def _start_schedule(self, slot: int, schedule, departure: float, now: float):
+        fleet = self.fleet_manager
+        robot = self.robots[slot]
+        trajectory = Trajectory.from_schedule(fleet.graph, schedule)
+        windows = fleet.traffic_manager.trajectory_windows(fleet.graph, trajectory, departure)
+        self.targets[slot] = fleet.graph.coords[schedule[-1][0]]
+        if not fleet.traffic_manager.reservation_table.book(robot.robot_id, windows):
+            # Something booked the lanes since the batch was planned: plan this robot on its own
+            robot_logger.log_event(
+                robot_id=robot.robot_id,
+                action="SCHEDULE_CONFLICT",
+                status="FALLBACK",
+                reason="Batch schedule no longer free, planning per robot",
+                battery=robot.battery_level
+            )
+            self.paths[slot] = None
+            self.phase[slot] = PLAN
+            self.wake[slot] = now
+            self.waiting_since[slot] = now
+            return
+        self.paths[slot] = [vertex for vertex, _, _ in schedule]
+        self._drive(slot, trajectory, departure, SCHEDULED, now)
+
+    def _arrive(self, slot: int, now: float):
+        self._release_leg(slot)
+        if self.legs[slot] == SCHEDULED:
+            self._finish(slot, now)
+            return
+        self.legs[slot] = None
+        self.phase[slot] = PLAN
+        self._plan(slot, now)
+
+    def _unqueue(self, slot: int):
+        """Take a robot out of the lane queues, giving back a path granted meanwhile"""
+        grant, self.grants[slot] = self.grants[slot], None
+        if grant is None:
+            return
+        robot_id, traffic = self.robots[slot].robot_id, self.fleet_manager.traffic_manager
+        if traffic.leave_queue(robot_id, grant):
+            traffic.release_path(robot_id, self.paths[slot])
+
+    def _release_leg(self, slot: int):
+        robot_id, path = self.robots[slot].robot_id, self.paths[slot]
+        traffic = self.fleet_manager.traffic_manager
+        traffic.record_traversal(path)
+        if self.legs[slot] == EXCLUSIVE:
+            traffic.release_path(robot_id, path)
+        else:
+            traffic.release_bookings(robot_id)
+
+    def _finish(self, slot: int, now: float):
+        robot, fleet = self.robots[slot], self.fleet_manager
+        fleet.traffic_manager.drop_planner(robot.robot_id)
+        self.phase[slot] = IDLE
+        self.wake[slot] = np.inf
+        self.legs[slot] = None
+        self.trips_completed += 1
+        self._set_status(slot, "idle")
+        robot_logger.log_event(
+            robot_id=robot.robot_id,
+            action="MOVE_COMPLETE",
+            path=fleet.get_path_with_vertex_names(self.paths[slot]) if self.paths[slot] else "",
+            status="SUCCESS",
+            battery=robot.battery_level
+        )
+        if robot.current_task is not None:
+            self.tasks_completed += 1
+            robot.complete_task()
+        self._next_task(slot, now)
+
+    def _next_task(self, slot: int, now: float):
+        """Send an idle robot to the next destination queued in the task manager, if any"""
+        robot, fleet = self.robots[slot], self.fleet_manager
+        destination = fleet.task_manager.get_next_task(robot.robot_id)
+        if destination is None:
+            return
+        robot.current_task = destination
+        robot_logger.log_event(
+            robot_id=robot.robot_id,
+            action="TASK_ASSIGNED",
+            destination_vertex=fleet.get_vertex_name(destination),
+            status="PENDING",
+            battery=robot.battery_level
+        )
+        self.targets[slot] = destination
+        self.paths[slot] = None
+        self.phase[slot] = PLAN
+        self.wake[slot] = now
+        self.waiting_since[slot] = now
+
+    def _set_status(self, slot: int, status: str):
+        """Record a status change for snapshot readers; nothing is drawn from this thread"""
+        robot = self.robots[slot]
+        if robot.status != status:
+            robot.record_status(status)
+            self._events.append((self.tick_count, robot.robot_id, status))
+
+    def _publish(self, now: float):
+        positions = [robot.position for robot in self.robots]
+        lanes = [robot.current_lane(now) for robot in self.robots]
+        self._store(positions, lanes, now)
+        robots = {robot.robot_id: (position, robot.status) for robot, position in zip(self.robots, positions)}
+        table = self.fleet_manager.state_table
+        if table is not None:
+            table.write_robots(self.robots, positions, now, lanes)
+        self._snapshot = {"tick": self.tick_count, "time": now, "robots": robots,
+                          "events": list(self._events)}
+
+    def _store(self, positions: List[tuple], lanes: List[int], now: float):
+        """
+        Write this tick's positions and lanes into the fleet's robot store,
+        then drop trajectories that have ended (their end is now stored)
+        """
+        store = self.fleet_manager.robot_store
+        # Robots from before a clear_all keep rows in their own, retired store
+        current = [i for i, robot in enumerate(self.robots) if robot.store is store]
+        if not current:
+            return
+        robots = self.robots
+        with store.lock:
+            store.update([robots[i].row for i in current], [positions[i] for i in current],
+                         [lanes[i] for i in current])
+            for i in current:
+                trajectory = robots[i].trajectory
+                if trajectory is not None and now >= robots[i].trajectory_start + trajectory.duration:
+                    robots[i].trajectory = None
+
+    def snapshot(self, since_tick: Optional[int] = None) -> dict:
+        """
+        Latest published state: {"tick", "time", "robots": {robot_id: (position, status)},
+        "events": [(tick, robot_id, status)]}. With since_tick, events are
+        limited to the status changes made after that tick.
+        """
+        snapshot = self._snapshot
+        if since_tick is None:
+            return snapshot
+        events = [event for event in snapshot["events"] if event[0] >= since_tick]
+        return dict(snapshot, events=events)
+
+    ### RUNNING
+
+    def start(self):
+        """Tick from a background thread until stop() is called"""
+        if self._running or not self.autostart:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="tick-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._work.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        period = 1.0 / self.tick_rate
+        next_tick = self.clock()
+        while self._running:
+            if not self.active():
+                # Nothing to drive: sleep until a robot is added
+                self._work.wait()
+                self._work.clear()
+                next_tick = self.clock()
+                continue
+            try:
+                self.tick()
+            except Exception as e:
+                robot_logger.log_event(
+                    robot_id="SCHEDULER",
+                    action="TICK",
+                    status="FAILED",
+                    tick=self.tick_count,
+                    error=repr(e),
+                    # One log line per entry: the traceback's lines joined
+                    traceback="; ".join(line.strip() for line in traceback.format_exc().strip().splitlines())
+                )
+            next_tick += period
+            delay = next_tick - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind: count it and keep the rate instead of bursting to catch up
+                self.overruns += 1
+                next_tick = self.clock()
+
+    def run_until_idle(self, timeout: float = float('inf')) -> bool:
+        """Tick in the calling thread at the tick rate until every robot has arrived"""
+        deadline = self.clock() + timeout
+        period = 1.0 / self.tick_rate
+        while self.active():
+            if self.clock() > deadline:
+                return False
+            self.tick()
+            time.sleep(period)
+        return True
@@ -1,38 +1,93 @@
 import threading
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import time
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 import heapq
+import numpy as np
 from src.utils.helper import PathFinder
+from src.models.compiled_graph import CompiledGraph
+from src.utils.path_cache import PathCache
+from src.utils.incremental_planner import DStarLite
+from src.utils.lock_stripes import LockStripes
+from src.models.congestion_map import CongestionMap, CongestionSnapshot, cost_factors
+from src.utils.reservation_table import ReservationTable, Window
+from src.utils.collision_checker import CollisionChecker
+from src.utils.logger import robot_logger
 
 class TrafficManager:
+    RESERVED_LANE_PENALTY = 10.0
+    # Lane reservations are guarded by this many locks, picked by lane hash
+    LANE_LOCK_STRIPES = 64
+    # Seconds kept free before and after each timed lane booking
+    RESERVATION_MARGIN = 1.0
+    # Seconds for lane congestion to halve once robots stop driving it
+    CONGESTION_HALF_LIFE = 30.0
+    # Relative drop in a lane's congestion cost factor, as it decays, that
+    # expires the cached paths and D* Lite searches priced with the old one
+    CONGESTION_DECAY_TOLERANCE = 0.1
+    # Traffic light color of each lane state reported by snapshot()
+    LANE_STATE_COLORS = {"free": "green", "reserved": "yellow", "queued": "red"}
+    # Robots closer than this (in map units) are reported as colliding
+    COLLISION_DISTANCE = 2.0
+
     def __init__(self, fleet_manager=None):
         self.lane_occupancy = defaultdict(list)
         self.fleet_manager = fleet_manager
-        self.reserved_lanes = {} 
+        self.clock = getattr(fleet_manager, 'clock', time.monotonic)
         self.waiting_queues = defaultdict(deque) 
-        self.congestion_data = defaultdict(float) 
+        self.congestion: Optional[CongestionMap] = None
+        self._congestion_graph: Optional[CompiledGraph] = None
         self.robot_timeouts = {} 
         self.lock = threading.Lock()
         self.priority_weights = defaultdict(float) 
         self.robot_destinations = {}
         self.lane_reservations = {}
+        self.path_cache = PathCache(maxsize=1000)
+        self.congestion_epoch = 0
+        # Cost factor per lane that cached paths and planners were last told
+        # about, and the snapshot it was last compared with
+        self._priced_factors: Optional[np.ndarray] = None
+        self._priced_snapshot: Optional[CongestionSnapshot] = None
+        self._decay_lock = threading.Lock()
+        self.incremental_planners: Dict[str, DStarLite] = {}
+        self.lane_locks = LockStripes(self.LANE_LOCK_STRIPES)
+        self._stats_lock = threading.Lock()
+        self.reservation_conflicts = 0
+        self.reservation_table = ReservationTable(self.RESERVATION_MARGIN, self.LANE_LOCK_STRIPES)
+        # Robots queued for a path (wait_for_path, queue_for_path): robot_id -> (path, event set once granted)
+        self._waiters: Dict[str, Tuple[List[int], threading.Event]] = {}
+        self.wait_lock = threading.RLock()
+        self.lanes_released = threading.Condition()
+        # Wait-for graph: waiting robot -> robots holding lanes it is queued on
+        self.wait_for: Dict[str, Set[str]] = {}
+        self._aborted: Set[str] = set()
+        self.deadlock_detection = True
+        self.deadlocks_detected = 0
+        self.deadlocks_resolved = 0
+        self.collision_checker = CollisionChecker(self.COLLISION_DISTANCE)
+        # Published lane states for snapshot(): lane -> (state, holder, version),
+        # kept in the order they last changed
+        self.state_lock = threading.Lock()
+        self.state_version = 0
+        self._lane_states: "OrderedDict[Tuple[int, int], Tuple[str, Optional[str], int]]" = OrderedDict()
         
     ### LANE AND PATH MANAGEMENT 
     def reserve_path(self, robot_id, path_indices):
-        """Reserve all lanes in a path"""
-        lanes = []
-        for i in range(len(path_indices)-1):
-            from_idx = path_indices[i]
-            to_idx = path_indices[i+1]
-            lanes.append((min(from_idx, to_idx), max(from_idx, to_idx)))
-        
-        for lane in lanes:
-            if not self.reserve_lane(lane, robot_id):
-                for reserved_lane in lanes:
-                    if reserved_lane in self.lane_reservations:
-                        self.release_lane(reserved_lane)
+        """
+        Reserve all lanes in a path atomically: either every lane is booked
+        for robot_id or none is. Only the lock stripes covering the path are
+        held, always acquired in ascending order so concurrent callers cannot
+        deadlock.
+        """
+        lanes = self._lanes_of(path_indices)
+        with self.lane_locks.hold(lanes):
+            if any(self.lane_reservations.get(lane, robot_id) != robot_id for lane in lanes):
+                with self._stats_lock:
+                    self.reservation_conflicts += 1
                 return False
+            for lane in lanes:
+                self.lane_reservations[lane] = robot_id
+        self._notify_lane_change(lanes)
         return True
     
     def verify_lane_statuses(self):
@@ -56,67 +111,296 @@ class TrafficManager:
         if not path_indices or len(path_indices) < 2:
             return False
 
-        lanes = []
-        for i in range(len(path_indices)-1):
-            from_idx = path_indices[i]
-            to_idx = path_indices[i+1]
-            lanes.append((min(from_idx, to_idx), max(from_idx, to_idx)))
-
-        with self.lock:
+        lanes = self._lanes_of(path_indices)
+        with self.lane_locks.hold(lanes):
             released_count = 0
             for lane in lanes:
-                if lane in self.lane_reservations and self.lane_reservations[lane] == robot_id:
+                if self.lane_reservations.get(lane) == robot_id:
                     del self.lane_reservations[lane]
                     released_count += 1
-                    self.congestion_data[lane] = max(0, self.congestion_data.get(lane, 0) - 0.1)
 
-            return released_count == len(lanes)
+        self._notify_lane_change(lanes)
+        self._wake_waiters(lanes)
+        return released_count == len(lanes)
 
     def reserve_lane(self, lane, robot_id):
         """Reserve a lane for a specific robot"""
-        if lane in self.lane_reservations:
-            return False  
-        self.lane_reservations[lane] = robot_id
+        with self.lane_locks.hold([lane]):
+            if lane in self.lane_reservations:
+                return False
+            self.lane_reservations[lane] = robot_id
+        self._notify_lane_change([lane])
         return True
 
     def release_lane(self, lane):
         """Release a reserved lane"""
-        if lane in self.lane_reservations:
-            del self.lane_reservations[lane]
-
-    def release_all_for_robot(self, robot_id):
-        """Release all lanes reserved by a specific robot"""
-        lanes_to_release = [lane for lane, reserver in self.lane_reservations.items() 
-                          if reserver == robot_id]
-        for lane in lanes_to_release:
-            self.release_lane(lane)
+        with self.lane_locks.hold([lane]):
+            released = self.lane_reservations.pop(lane, None) is not None
+        if released:
+            self._notify_lane_change([lane])
+            self._wake_waiters([lane])
 
     def wait_for_lane(self, robot_id: str, lane: tuple, timeout=5.0):
         """Wait for a lane to become available"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.reserve_lane(robot_id, lane):
-                return True
-            time.sleep(0.1)
+        return self.wait_for_path(robot_id, list(lane), timeout)
+
+    ### WAITING FOR LANES
+
+    def wait_for_path(self, robot_id: str, path_indices: List[int], timeout: float = 5.0) -> bool:
+        """
+        Reserve a path, blocking until it is granted or the timeout expires.
+
+        A blocked robot joins the FIFO waiting_queues of every lane on its path
+        and sleeps on its own event. When lanes are released, waiters are
+        offered the path in queue order and only the ones granted are woken,
+        already holding their reservation. Waiters form the wait-for graph that
+        deadlock detection runs on.
+        """
+        granted = self.queue_for_path(robot_id, path_indices, timeout)
+        granted.wait(timeout)
+        return self.leave_queue(robot_id, granted)
+
+    def queue_for_path(self, robot_id: str, path_indices: List[int], timeout: float = 5.0) -> threading.Event:
+        """
+        wait_for_path without blocking, for callers that poll (the TickScheduler):
+        reserve the path, or join its lanes' wait queues and the wait-for graph.
+        Returns an event that is set once the path is granted or the robot is
+        picked to break a deadlock; call leave_queue once it is set or the
+        caller stops waiting.
+        """
+        granted = threading.Event()
+        if self.reserve_path(robot_id, path_indices):
+            granted.set()
+            return granted
+        with self.wait_lock:
+            self._waiters[robot_id] = (path_indices, granted)
+            self.robot_timeouts[robot_id] = self.clock() + timeout
+            for lane in self._lanes_of(path_indices):
+                if robot_id not in self.waiting_queues[lane]:
+                    self.waiting_queues[lane].append(robot_id)
+            self._publish_lane_states(self._lanes_of(path_indices))
+            # The lanes may have been released before we were queued
+            if not self._try_grant(robot_id):
+                self._update_wait_edges(robot_id)
+        return granted
+
+    def leave_queue(self, robot_id: str, granted: threading.Event) -> bool:
+        """
+        Stop waiting for the path queued with queue_for_path. True if it was
+        granted (robot_id now holds it), False if it was not or the robot was
+        picked to break a deadlock.
+        """
+        with self.wait_lock:
+            self._dequeue(robot_id)
+            aborted = robot_id in self._aborted
+            self._aborted.discard(robot_id)
+        return granted.is_set() and not aborted
+
+    def wait_for_release(self, timeout: float = 1.0) -> bool:
+        """Block until any lane is released; False if the timeout expired first"""
+        with self.lanes_released:
+            return self.lanes_released.wait(timeout)
+
+    def _try_grant(self, robot_id: str) -> bool:
+        """Reserve a waiting robot's path for it and wake it; needs wait_lock"""
+        path_indices, granted = self._waiters[robot_id]
+        if not granted.is_set() and self.reserve_path(robot_id, path_indices):
+            granted.set()
+            self._dequeue(robot_id)
+            return True
         return False
-        
+
+    def _dequeue(self, robot_id: str):
+        """Remove a robot from every wait queue; needs wait_lock"""
+        entry = self._waiters.pop(robot_id, None)
+        self.robot_timeouts.pop(robot_id, None)
+        self.wait_for.pop(robot_id, None)
+        if entry is None:
+            return
+        for lane in self._lanes_of(entry[0]):
+            queue = self.waiting_queues.get(lane)
+            if queue is None:
+                continue
+            try:
+                queue.remove(robot_id)
+            except ValueError:
+                pass
+            if not queue:
+                del self.waiting_queues[lane]
+        self._publish_lane_states(self._lanes_of(entry[0]))
+
+    def _wake_waiters(self, lanes: List[Tuple[int, int]]):
+        """Offer released lanes to their waiting robots, first come first served"""
+        with self.lanes_released:
+            self.lanes_released.notify_all()
+        if not self._waiters:
+            return
+        with self.wait_lock:
+            candidates = []
+            for lane in lanes:
+                for robot_id in self.waiting_queues.get(lane, ()):
+                    if robot_id not in candidates:
+                        candidates.append(robot_id)
+            for robot_id in candidates:
+                if robot_id not in self._waiters:
+                    continue
+                if not self._check_robot_timeout(robot_id):
+                    self._dequeue(robot_id)
+                    continue
+                if not self._try_grant(robot_id):
+                    self._update_wait_edges(robot_id)
+
+    ### DEADLOCK HANDLING
+
+    def _update_wait_edges(self, robot_id: str):
+        """Point a waiter at the current holders of its lanes and check for a cycle; needs wait_lock"""
+        entry = self._waiters.get(robot_id)
+        if entry is None:
+            return
+        holders = {self.lane_reservations.get(lane) for lane in self._lanes_of(entry[0])}
+        holders.discard(None)
+        holders.discard(robot_id)
+        if not holders:
+            self.wait_for.pop(robot_id, None)
+            return
+        self.wait_for[robot_id] = holders
+        if self.deadlock_detection:
+            cycle = self._find_cycle(robot_id)
+            if cycle:
+                self._resolve_deadlock(cycle)
+
+    def _find_cycle(self, robot_id: str) -> List[str]:
+        """Robots on a wait-for cycle through robot_id, or [] if there is none"""
+        stack = [(robot_id, iter(self.wait_for.get(robot_id, ())))]
+        on_path = [robot_id]
+        visited = {robot_id}
+        while stack:
+            _, successors = stack[-1]
+            for successor in successors:
+                if successor == robot_id:
+                    return list(on_path)
+                if successor not in visited and successor in self.wait_for:
+                    visited.add(successor)
+                    on_path.append(successor)
+                    stack.append((successor, iter(self.wait_for[successor])))
+                    break
+            else:
+                stack.pop()
+                on_path.pop()
+        return []
+
+    def _resolve_deadlock(self, cycle: List[str]):
+        """
+        Break a wait-for cycle: the lowest priority robot on it gives up its
+        wait and all its lanes, so its wait_for_path (or leave_queue) returns
+        False and it replans while the others are granted what it held.
+        """
+        with self._stats_lock:
+            self.deadlocks_detected += 1
+        victim = min(cycle, key=lambda r: (self.priority_weights.get(r, 0.0), r))
+        robot_logger.log_event(
+            robot_id=victim,
+            action="DEADLOCK",
+            status="RESOLVED",
+            reason="Releases its lanes and replans",
+            cycle="->".join(cycle)
+        )
+        entry = self._waiters.get(victim)
+        self._aborted.add(victim)
+        self._dequeue(victim)
+        if entry is not None:
+            entry[1].set()
+        self.release_all_for_robot(victim)
+        with self._stats_lock:
+            self.deadlocks_resolved += 1
+
+    def reservation_stats(self) -> Dict[str, int]:
+        """Lock contention, rejected reservation and deadlock counters"""
+        with self._stats_lock:
+            return {
+                "reserved_lanes": len(self.lane_reservations),
+                "lock_contentions": self.lane_locks.contentions,
+                "reservation_conflicts": self.reservation_conflicts,
+                "deadlocks_detected": self.deadlocks_detected,
+                "deadlocks_resolved": self.deadlocks_resolved,
+            }
+
+    ### TIMED RESERVATIONS
+
+    def trajectory_windows(self, graph: CompiledGraph, trajectory, start_time: float) -> List[Window]:
+        """(lane, enter, exit) windows of a trajectory departing at start_time"""
+        return [
+            (graph.lane_keys[lane_id], start_time + enter, start_time + leave)
+            for lane_id, (enter, leave) in zip(trajectory.lane_ids, trajectory.segment_times)
+        ]
+
+    def earliest_departure(self, robot_id: str, graph: CompiledGraph, trajectory,
+                           start_time: float) -> Optional[float]:
+        """Earliest time at or after start_time the trajectory can run without conflicts"""
+        windows = self.trajectory_windows(graph, trajectory, start_time)
+        delay = self.reservation_table.earliest_delay(windows, robot_id)
+        return None if delay is None else start_time + delay
+
+    def reserve_trajectory(self, robot_id: str, graph: CompiledGraph, trajectory,
+                           start_time: float, max_wait: float = float('inf')) -> Optional[float]:
+        """
+        Book the lane intervals of a trajectory instead of whole lanes, delaying
+        departure to the earliest conflict-free slot. Returns the departure time,
+        or None if no slot exists within max_wait.
+        """
+        self.reservation_table.release(robot_id)
+        windows = self.trajectory_windows(graph, trajectory, start_time)
+        delay = self.reservation_table.book_earliest(robot_id, windows, max_wait)
+        if delay is None:
+            with self._stats_lock:
+                self.reservation_conflicts += 1
+            return None
+        return start_time + delay
+
+    def release_bookings(self, robot_id: str):
+        """Drop every timed booking held by robot_id"""
+        self.reservation_table.release(robot_id)
+
+    @staticmethod
+    def _lanes_of(path_indices) -> List[Tuple[int, int]]:
+        """Distinct undirected lanes along a vertex path"""
+        lanes = []
+        for i in range(len(path_indices)-1):
+            from_idx = path_indices[i]
+            to_idx = path_indices[i+1]
+            lane = (min(from_idx, to_idx), max(from_idx, to_idx))
+            if lane not in lanes:
+                lanes.append(lane)
+        return lanes
+
     ### NAVIGATION AND PATHFINDING  
 
     def find_least_congested_path(self, nav_graph: Dict, start_idx: int, end_idx: int) -> List[int]:
         """
         Find the least congested path using A* algorithm with congestion-aware cost function.
         """
+        graph = self._compiled_graph(nav_graph)
+        self.expire_decayed_congestion()
+        cache_key = (graph.version, start_idx, end_idx, self.congestion_epoch)
+        path = self.path_cache.get(cache_key)
+        if path is not None:
+            return path
+        path = self._search_least_congested(graph, start_idx, end_idx)
+        if path:
+            self.path_cache.put(cache_key, path)
+        return path
+
+    def _search_least_congested(self, graph: CompiledGraph, start_idx: int, end_idx: int) -> List[int]:
+        """A* over the compiled graph with lane costs scaled by congestion"""
+        adjacency = graph.adjacency
+        snapshot = self.congestion_snapshot(graph)
+        factors = snapshot.factors() if snapshot is not None else None
+
         def heuristic(u, v):
-            p1 = nav_graph["vertices"][u]
-            p2 = nav_graph["vertices"][v]
-            return ((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)**0.5
+            return graph.distance(u, v)
         
-        def edge_cost(u, v):
-            p1 = nav_graph["vertices"][u]
-            p2 = nav_graph["vertices"][v]
-            base_cost = ((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)**0.5
-            congestion = self.congestion_data.get((u, v), 0)
-            return base_cost * (1 + congestion * 2)
+        def edge_cost(lane_id, length):
+            return length * factors[lane_id] if factors is not None else length
         
         open_set = []
         heapq.heappush(open_set, (0, start_idx))
@@ -139,15 +423,8 @@ class TrafficManager:
                 path.reverse()
                 return path
             
-            neighbors = set()
-            for lane in nav_graph["lanes"]:
-                if lane[0] == current:
-                    neighbors.add(lane[1])
-                elif lane[1] == current:  
-                    neighbors.add(lane[0])
-            
-            for neighbor in neighbors:
-                tentative_g_score = g_score[current] + edge_cost(current, neighbor)
+            for neighbor, lane_id, length in adjacency[current]:
+                tentative_g_score = g_score[current] + edge_cost(lane_id, length)
                 
                 if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
                     came_from[neighbor] = current
@@ -161,12 +438,23 @@ class TrafficManager:
     
     def find_path(self, start_idx: int, end_idx: int) -> List[int]:
         """Uses the PathFinder helper with congestion data"""
+        graph = self._compiled_graph(self.fleet_manager.nav_graph)
+        self.expire_decayed_congestion()
+        snapshot = self.congestion_snapshot(graph)
         return PathFinder.find_path(
-            self.nav_graph,
+            graph,
             start_idx,
             end_idx,
-            self.congestion_data
+            snapshot.factors() if snapshot is not None else None,
+            self.congestion_epoch
         )
+
+    def _compiled_graph(self, nav_graph: Dict) -> CompiledGraph:
+        """Reuse the fleet manager's compiled graph, compiling only foreign graphs"""
+        fleet_graph = getattr(self.fleet_manager, 'graph', None)
+        if fleet_graph is not None and nav_graph is self.fleet_manager.nav_graph:
+            return fleet_graph
+        return CompiledGraph.from_nav_graph(nav_graph)
     
     def _path_to_lanes(self, path_indices: List[int]) -> List[Tuple[int, int]]:
         """Convert path indices to lane tuples."""
@@ -176,53 +464,215 @@ class TrafficManager:
     
     ### TRAFFIC AND CONGESTION HANDLING 
 
+    def congestion_map(self) -> Optional[CongestionMap]:
+        """Congestion of the fleet's graph, started afresh whenever a new graph is loaded"""
+        graph = getattr(self.fleet_manager, 'graph', None)
+        if graph is None:
+            return None
+        if self._congestion_graph is not graph:
+            with self.lock:
+                if self._congestion_graph is not graph:
+                    self.congestion = CongestionMap(graph.num_lanes, self.CONGESTION_HALF_LIFE, self.clock)
+                    self._congestion_graph = graph
+        return self.congestion
+
+    def congestion_snapshot(self, graph: Optional[CompiledGraph] = None) -> Optional[CongestionSnapshot]:
+        """
+        Immutable per-lane congestion levels for planners, read without locking.
+        None when congestion is not tracked for the graph (no fleet graph, or a
+        graph other than the fleet's).
+        """
+        congestion = self.congestion_map()
+        if congestion is None or (graph is not None and graph is not self._congestion_graph):
+            return None
+        return congestion.snapshot()
+
+    def record_traversal(self, path_indices: List[int]):
+        """Feed the lanes a robot actually drove into the congestion map"""
+        congestion = self.congestion_map()
+        if congestion is None or not path_indices or len(path_indices) < 2:
+            return
+        congestion.record(self._congestion_graph.path_lanes(path_indices))
+        lanes = self._lanes_of(path_indices)
+        self._congestion_changed(lanes)
+        self._notify_lane_change(lanes)
+
     def _update_congestion(self, lane: Tuple[int, int]):
         """Update congestion data for the lane."""
-        self.congestion_data[lane] = 0.9 * self.congestion_data.get(lane, 0) + 0.1
+        self.record_traversal(list(lane))
 
-    def get_lane_status(self, lane: Tuple[int, int]) -> str:
-        """Enhanced lane status with automatic updates"""
+    def _congestion_changed(self, lanes: List[Tuple[int, int]]):
+        """Invalidate only the cached paths that use lanes whose congestion changed"""
+        self.path_cache.invalidate_lanes(lanes)
+        PathFinder.invalidate_lanes(lanes)
+
+    def expire_decayed_congestion(self):
+        """
+        Decay lowers lane costs without any traversal to report it, so paths
+        cached (and D* Lite searches repaired) while a lane was congested
+        would keep avoiding it. Once per congestion snapshot, find the lanes
+        whose cost factor dropped by CONGESTION_DECAY_TOLERANCE since planners
+        were last told about them; if any did, start a new congestion epoch
+        (a cheaper lane can improve paths that never used it, so invalidating
+        by lane is not enough) and notify the D* Lite planners of those lanes.
+        """
+        snapshot = self.congestion_snapshot()
+        if snapshot is None or snapshot is self._priced_snapshot:
+            return
+        with self._decay_lock:
+            if snapshot is self._priced_snapshot:
+                return
+            self._priced_snapshot = snapshot
+            factors = cost_factors(snapshot.levels)
+            priced = self._priced_factors
+            if priced is None or len(priced) != len(factors):
+                self._priced_factors = factors
+                return
+            faded = np.flatnonzero(factors < priced * (1 - self.CONGESTION_DECAY_TOLERANCE))
+            # Rises were reported by record_traversal as they happened
+            np.maximum(priced, factors, out=priced)
+            priced[faded] = factors[faded]
+        if len(faded):
+            with self.lock:
+                self.congestion_epoch += 1
+            lane_keys = self._congestion_graph.lane_keys
+            self._notify_planners([lane_keys[lane_id] for lane_id in faded.tolist()])
+
+    def reset_congestion(self):
+        """Clear all congestion; starts a new epoch so every cached path misses"""
+        congestion = self.congestion_map()
+        if congestion is not None:
+            congestion.reset()
         with self.lock:
-            if lane not in self.reserved_lanes:
-                return "green"
-            elif self.waiting_queues[lane]:
-                return "red"
-            else:
-                return "yellow"
+            self.congestion_epoch += 1
+            self._priced_factors = None
+            self.incremental_planners.clear()
+
+    ### INCREMENTAL REPLANNING
+
+    def plan_incremental(self, robot_id: str, start_idx: int, end_idx: int) -> List[int]:
+        """
+        Plan with the robot's persistent D* Lite state. Lane costs include
+        congestion and a penalty for lanes reserved by other robots, so a robot
+        that failed to reserve its path is steered around the holders; only the
+        lanes that changed since its last plan are repaired.
+        """
+        graph = self._compiled_graph(self.fleet_manager.nav_graph)
+        self.expire_decayed_congestion()
+        planner = self.incremental_planners.get(robot_id)
+        if planner is None or planner.goal != end_idx or planner.graph is not graph:
+            planner = DStarLite(graph, start_idx, end_idx, self._lane_cost_for(robot_id))
+            self.incremental_planners[robot_id] = planner
+        return planner.plan(start_idx)
+
+    def drop_planner(self, robot_id: str):
+        """Discard a robot's search state once it has arrived"""
+        self.incremental_planners.pop(robot_id, None)
+
+    def congestion_cost(self, u: int, v: int, length: float) -> float:
+        """Cost of driving the lane u -> v given its current congestion"""
+        snapshot = self.congestion_snapshot()
+        if snapshot is None:
+            return length
+        return length * snapshot.factors()[self._congestion_graph.lane_id(u, v)]
+
+    def _lane_cost_for(self, robot_id: str):
+        reservations = self.lane_reservations
+        penalty = self.RESERVED_LANE_PENALTY
+        congestion_cost = self.congestion_cost
+
+        def lane_cost(u, v, length):
+            cost = congestion_cost(u, v, length)
+            holder = reservations.get((u, v) if u < v else (v, u))
+            if holder is not None and holder != robot_id:
+                cost *= penalty
+            return cost
+        return lane_cost
+
+    def _notify_lane_change(self, lanes: List[Tuple[int, int]]):
+        """Publish the lanes' new states and tell every incremental planner which lanes changed cost"""
+        self._publish_lane_states(lanes)
+        self._notify_planners(lanes)
+
+    def _notify_planners(self, lanes: List[Tuple[int, int]]):
+        """Tell every incremental planner which lanes changed cost"""
+        if not self.incremental_planners:
+            return
+        for planner in list(self.incremental_planners.values()):
+            lane_ids = [planner.graph.lane_id(u, v) for u, v in lanes]
+            planner.notify_lanes(lane_id for lane_id in lane_ids if lane_id is not None)
+
+    def get_lane_status(self, lane: Tuple[int, int]) -> str:
+        """Traffic light color of a lane from its published state"""
+        state = self._lane_states.get(lane)
+        return self.LANE_STATE_COLORS[state[0] if state else "free"]
+
+    ### LANE STATE SNAPSHOTS
+
+    def _publish_lane_states(self, lanes: List[Tuple[int, int]]):
+        """Recompute the published state of lanes whose reservation or queue changed"""
+        with self.state_lock:
+            for lane in lanes:
+                holder = self.lane_reservations.get(lane)
+                if holder is None:
+                    state = "free"
+                elif self.waiting_queues.get(lane):
+                    state = "queued"
+                else:
+                    state = "reserved"
+                current = self._lane_states.get(lane)
+                if current is not None and current[0] == state and current[1] == holder:
+                    continue
+                self.state_version += 1
+                self._lane_states[lane] = (state, holder, self.state_version)
+                self._lane_states.move_to_end(lane)
+
+    def snapshot(self, since_version: Optional[int] = None) -> dict:
+        """
+        State of every lane as {"version", "complete", "lanes": {lane: (state, holder)}},
+        state being "free", "reserved" or "queued" (reserved with robots waiting),
+        all read under a single lock acquisition. Lanes never reserved are
+        not listed and are free.
+
+        With since_version, only lanes that changed after that version are
+        listed, including those that became free; pass the version of the
+        last snapshot seen to apply changes incrementally.
+        """
+        with self.state_lock:
+            version = self.state_version
+            if since_version is None or since_version > version:
+                lanes = {lane: (state, holder) for lane, (state, holder, _) in self._lane_states.items()}
+                return {"version": version, "complete": True, "lanes": lanes}
+            lanes = {}
+            # Most recently changed last, so stop at the first lane already seen
+            for lane in reversed(self._lane_states):
+                state, holder, changed = self._lane_states[lane]
+                if changed <= since_version:
+                    break
+                lanes[lane] = (state, holder)
+            return {"version": version, "complete": False, "lanes": lanes}
     
-    def _distance(self, p1: tuple, p2: tuple) -> float:
-        """Calculate Euclidean distance between two points"""
-        return ((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)**0.5
     ### CONGESTION DETECTION AND ROBOT PRIORITY 
 
     def detect_collision(self, robot_positions: Dict[str, Tuple[float, float]], threshold: float = 2.0) -> List[Tuple[str, str]]:
-        """Optimized collision detection using spatial hashing"""
-        grid_size = threshold * 2
-        spatial_grid = defaultdict(list)
-        
-        for robot_id, pos in robot_positions.items():
-            grid_x = int(pos[0] / grid_size)
-            grid_y = int(pos[1] / grid_size)
-            spatial_grid[(grid_x, grid_y)].append((robot_id, pos))
-        
-        collisions = []
-        for (grid_x, grid_y), robots in spatial_grid.items():
-            for i in range(len(robots)):
-                id1, pos1 = robots[i]
-                for j in range(i+1, len(robots)):
-                    id2, pos2 = robots[j]
-                    if self._distance(pos1, pos2) < threshold:
-                        collisions.append((id1, id2))
-            
-            for dx, dy in [(1,0), (0,1), (1,1), (-1,1)]:
-                neighbor_key = (grid_x + dx, grid_y + dy)
-                if neighbor_key in spatial_grid:
-                    for (id1, pos1) in robots:
-                        for (id2, pos2) in spatial_grid[neighbor_key]:
-                            if self._distance(pos1, pos2) < threshold:
-                                collisions.append((id1, id2))
-        
-        return collisions
+        """Pairs of robots closer than threshold, via the vectorized collision checker"""
+        robot_ids = list(robot_positions)
+        positions = [robot_positions[robot_id][:2] for robot_id in robot_ids]
+        return [(robot_id1, robot_id2) for robot_id1, robot_id2, _
+                in self.detect_motion_conflicts(robot_ids, positions, None, threshold)]
+
+    def detect_motion_conflicts(self, robot_ids: List[str], positions, next_positions=None,
+                                threshold: Optional[float] = None) -> List[Tuple[str, str, str]]:
+        """
+        Conflicts of robots moving from positions to next_positions over one
+        tick, as (robot_id1, robot_id2, kind) with kind "point" when they are
+        already too close and "swept" when they get too close on the way.
+        """
+        checker = self.collision_checker if threshold is None else CollisionChecker(threshold)
+        report = checker.check(np.asarray(positions, dtype=float).reshape(-1, 2),
+                               None if next_positions is None else np.asarray(next_positions, dtype=float))
+        return [(robot_ids[i], robot_ids[j], "swept" if swept else "point")
+                for (i, j), swept in zip(report.pairs.tolist(), report.swept.tolist())]
     
     def negotiate_priority(self, robot1: str, robot2: str) -> str:
         """
@@ -251,27 +701,28 @@ class TrafficManager:
     
     def release_all_for_robot(self, robot_id):
         """Release all reservations for a specific robot"""
-        lanes_to_release = [lane for lane, reserved_by in self.lane_reservations.items() 
-                        if reserved_by == robot_id]
-        for lane in lanes_to_release:
-            self.release_lane(lane)
+        lanes = [lane for lane, reserved_by in list(self.lane_reservations.items())
+                 if reserved_by == robot_id]
+        with self.lane_locks.hold(lanes):
+            for lane in lanes:
+                if self.lane_reservations.get(lane) == robot_id:
+                    del self.lane_reservations[lane]
+        if lanes:
+            self._notify_lane_change(lanes)
+            self._wake_waiters(lanes)
+        self.reservation_table.release(robot_id)
 
     def _check_robot_timeout(self, robot_id: str) -> bool:
-        """Check if robot's wait timeout has expired."""
-        return time.time() < self.robot_timeouts.get(robot_id, float('inf'))
+        """Check that a robot's wait timeout has not expired yet."""
+        return self.clock() < self.robot_timeouts.get(robot_id, float('inf'))
     
     def try_reserve_lane(self, robot_id: str, lane: Tuple[int, int], timeout_sec: float = 5.0) -> bool:
         """
         Attempt to reserve a single lane with timeout.
         Returns True if successful, False otherwise.
         """
-        with self.lock:
-            if lane not in self.reserved_lanes:
-                self.reserved_lanes[lane] = robot_id
-                self._update_congestion(lane)
-                return True
-            
-            self.waiting_queues[lane].append(robot_id)
-            self.robot_timeouts[robot_id] = time.time() + timeout_sec
-            return False
+        if self.wait_for_path(robot_id, list(lane), timeout_sec):
+            self._update_congestion(lane)
+            return True
+        return False
     
\ No newline at end of file
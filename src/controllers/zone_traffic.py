@@ -0,0 +1,286 @@
+import itertools
+import multiprocessing
+import queue
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.models.compiled_graph import CompiledGraph
+from src.models.congestion_map import CongestionMap
+from src.models.zone_partition import ZonePartition
+
+# Messages to zone workers, (kind, request_id, ...)
+RESERVE = "reserve"    # robot_id, lane_ids, owner: book all or none, reply GRANTED/DENIED
+RELEASE = "release"    # robot_id, lane_ids, driven: drop the robot's booking, as congestion if driven
+HANDOFF = "handoff"    # robot_id, driven lane_ids, next zone, sent_at: robot leaves this zone
+TRANSFER = "transfer"  # robot_id, from zone, sent_at: robot enters this zone (zone to zone)
+LEVELS = "levels"      # lane_ids: reply their congestion
+STOP = "stop"
+
+# Replies to the coordinator, (kind, request_id, zone, ...)
+GRANTED = "granted"
+DENIED = "denied"
+HANDED_OFF = "handed_off"  # robot_id, from zone, sent_at
+LEVELS_REPLY = "levels_reply"  # {lane_id: level}
+
+
+class ZonedTrafficManager:
+    """
+    Lane reservations and congestion sharded over one worker process per zone
+    of a ZonePartition, instead of one TrafficManager behind one lock.
+
+    Each worker alone owns its zone's lanes. A path is booked by sending each
+    zone the lanes it owns; if any zone refuses, the zones that granted are
+    told to release, so a path is still reserved all or nothing and no zone
+    ever waits on another.
+
+    A robot is owned by the zone it is driving through. When it reaches the
+    end of its lanes in one zone, handoff() asks that zone to release the
+    lanes it drove (recording them as congestion) and pass the robot to the
+    next zone, which adopts it and confirms to the coordinator. The next
+    zone's lanes were booked with the path, so a handoff never fails; its
+    latency is the round trip coordinator -> old zone -> new zone ->
+    coordinator, recorded in handoff_latencies.
+
+    This is a standalone prototype: FleetManager still books lanes through
+    TrafficManager, and only benchmarks.bench_zone_handoff drives this class.
+    """
+
+    # Seconds to wait for a zone's replies before giving up on it
+    REPLY_TIMEOUT = 10.0
+    # Seconds between checks that the zone workers are still alive
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, graph: CompiledGraph, columns: int = 2, rows: int = 2,
+                 half_life: float = 30.0):
+        self.graph = graph
+        self.partition = ZonePartition(graph, columns, rows)
+        self.half_life = half_life
+        self._request_ids = itertools.count(1)
+        self._replies_by_request: Dict[int, list] = defaultdict(list)
+        self.inboxes: list = []
+        self.replies = None
+        self.processes: list = []
+        # Robots with a booked path: robot_id -> remaining [(zone, lane_ids)]
+        self.segments: Dict[str, List[Tuple[int, List[int]]]] = {}
+        self.handoff_latencies: List[float] = []
+
+    ### LIFECYCLE
+
+    def start(self):
+        """Start one worker process per zone"""
+        if self.processes:
+            return
+        context = multiprocessing.get_context()
+        self.inboxes = [context.Queue() for _ in range(self.partition.num_zones)]
+        self.replies = context.Queue()
+        self.processes = [
+            context.Process(target=_run_zone, name=f"zone-{zone}", daemon=True,
+                            args=(zone, self.inboxes, self.replies, self.graph.num_lanes, self.half_life))
+            for zone in range(self.partition.num_zones)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def close(self):
+        """Stop the zone workers"""
+        for inbox in self.inboxes:
+            inbox.put((STOP, 0))
+        for process in self.processes:
+            process.join(self.REPLY_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    ### RESERVATIONS
+
+    def reserve_path(self, robot_id: str, path_indices: List[int]) -> bool:
+        """Book every lane of a path across its zones, or none of them"""
+        return self.reserve_paths({robot_id: path_indices})[robot_id]
+
+    def reserve_paths(self, paths: Dict[str, List[int]]) -> Dict[str, bool]:
+        """
+        Book many paths at once: every zone request is sent before any reply
+        is awaited, so the zones work on the batch in parallel
+        """
+        requests = {}
+        for robot_id, path_indices in paths.items():
+            segments = self.partition.split_lanes(self.graph.path_lanes(path_indices))
+            by_zone = defaultdict(list)
+            for zone, lane_ids in segments:
+                by_zone[zone].extend(lane_ids)
+            request_id = next(self._request_ids)
+            for zone, lane_ids in by_zone.items():
+                self.inboxes[zone].put((RESERVE, request_id, robot_id, lane_ids, zone == segments[0][0]))
+            requests[robot_id] = (request_id, segments, by_zone)
+
+        results = {}
+        for robot_id, (request_id, segments, by_zone) in requests.items():
+            replies = self._await(request_id, len(by_zone))
+            granted = all(reply[0] == GRANTED for reply in replies)
+            if granted:
+                self.segments[robot_id] = segments
+            else:
+                for reply in replies:
+                    if reply[0] == GRANTED:
+                        self.inboxes[reply[2]].put((RELEASE, 0, robot_id, by_zone[reply[2]], False))
+            results[robot_id] = granted
+        return results
+
+    def release_path(self, robot_id: str):
+        """Release every lane still booked for robot_id"""
+        by_zone = defaultdict(list)
+        for zone, lane_ids in self.segments.pop(robot_id, []):
+            by_zone[zone].extend(lane_ids)
+        for zone, lane_ids in by_zone.items():
+            self.inboxes[zone].put((RELEASE, 0, robot_id, lane_ids, False))
+
+    def zone_of(self, robot_id: str) -> Optional[int]:
+        """Zone currently owning robot_id, None without a booked path"""
+        segments = self.segments.get(robot_id)
+        return segments[0][0] if segments else None
+
+    ### HANDOFF
+
+    def handoff(self, robot_ids: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        Robots that finished their lanes in their current zone: release those
+        lanes and move each robot to the zone of its next segment, or, after
+        its last segment, release it. Returns the new zone per robot (None
+        once arrived).
+        """
+        pending = {}
+        zones = {}
+        for robot_id in robot_ids:
+            segments = self.segments.get(robot_id)
+            if not segments:
+                zones[robot_id] = None
+                continue
+            zone, lane_ids = segments.pop(0)
+            if not segments:
+                del self.segments[robot_id]
+                self.inboxes[zone].put((RELEASE, 0, robot_id, lane_ids, True))
+                zones[robot_id] = None
+                continue
+            request_id = next(self._request_ids)
+            next_zone = segments[0][0]
+            self.inboxes[zone].put((HANDOFF, request_id, robot_id, lane_ids, next_zone, time.monotonic()))
+            pending[robot_id] = request_id
+            zones[robot_id] = next_zone
+
+        for robot_id, request_id in pending.items():
+            (_, _, _, _, _, sent_at), = self._await(request_id, 1)
+            self.handoff_latencies.append(time.monotonic() - sent_at)
+        return zones
+
+    ### CONGESTION
+
+    def congestion_levels(self, lane_ids: Iterable[int]) -> Dict[int, float]:
+        """Current congestion of lanes, asked of the zones owning them"""
+        by_zone = defaultdict(list)
+        for lane_id in lane_ids:
+            by_zone[int(self.partition.lane_zone[lane_id])].append(lane_id)
+        request_id = next(self._request_ids)
+        for zone, zone_lanes in by_zone.items():
+            self.inboxes[zone].put((LEVELS, request_id, zone_lanes))
+        levels = {}
+        for reply in self._await(request_id, len(by_zone)):
+            levels.update(reply[3])
+        return levels
+
+    def _await(self, request_id: int, count: int) -> list:
+        """
+        count replies to request_id, keeping replies to other requests for
+        later. Raises RuntimeError when a zone worker has died or the replies
+        do not arrive within REPLY_TIMEOUT, instead of blocking forever.
+        """
+        replies = self._replies_by_request.pop(request_id, [])
+        deadline = time.monotonic() + self.REPLY_TIMEOUT
+        while len(replies) < count:
+            try:
+                reply = self.replies.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                dead = [process.name for process in self.processes if not process.is_alive()]
+                if dead:
+                    raise RuntimeError(f"Zone workers died: {', '.join(dead)}")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(
+                        f"Request {request_id} got {len(replies)} of {count} zone replies "
+                        f"in {self.REPLY_TIMEOUT}s")
+                continue
+            if reply[1] == request_id:
+                replies.append(reply)
+            else:
+                self._replies_by_request[reply[1]].append(reply)
+        return replies
+
+
+### ZONE WORKERS
+
+class ZoneWorker:
+    """Reservations, congestion and robots of one zone, run inside its own process"""
+
+    def __init__(self, zone: int, inboxes: list, replies, num_lanes: int, half_life: float):
+        self.zone = zone
+        self.inboxes = inboxes
+        self.replies = replies
+        self.reservations: Dict[int, str] = {}
+        self.robots: Set[str] = set()
+        self.congestion = CongestionMap(num_lanes, half_life)
+
+    def run(self):
+        inbox = self.inboxes[self.zone]
+        handlers = {
+            RESERVE: self._reserve,
+            RELEASE: self._release,
+            HANDOFF: self._handoff,
+            TRANSFER: self._transfer,
+            LEVELS: self._levels,
+        }
+        while True:
+            message = inbox.get()
+            if message[0] == STOP:
+                return
+            handlers[message[0]](*message[1:])
+
+    def _reserve(self, request_id: int, robot_id: str, lane_ids: List[int], owner: bool):
+        reservations = self.reservations
+        if any(reservations.get(lane_id, robot_id) != robot_id for lane_id in lane_ids):
+            self.replies.put((DENIED, request_id, self.zone))
+            return
+        for lane_id in lane_ids:
+            reservations[lane_id] = robot_id
+        if owner:
+            self.robots.add(robot_id)
+        self.replies.put((GRANTED, request_id, self.zone))
+
+    def _release(self, request_id: int, robot_id: str, lane_ids: List[int], driven: bool):
+        reservations = self.reservations
+        for lane_id in lane_ids:
+            if reservations.get(lane_id) == robot_id:
+                del reservations[lane_id]
+        if driven:
+            self.congestion.record(lane_ids)
+        self.robots.discard(robot_id)
+
+    def _handoff(self, request_id: int, robot_id: str, lane_ids: List[int], next_zone: int, sent_at: float):
+        self._release(request_id, robot_id, lane_ids, True)
+        self.inboxes[next_zone].put((TRANSFER, request_id, robot_id, self.zone, sent_at))
+
+    def _transfer(self, request_id: int, robot_id: str, from_zone: int, sent_at: float):
+        self.robots.add(robot_id)
+        self.replies.put((HANDED_OFF, request_id, self.zone, robot_id, from_zone, sent_at))
+
+    def _levels(self, request_id: int, lane_ids: List[int]):
+        levels = {lane_id: self.congestion.level(lane_id) for lane_id in lane_ids}
+        self.replies.put((LEVELS_REPLY, request_id, self.zone, levels))
+
+
+def _run_zone(zone: int, inboxes: list, replies, num_lanes: int, half_life: float):
+    ZoneWorker(zone, inboxes, replies, num_lanes, half_life).run()
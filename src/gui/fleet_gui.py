@@ -6,7 +6,7 @@ import threading
 import math
 import random
 from src.controllers.fleet_manager import FleetManager
-import time 
+from src.gui.robot_renderer import RobotRenderer
 class FleetManagementApp:
     def __init__(self, master):
         self.master = master
@@ -21,6 +21,11 @@ class FleetManagementApp:
             "charging": "purple",
             "error": "orange"
         }
+        self.lane_state_colors = {
+            "free": "#00aa00",
+            "reserved": "#ffcc00",
+            "queued": "#ff4444"
+        }
         
         self.setup_main_window()
         self.setup_ui_components()
@@ -31,16 +36,16 @@ class FleetManagementApp:
         self.selected_robot = None
         self.after_id = None
         self.canvas.delete("path")
-        self.vertex_occupancy = {}  
-        self.setup_vertex_occupancy_tracker()
         self.initialize_core_components()
         self.initialize_state()
-        self.last_update_time = 0
         self.update_interval = 0.033
         self.start_periodic_checks() 
+        self.animate_robots()
 
     def initialize_core_components(self):
         self.fleet_manager = FleetManager()
+        self.robot_renderer = RobotRenderer(self.canvas, self.fleet_manager)
+        self.fleet_manager.add_robot_observer(self.robot_renderer)
         self.threads = []
     
     def initialize_state(self):
@@ -48,8 +53,12 @@ class FleetManagementApp:
         self.vertex_radius = 15
         self.selected_robot = None
         self.after_id = None
-        self.vertex_occupancy = {}  
-        self.setup_vertex_occupancy_tracker()
+        # Version of the last lane snapshot drawn, None to redraw every lane
+        self.lane_state_version = None
+        # Scheduler tick up to which robot status changes have been drawn
+        self.scheduler_tick = 0
+        # Robot positions of the last snapshot checked for collisions
+        self.collision_positions = {}
 
 
     def setup_main_window(self):
@@ -196,6 +205,7 @@ class FleetManagementApp:
         """Clear all logs and reset the system"""
         if messagebox.askyesno("Confirm Clear", "Clear all logs and reset system?"):
             self.canvas.delete("all")
+            self.robot_renderer.clear()
             message = self.fleet_manager.clear_all()
             self.history_tree.delete(*self.history_tree.get_children())
             self.add_history_entry("System", message)
@@ -212,7 +222,6 @@ class FleetManagementApp:
         if file_path:
             success, message = self.fleet_manager.load_nav_graph(file_path)
             if success:
-                self.setup_vertex_occupancy_tracker() 
                 self.draw_environment()
                 self.add_history_entry("System", message)
             else:
@@ -224,13 +233,13 @@ class FleetManagementApp:
         if not self.fleet_manager.nav_graph:
             return
             
-        self.update_vertex_occupancy()  
         FREE_COLOR = "#00aa00"   
         IN_USE_COLOR = "#ffcc00" 
         DEFAULT_COLOR = "#cccccc"
         vertices = self.fleet_manager.nav_graph["vertices"]
         lanes = self.fleet_manager.nav_graph["lanes"]
-        traffic_mgr = getattr(self.fleet_manager, 'traffic_manager', None)
+        snapshot = self.fleet_manager.traffic_manager.snapshot()
+        self.lane_state_version = snapshot["version"]
         
         for lane in lanes:
             from_idx, to_idx = lane[0], lane[1]
@@ -240,8 +249,8 @@ class FleetManagementApp:
             lane_key = (min(from_idx, to_idx), max(from_idx, to_idx))
             lane_tag = f"lane_{lane_key[0]}_{lane_key[1]}"
             
-            is_reserved = traffic_mgr and lane_key in traffic_mgr.lane_reservations
-            color = "#00aa00" if not is_reserved else "#ffcc00" 
+            state, _ = snapshot["lanes"].get(lane_key, ("free", None))
+            color = self.lane_state_colors[state]
             
             self.canvas.create_line(from_x, from_y, to_x, to_y,
                                 width=3, fill=color, tags=lane_tag)
@@ -251,7 +260,7 @@ class FleetManagementApp:
             base_color = self.fleet_manager.vertex_colors.get(idx, "#888888")
             vertex_name = self.fleet_manager.vertex_names.get(idx, f"V{idx}")
             
-            if self.vertex_occupancy.get(idx):
+            if not self.fleet_manager.occupancy.is_free(idx):
                 self.canvas.create_oval(x-12, y-12, x+12, y+12,
                                       fill=base_color, outline="red", width=3,
                                       tags=f"vertex_{idx}")
@@ -276,17 +285,15 @@ class FleetManagementApp:
         if not self.fleet_manager.nav_graph:
             return
             
-        self.update_vertex_occupancy()
-        occupying_robot = self.vertex_occupancy.get(vertex_idx)
+        occupying_robot = self.fleet_manager.occupancy.occupant(vertex_idx)
         
         if occupying_robot:
             vertex_name = self.fleet_manager.vertex_names.get(vertex_idx, f"Vertex {vertex_idx}")
             self.show_occupancy_popup(vertex_idx, vertex_name, occupying_robot)
             return
             
-        robot, message = self.fleet_manager.spawn_robot(vertex_idx, self.canvas)
+        robot, message = self.fleet_manager.spawn_robot(vertex_idx)
         if robot:
-            self.update_vertex_occupancy() 
             self.add_history_entry(robot.robot_id, message)
             self.prompt_destination(robot)
             self.start_button.config(state=tk.NORMAL)
@@ -357,20 +364,8 @@ class FleetManagementApp:
         
         self.highlight_collisions()
         
-        threads = []
-        for robot in self.fleet_manager.robots:
-            if robot.robot_id in self.fleet_manager.robot_destinations:
-                target = self.fleet_manager.robot_destinations[robot.robot_id]
-                t = threading.Thread(
-                    target=self.fleet_manager.move_robot_concurrently,
-                    args=(robot, target, self.safe_gui_update),
-                    daemon=True
-                )
-                threads.append(t)
-                t.start()
-        
-        self.threads = threads
-        self.add_history_entry("System", "Started concurrent movement")
+        scheduled = self.fleet_manager.start_concurrent_movement()
+        self.add_history_entry("System", f"Started concurrent movement of {len(scheduled)} robots")
 
     def assign_selected_destination(self, robot, window):
         """ Assigns a selected destination to a robot after validation """
@@ -487,16 +482,6 @@ class FleetManagementApp:
     
     ### ROBOT MANAGEMENT    
 
-    def update_vertex_occupancy(self):
-        """Update which robots occupy which vertices"""
-        for vertex_idx in self.vertex_occupancy:
-            self.vertex_occupancy[vertex_idx] = None
-        
-        for robot in self.fleet_manager.robots:
-            vertex_idx = self.fleet_manager.get_vertex_index(robot.position)
-            if vertex_idx != -1:
-                self.vertex_occupancy[vertex_idx] = robot.robot_id
-
     def update_robot_display(self, robot):
         """Update robot visualization with offset for multiple robots at the same vertex"""
         if robot.status == "idle":
@@ -542,133 +527,57 @@ class FleetManagementApp:
         self.master.update()
 
 
-    def setup_vertex_occupancy_tracker(self):
-        """Initialize vertex occupancy tracking"""
-        self.vertex_occupancy = {}  
-        
-        if (hasattr(self.fleet_manager, 'nav_graph')) and self.fleet_manager.nav_graph:
-            self.vertex_occupancy = {
-                idx: None for idx in range(len(self.fleet_manager.nav_graph["vertices"]))
-            }
-    
-    def safe_gui_update(self, robot, status):
-        """Thread-safe GUI update that also updates occupancy"""
-        current_time = time.time()
-        if current_time - self.last_update_time < self.update_interval:
-            return
-        def update():
-            robot.status = status
-            robot.update_visualization()
-            self.update_vertex_occupancy()
-            
-            self.draw_environment()
-            
-            for r in self.fleet_manager.robots:
-                r.update_visualization()
-
-            x, y = self.fleet_manager.get_canvas_coords(robot.position)
-            self.canvas.delete(f"status_{robot.robot_id}")
-            self.canvas.create_oval(x-10, y-10, x+10, y+10,
-                              fill=self.status_colors.get(status, "blue"),
-                              tags=f"robot_{robot.robot_id}")
-            if status == "idle":
-                self.canvas.after(100, self.force_green_lanes)
-            
-            if status == "waiting":
-                self.canvas.create_oval(
-                    x-15, y-15, x+15, y+15,
-                    outline="#FFFF00", width=2, dash=(5,2),
-                    tags=f"status_{robot.robot_id}"
-                )
-            elif status == "blocked":
-                self.canvas.create_oval(
-                    x-15, y-15, x+15, y+15,
-                    outline="#FF0000", width=3,
-                    tags=f"status_{robot.robot_id}"
-                )
-            elif status == "moving":
-                self.canvas.create_line(
-                    x, y, x+20, y,
-                    arrow=tk.LAST, fill="#00FF00", width=2,
-                    tags=f"status_{robot.robot_id}"
-                )
-        
-        self.master.after(0, update)
+    def draw_status_marker(self, robot_id, position, status):
+        """Mark a robot's latest status change next to it"""
+        x, y = self.fleet_manager.get_canvas_coords(position)
+        self.canvas.delete(f"status_{robot_id}")
+        self.canvas.create_oval(x-10, y-10, x+10, y+10,
+                          fill=self.status_colors.get(status, "blue"),
+                          tags=f"robot_{robot_id}")
+        if status == "idle":
+            self.canvas.after(100, self.force_green_lanes)
+        
+        if status == "waiting":
+            self.canvas.create_oval(
+                x-15, y-15, x+15, y+15,
+                outline="#FFFF00", width=2, dash=(5,2),
+                tags=f"status_{robot_id}"
+            )
+        elif status == "blocked":
+            self.canvas.create_oval(
+                x-15, y-15, x+15, y+15,
+                outline="#FF0000", width=3,
+                tags=f"status_{robot_id}"
+            )
+        elif status == "moving":
+            self.canvas.create_line(
+                x, y, x+20, y,
+                arrow=tk.LAST, fill="#00FF00", width=2,
+                tags=f"status_{robot_id}"
+            )
     
     def force_green_lanes(self):
         """Force all unreserved lanes to green"""
-        if not hasattr(self.fleet_manager, 'nav_graph'):
+        if not self.fleet_manager.nav_graph:
             return
         
         lanes = self.fleet_manager.nav_graph.get("lanes", [])
-        traffic_mgr = getattr(self.fleet_manager, 'traffic_manager', None)
+        snapshot = self.fleet_manager.traffic_manager.snapshot()
         
         for lane in lanes:
             from_idx, to_idx = lane[0], lane[1]
             lane_key = (min(from_idx, to_idx), max(from_idx, to_idx))
             lane_tag = f"lane_{lane_key[0]}_{lane_key[1]}"
             
-            is_reserved = traffic_mgr and lane_key in traffic_mgr.lane_reservations
-            
-            color = "#00aa00" if not is_reserved else "#ffcc00"
-            self.canvas.itemconfig(lane_tag, fill=color)
+            state, _ = snapshot["lanes"].get(lane_key, ("free", None))
+            self.canvas.itemconfig(lane_tag, fill=self.lane_state_colors[state])
+        self.lane_state_version = snapshot["version"]
 
     def _get_vertex_occupant(self, vertex_idx):
         if not hasattr(self.fleet_manager, 'nav_graph'):
             return None
-            
-        for robot in self.fleet_manager.robots:
-            if self.fleet_manager.get_vertex_index(robot.position) == vertex_idx:
-                return robot.robot_id
-        return None
-
-    def move_robot_concurrently(self, robot, target_pos, gui_update_callback):
-        """Handles robot movement logic with collision avoidance"""
-        try:
-            while True:
-                self.update_vertex_occupancy()
-                
-                if self.has_reached_destination(robot.position, target_pos):
-                    robot.set_status("idle")
-                    gui_update_callback(robot, "idle")
-                    self.mark_complete_path_green(robot)
-                    if hasattr(self.fleet_manager, 'traffic_manager'):
-                        self.fleet_manager.traffic_manager.release_all_for_robot(robot.robot_id)
-                    break
-                    
-                path_indices = self.find_path_to_destination(robot.position, target_pos)
-                if not path_indices:
-                    robot.set_status("blocked")
-                    gui_update_callback(robot, "blocked")
-                    time.sleep(1)
-                    continue
-                    
-                robot.path_history.extend(path_indices)
-                
-                if not self.fleet_manager.traffic_manager.reserve_path(robot.robot_id, path_indices):
-                    robot.set_status("waiting")
-                    gui_update_callback(robot, "waiting")
-                    time.sleep(0.5)
-                    continue
-
-                    
-                path_points = self.calculate_path_along_edges(path_indices)
-                for point in path_points:
-                    if self.has_reached_destination(robot.position, target_pos):
-                        break
-                        
-                    robot.position = point
-                    robot.set_status("moving")
-                    gui_update_callback(robot, "moving")
-                    time.sleep(0.1)
-                    
-                self.traffic_manager.release_path(robot.robot_id, path_indices)
-                
-        except Exception as e:
-            robot.set_status("error")
-            gui_update_callback(robot, "error")
-            print(f"Movement error for {robot.robot_id}: {str(e)}")
-    
+        return self.fleet_manager.occupancy.occupant(vertex_idx)
+
     def batch_update_robots(self):
         """Update all robot positions in a single canvas operation"""
         self.canvas.delete("robot")  # Clear all robots at once
@@ -682,31 +591,44 @@ class FleetManagementApp:
                                 font=("Arial", 8), tags=("robot_label", f"label_{robot.robot_id}"))
             
 
+    def animate_robots(self):
+        """
+        Draw the scheduler's latest snapshot at the GUI frame rate. Robots are
+        only ever drawn here, on the Tk thread, from published snapshots.
+        """
+        snapshot = self.fleet_manager.scheduler.snapshot(self.scheduler_tick)
+        self.scheduler_tick = snapshot["tick"]
+        robots = snapshot["robots"]
+        if snapshot["events"]:
+            self.draw_environment()
+            for _, robot_id, status in snapshot["events"]:
+                if robot_id in robots:
+                    self.draw_status_marker(robot_id, robots[robot_id][0], status)
+        self.robot_renderer.draw_snapshot(robots)
+
+        moving = any(status == "moving" for _, status in robots.values())
+        if moving or self.canvas.find_withtag("collision_highlight"):
+            self.highlight_collisions(robots)
+        self.master.after(int(self.update_interval * 1000), self.animate_robots)
+
     def start_periodic_checks(self, interval=1000):
         """Start periodic checks for lane status accuracy"""
         self.verify_lane_statuses()
         self.master.after(interval, lambda: self.start_periodic_checks(interval))
 
     def verify_lane_statuses(self):
-        """Ensure lane colors match actual reservations"""
+        """Recolor the lanes whose state changed since the last snapshot applied"""
         if not hasattr(self.fleet_manager, 'traffic_manager'):
             return
             
-        reserved_lanes = set(self.fleet_manager.traffic_manager.lane_reservations.keys())
-        
-        for lane_tag in self.canvas.find_withtag("lane"):
-            tags = self.canvas.gettags(lane_tag)
-            if len(tags) >= 2 and tags[0] == "lane":
-                parts = tags[1].split('_')
-                if len(parts) == 3:
-                    lane_key = (int(parts[1]), int(parts[2]))
-                    current_color = self.canvas.itemcget(lane_tag, "fill")
-                    
-                    should_be_reserved = lane_key in reserved_lanes
-                    correct_color = "#ffcc00" if should_be_reserved else "#00aa00"
-                    
-                    if current_color != correct_color:
-                        self.canvas.itemconfig(lane_tag, fill=correct_color)
+        snapshot = self.fleet_manager.traffic_manager.snapshot(self.lane_state_version)
+        if snapshot["complete"]:
+            self.force_green_lanes()
+            return
+        
+        for (from_idx, to_idx), (state, _) in snapshot["lanes"].items():
+            self.canvas.itemconfig(f"lane_{from_idx}_{to_idx}", fill=self.lane_state_colors[state])
+        self.lane_state_version = snapshot["version"]
         
     ### Helper Functions
     
@@ -715,24 +637,15 @@ class FleetManagementApp:
         if not hasattr(self.fleet_manager, 'nav_graph'):
             return -1
             
-        vertices = self.fleet_manager.nav_graph["vertices"]
-        lanes = self.fleet_manager.nav_graph["lanes"]
-        num_vertices = len(vertices)
-        
-        adj = [[] for _ in range(num_vertices)]
-        for lane in lanes:
-            from_idx, to_idx = lane[0], lane[1]
-            adj[from_idx].append(to_idx)
-            adj[to_idx].append(from_idx)
-        
-        visited = [False] * num_vertices
+        graph = self.fleet_manager.graph
+        visited = [False] * graph.num_vertices
         queue = deque([start_vertex_idx])
         visited[start_vertex_idx] = True
         
         while queue:
             current_idx = queue.popleft()
             
-            for neighbor_idx in adj[current_idx]:
+            for neighbor_idx in graph.neighbors(current_idx):
                 if not visited[neighbor_idx]:
                     if not self._get_vertex_occupant(neighbor_idx):
                         return neighbor_idx
@@ -776,27 +689,9 @@ class FleetManagementApp:
         tk.Button(button_frame, text="OK", command=popup.destroy).pack(side=tk.LEFT, padx=10)
         tk.Button(button_frame, text="Find Nearest", command=find_and_highlight).pack(side=tk.LEFT)
 
-    def mark_complete_path_green(self, robot):
-        """Mark all lanes in robot's path history as green when done"""
-        if not hasattr(robot, 'path_history') or not robot.path_history:
-            return
-            
-        unique_lanes = set()
-        for i in range(len(robot.path_history)-1):
-            from_idx = robot.path_history[i]
-            to_idx = robot.path_history[i+1]
-            unique_lanes.add((min(from_idx, to_idx), max(from_idx, to_idx)))
-        
-        for lane in unique_lanes:
-            lane_tag = f"lane_{lane[0]}_{lane[1]}"
-            self.canvas.itemconfig(lane_tag, fill="#00aa00")  
-        
-        robot.path_history = []
-
     def on_closing(self):
         """Clean up when window closes"""
-        for t in self.threads:
-            t.join(timeout=0.1)
+        self.fleet_manager.shutdown()
         self.master.destroy()
 
     ### LOGS 
@@ -846,14 +741,14 @@ class FleetManagementApp:
         """Spawn robot at random vertex"""
         if self.fleet_manager.nav_graph:
             idx = random.randint(0, len(self.fleet_manager.nav_graph["vertices"])-1)
-            self.fleet_manager.spawn_robot_threadsafe(idx, self.canvas)
+            self.fleet_manager.spawn_robot_threadsafe(idx)
 
     def assign_new_task(self):
         """Assign task to selected robot"""
         robot_id = self.robot_var.get()
         if robot_id and self.fleet_manager.nav_graph:
             idx = random.randint(0, len(self.fleet_manager.nav_graph["vertices"])-1)
-            self.fleet_manager.task_manager.add_task(robot_id, 
+            self.fleet_manager.assign_task(robot_id,
                 self.fleet_manager.nav_graph["vertices"][idx])
     
     ### UTILITY FUNCTION 
@@ -865,22 +760,29 @@ class FleetManagementApp:
             self.padding + (vertex[1] - self.fleet_manager.min_y) * self.fleet_manager.scale_y
         )
 
-    def highlight_collisions(self):
-        """Highlight any detected collisions between robots"""
-        robot_positions = {robot.robot_id: robot.position for robot in self.fleet_manager.robots}
-        collisions = self.fleet_manager.traffic_manager.detect_collision(robot_positions)
+    def highlight_collisions(self, robots=None):
+        """
+        Highlight robots of a scheduler snapshot (the latest by default) that
+        were too close at the previous frame (solid) or came too close since
+        (dashed)
+        """
+        if robots is None:
+            robots = self.fleet_manager.scheduler.snapshot()["robots"]
+        robot_ids = list(robots)
+        positions = [robots[robot_id][0] for robot_id in robot_ids]
+        previous = [self.collision_positions.get(robot_id, position)
+                    for robot_id, position in zip(robot_ids, positions)]
+        self.collision_positions = dict(zip(robot_ids, positions))
+        collisions = self.fleet_manager.traffic_manager.detect_motion_conflicts(robot_ids, previous, positions)
         
         self.canvas.delete("collision_highlight")
         
-        for robot1_id, robot2_id in collisions:
-            robot1 = next(r for r in self.fleet_manager.robots if r.robot_id == robot1_id)
-            robot2 = next(r for r in self.fleet_manager.robots if r.robot_id == robot2_id)
-            
-            x1, y1 = self._get_canvas_coords(robot1.position)
-            x2, y2 = self._get_canvas_coords(robot2.position)
+        for robot1_id, robot2_id, kind in collisions:
+            x1, y1 = self._get_canvas_coords(robots[robot1_id][0])
+            x2, y2 = self._get_canvas_coords(robots[robot2_id][0])
             
             self.canvas.create_line(x1, y1, x2, y2, 
-                                fill="red", width=2, dash=(5,2),
+                                fill="red", width=2, dash=(5,2) if kind == "swept" else (),
                                 tags="collision_highlight")
             
             self.canvas.create_oval(x1-15, y1-15, x1+15, y1+15,
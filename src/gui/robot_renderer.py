@@ -0,0 +1,147 @@
+import math
+import threading
+import tkinter as tk
+
+
+class RobotRenderer:
+    """
+    Draws robots on a Tk canvas. Registered with the FleetManager as a robot
+    observer, so the model layer never touches tkinter: robots call
+    robot_spawned when they are (re)created and robot_changed whenever their
+    position or status changes.
+
+    Tk is not thread-safe, so only the thread that created the renderer (the
+    Tk main loop) draws. Robots driven by the tick scheduler change on its
+    thread and are drawn from its snapshots instead (draw_snapshot).
+    """
+
+    def __init__(self, canvas, fleet_manager):
+        self.canvas = canvas
+        self.fleet_manager = fleet_manager
+        # robot_id -> [body, label, status effect] canvas item ids
+        self.items = {}
+        # robot_id -> (position, status) as last drawn
+        self.drawn = {}
+        self.thread = threading.current_thread()
+
+    ### OBSERVER
+
+    def robot_spawned(self, robot):
+        """Create the robot's canvas items, replacing any it had"""
+        if threading.current_thread() is not self.thread:
+            return
+        x, y = self.fleet_manager.get_canvas_coords(robot.position)
+        color = self.fleet_manager.vertex_colors.get(robot._find_vertex_index(), "#00FF00")
+        body = self.canvas.create_oval(
+            x-10, y-10, x+10, y+10,
+            fill=color, outline="black", width=2
+        )
+        label = self.canvas.create_text(
+            x, y-15,
+            text=robot.robot_id,
+            font=("Arial", 8, "bold")
+        )
+        self.items[robot.robot_id] = [body, label, None]
+        self.draw(robot.robot_id, robot.position, robot.status)
+
+    def robot_changed(self, robot):
+        """Move the robot's items to its position and show its status"""
+        if threading.current_thread() is not self.thread:
+            return
+        if robot.robot_id not in self.items:
+            self.robot_spawned(robot)
+            return
+        self.draw(robot.robot_id, robot.position, robot.status)
+
+    ### SNAPSHOTS
+
+    def draw_snapshot(self, robots):
+        """Redraw the robots whose position or status changed in a scheduler snapshot's robots"""
+        drawn = self.drawn
+        for robot_id, state in robots.items():
+            if robot_id in self.items and drawn.get(robot_id) != state:
+                self.draw(robot_id, *state)
+
+    def clear(self):
+        """Forget every robot drawn (their items are gone from the canvas)"""
+        self.items.clear()
+        self.drawn.clear()
+
+    ### DRAWING
+
+    def draw(self, robot_id, position, status):
+        """Move a robot's items to position and show status"""
+        items = self.items[robot_id]
+        self.drawn[robot_id] = (position, status)
+        x, y = self.fleet_manager.get_canvas_coords(position)
+
+        same_pos_robots = [other for other, (other_position, _) in self.drawn.items()
+                           if other_position == position]
+        index = same_pos_robots.index(robot_id)
+        angle = index * (2 * math.pi / max(6, len(same_pos_robots)))
+        offset_x = 15 * math.cos(angle)
+        offset_y = 15 * math.sin(angle)
+
+        body, label, _ = items
+        self.canvas.coords(
+            body,
+            x-10+offset_x, y-10+offset_y,
+            x+10+offset_x, y+10+offset_y
+        )
+        self.canvas.coords(
+            label,
+            x+offset_x, y-15+offset_y
+        )
+        self.canvas.itemconfig(
+            body,
+            fill=self.fleet_manager.STATUS_COLORS.get(status, "#AAAAAA")
+        )
+        self._update_status_effects(robot_id, status, items, x+offset_x, y+offset_y)
+
+    def _update_status_effects(self, robot_id, status, items, x, y):
+        """Update visual effects based on status"""
+        if items[2]:
+            self.canvas.delete(items[2])
+            items[2] = None
+
+        if status == "moving":
+            items[2] = self.canvas.create_line(
+                x, y, x+20, y,
+                arrow=tk.LAST, fill="#00FF00", width=2,
+                tags="moving_effect"
+            )
+        elif status == "waiting":
+            items[2] = self.canvas.create_oval(
+                x-15, y-15, x+15, y+15,
+                outline="#FFFF00", width=2, dash=(5,2),
+                tags="waiting_effect"
+            )
+            self._flash_warning(robot_id, items[2])
+        elif status == "blocked":
+            items[2] = self.canvas.create_oval(
+                x-15, y-15, x+15, y+15,
+                outline="#FF0000", width=3,
+                tags="blocked_effect"
+            )
+        elif status == "charging":
+            items[2] = self.canvas.create_text(
+                x, y+20,
+                text="⚡", font=("Arial", 12),
+                tags="charging_effect"
+            )
+        elif status == "task_assigned":
+            items[2] = self.canvas.create_text(
+                x, y+20,
+                text="★", font=("Arial", 12),
+                fill="#FF00FF",
+                tags="task_effect"
+            )
+
+    def _flash_warning(self, robot_id, effect_id):
+        """Animate waiting status with flashing effect"""
+        items = self.items.get(robot_id)
+        if self.drawn.get(robot_id, (None, None))[1] == "waiting" and items and items[2] == effect_id:
+            current_color = self.canvas.itemcget(effect_id, "outline")
+            new_color = "#FFCC00" if current_color == "#FFFF00" else "#FFFF00"
+            self.canvas.itemconfig(effect_id, outline=new_color)
+            self.canvas.after(500, lambda: self._flash_warning(robot_id, effect_id))
@@ -0,0 +1,125 @@
+import itertools
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+class CompiledGraph:
+    """Compact CSR adjacency compiled once from a nav_graph level"""
+    _versions = itertools.count(1)
+    # Arrays that fully describe the compiled graph, as used by from_arrays
+    ARRAYS = ("xs", "ys", "lane_key_array", "lane_lengths", "speed_limits",
+              "offsets", "targets", "arc_lanes", "arc_lengths")
+
+    def __init__(self, vertices: list, lanes: list, default_speed: float = 1.0):
+        self.version = next(CompiledGraph._versions)
+        self.num_vertices = len(vertices)
+        self.coords: List[Tuple[float, float]] = [
+            (float(v[0]), float(v[1]) if len(v) > 1 else 0.0) for v in vertices
+        ]
+        self.xs = np.array([c[0] for c in self.coords], dtype=np.float64)
+        self.ys = np.array([c[1] for c in self.coords], dtype=np.float64)
+
+        # Lanes are stored once per undirected (min, max) key, matching the
+        # keys used by the traffic manager for reservations.
+        self.lane_keys: List[Tuple[int, int]] = []
+        self.lane_index: Dict[Tuple[int, int], int] = {}
+        self.lane_meta: List[dict] = []
+        speed_limits = []
+        for lane in lanes:
+            u, v = int(lane[0]), int(lane[1])
+            if u == v:
+                continue
+            key = (min(u, v), max(u, v))
+            if key in self.lane_index:
+                continue
+            meta = lane[2] if len(lane) > 2 and isinstance(lane[2], dict) else {}
+            self.lane_index[key] = len(self.lane_keys)
+            self.lane_keys.append(key)
+            self.lane_meta.append(meta)
+            speed_limits.append(float(meta.get("speed_limit", 0) or 0))
+
+        self.num_lanes = len(self.lane_keys)
+        keys = np.array(self.lane_keys, dtype=np.int32).reshape(-1, 2)
+        self.lane_key_array = keys
+        self.lane_lengths = np.hypot(self.xs[keys[:, 0]] - self.xs[keys[:, 1]],
+                                     self.ys[keys[:, 0]] - self.ys[keys[:, 1]])
+        self.speed_limits = np.array(speed_limits, dtype=np.float64)
+        self.default_speed = default_speed
+
+        # Every lane contributes one arc in each direction
+        lane_ids = np.arange(self.num_lanes, dtype=np.int32)
+        sources = np.concatenate([keys[:, 0], keys[:, 1]])
+        targets = np.concatenate([keys[:, 1], keys[:, 0]])
+        arc_lanes = np.concatenate([lane_ids, lane_ids])
+        order = np.argsort(sources, kind="stable")
+
+        self.offsets = np.zeros(self.num_vertices + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=self.num_vertices), out=self.offsets[1:])
+        self.targets = targets[order].astype(np.int32)
+        self.arc_lanes = arc_lanes[order].astype(np.int32)
+        self.arc_lengths = self.lane_lengths[self.arc_lanes]
+        self._mirror_adjacency()
+
+    def _mirror_adjacency(self):
+        # Python-level mirror of the CSR rows, used by the pure Python searches
+        # where indexing NumPy scalars would dominate the cost.
+        offsets = self.offsets.tolist()
+        rows = list(zip(self.targets.tolist(), self.arc_lanes.tolist(), self.arc_lengths.tolist()))
+        self.adjacency: List[List[Tuple[int, int, float]]] = [
+            rows[offsets[u]:offsets[u + 1]] for u in range(self.num_vertices)
+        ]
+
+    @classmethod
+    def from_nav_graph(cls, nav_graph: dict) -> "CompiledGraph":
+        """Compile the vertices and lanes of a loaded nav_graph level"""
+        return cls(nav_graph.get("vertices", []), nav_graph.get("lanes", []))
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], default_speed: float = 1.0) -> "CompiledGraph":
+        """
+        Wrap the arrays of an already compiled graph (see ARRAYS), e.g. views
+        of shared memory, without compiling again. Lane metadata other than
+        speed limits is not carried over.
+        """
+        graph = cls.__new__(cls)
+        graph.version = next(CompiledGraph._versions)
+        for name in cls.ARRAYS:
+            setattr(graph, name, arrays[name])
+        graph.num_vertices = len(graph.xs)
+        graph.coords = list(zip(graph.xs.tolist(), graph.ys.tolist()))
+        graph.lane_keys = [tuple(key) for key in graph.lane_key_array.tolist()]
+        graph.lane_index = {key: lane_id for lane_id, key in enumerate(graph.lane_keys)}
+        graph.lane_meta = [{} for _ in graph.lane_keys]
+        graph.num_lanes = len(graph.lane_keys)
+        graph.default_speed = default_speed
+        graph._mirror_adjacency()
+        return graph
+
+    ### QUERIES
+
+    def neighbors(self, vertex_idx: int) -> List[int]:
+        """Indices of vertices connected to vertex_idx by a lane"""
+        return [v for v, _, _ in self.adjacency[vertex_idx]]
+
+    def lane_id(self, u: int, v: int) -> Optional[int]:
+        """Lane id for the lane between u and v in either direction"""
+        return self.lane_index.get((u, v) if u < v else (v, u))
+
+    def lane_length(self, u: int, v: int) -> float:
+        """Length of the lane between u and v"""
+        return float(self.lane_lengths[self.lane_index[(u, v) if u < v else (v, u)]])
+
+    def lane_speed(self, lane_id: int) -> float:
+        """Speed limit of a lane, falling back to the default when unset (0)"""
+        speed = self.speed_limits[lane_id]
+        return float(speed) if speed > 0 else self.default_speed
+
+    def distance(self, u: int, v: int) -> float:
+        """Straight line distance between two vertices"""
+        (x1, y1), (x2, y2) = self.coords[u], self.coords[v]
+        return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+
+    def path_lanes(self, path_indices: List[int]) -> List[int]:
+        """Lane ids traversed by a vertex path"""
+        return [self.lane_id(path_indices[i], path_indices[i + 1])
+                for i in range(len(path_indices) - 1)]
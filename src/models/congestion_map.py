@@ -0,0 +1,97 @@
+import math
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+import numpy as np
+
+# Every planner weights a lane as length * (1 + CONGESTION_WEIGHT * level)
+CONGESTION_WEIGHT = 2.0
+
+
+def cost_factors(levels) -> np.ndarray:
+    """Factor scaling each lane's length for its congestion level"""
+    return 1.0 + CONGESTION_WEIGHT * np.asarray(levels, dtype=np.float64)
+
+
+class CongestionSnapshot:
+    """Read-only congestion level of every lane at one instant, indexed by lane id"""
+
+    def __init__(self, levels: np.ndarray, taken_at: float, version: int):
+        levels.flags.writeable = False
+        self.levels = levels
+        self.taken_at = taken_at
+        self.version = version
+        self._factors: Optional[List[float]] = None
+
+    def factors(self) -> List[float]:
+        """Cost factor per lane (see cost_factors) as a Python list, for tight search loops"""
+        if self._factors is None:
+            self._factors = cost_factors(self.levels).tolist()
+        return self._factors
+
+    def is_clear(self, threshold: float = 1e-3) -> bool:
+        """True when no lane carries noticeable congestion"""
+        return not len(self.levels) or float(self.levels.max()) < threshold
+
+
+class CongestionMap:
+    """
+    Per-lane congestion that decays exponentially over time.
+
+    Each lane keeps the level it had at its last update and when that was;
+    decay is applied lazily when the lane is read or updated, so idle lanes
+    cost nothing. Planners read immutable snapshots, which are shared until
+    the map changes or they are older than max_age, without taking the lock.
+    """
+
+    def __init__(self, num_lanes: int, half_life: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.num_lanes = num_lanes
+        self.half_life = half_life
+        self.clock = clock
+        self._decay_rate = math.log(2) / half_life
+        self._levels = np.zeros(num_lanes)
+        self._stamps = np.zeros(num_lanes)
+        self.lock = threading.Lock()
+        self.version = 0
+        self._snapshot = CongestionSnapshot(np.zeros(num_lanes), clock(), 0)
+
+    ### UPDATES
+
+    def record(self, lane_ids: Iterable[int], weight: float = 0.1):
+        """Add weight to each lane traversed, on top of its decayed level"""
+        lane_ids = np.fromiter(lane_ids, dtype=np.int64)
+        if not len(lane_ids):
+            return
+        with self.lock:
+            now = self.clock()
+            self._levels[lane_ids] = self._decayed(lane_ids, now) + weight
+            self._stamps[lane_ids] = now
+            self.version += 1
+
+    def reset(self):
+        with self.lock:
+            self._levels[:] = 0.0
+            self._stamps[:] = self.clock()
+            self.version += 1
+
+    ### READS
+
+    def level(self, lane_id: int) -> float:
+        """Current decayed congestion of one lane"""
+        with self.lock:
+            return float(self._decayed(lane_id, self.clock()))
+
+    def snapshot(self, max_age: float = 1.0) -> CongestionSnapshot:
+        """Decayed levels of every lane; reuses the last snapshot while it is fresh"""
+        snapshot = self._snapshot
+        if snapshot.version == self.version and self.clock() - snapshot.taken_at < max_age:
+            return snapshot
+        with self.lock:
+            now = self.clock()
+            snapshot = CongestionSnapshot(self._decayed(slice(None), now), now, self.version)
+            self._snapshot = snapshot
+        return snapshot
+
+    def _decayed(self, lane_ids, now: float):
+        return self._levels[lane_ids] * np.exp(-self._decay_rate * (now - self._stamps[lane_ids]))
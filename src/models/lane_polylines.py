@@ -0,0 +1,48 @@
+from typing import List
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+
+
+class LanePolylines:
+    """
+    Sampled polyline of every lane, computed once per graph.
+
+    All lanes live in one (N, 2) buffer in their u -> v direction; the reverse
+    direction is a negative-stride view of the same rows.
+    """
+
+    def __init__(self, graph: CompiledGraph, resolution: float = 10.0, min_steps: int = 3):
+        self.graph = graph
+        self.resolution = resolution
+        self.min_steps = min_steps
+
+        keys = np.array(graph.lane_keys, dtype=np.int64).reshape(-1, 2)
+        steps = np.maximum(min_steps, (graph.lane_lengths / resolution).astype(np.int64))
+        counts = steps + 1
+        self.lane_starts = np.zeros(graph.num_lanes + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.lane_starts[1:])
+
+        lane_of_point = np.repeat(np.arange(graph.num_lanes), counts)
+        ratio = (np.arange(self.lane_starts[-1]) - self.lane_starts[lane_of_point]) / steps[lane_of_point]
+        u, v = keys[lane_of_point, 0], keys[lane_of_point, 1]
+        self.points = np.empty((len(ratio), 2))
+        self.points[:, 0] = graph.xs[u] + (graph.xs[v] - graph.xs[u]) * ratio
+        self.points[:, 1] = graph.ys[u] + (graph.ys[v] - graph.ys[u]) * ratio
+        self.points.flags.writeable = False
+
+    def lane_points(self, from_idx: int, to_idx: int) -> np.ndarray:
+        """View of the sampled points driving from from_idx to to_idx"""
+        lane_id = self.graph.lane_id(from_idx, to_idx)
+        start, end = self.lane_starts[lane_id], self.lane_starts[lane_id + 1]
+        if from_idx < to_idx:
+            return self.points[start:end]
+        return self.points[end - 1:start - 1 if start > 0 else None:-1]
+
+    def path_points(self, vertex_path: List[int]) -> np.ndarray:
+        """Sampled points along a vertex path, shared lane endpoints included once"""
+        if not vertex_path or len(vertex_path) < 2:
+            return np.empty((0, 2))
+        segments = [self.lane_points(vertex_path[0], vertex_path[1])]
+        for i in range(1, len(vertex_path) - 1):
+            segments.append(self.lane_points(vertex_path[i], vertex_path[i + 1])[1:])
+        return segments[0] if len(segments) == 1 else np.concatenate(segments)
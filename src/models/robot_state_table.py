@@ -0,0 +1,183 @@
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+# Status code stored per robot: the index of its status here (0 for any other)
+STATUSES = ("unknown", "idle", "waiting", "moving", "blocked", "charging", "error", "task_assigned")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# One robot per row. seq is odd while the row is being written.
+ROW = np.dtype([
+    ("seq", "<u8"),
+    ("robot_id", "S16"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("battery", "<f4"),
+    ("lane", "<i4"),
+    ("status", "u1"),
+], align=True)
+
+# int64 rows in use, float64 clock time of the last write
+HEADER = 16
+
+
+class RobotStateTable:
+    """
+    Fixed-layout table of robot state (id, x, y, status code, battery,
+    current lane, sequence number) in one shared memory block, so GUIs,
+    metrics exporters and log writers in other processes read the fleet
+    without pickling or thread hops.
+
+    The simulation process owns the table and is its only writer. Each row is
+    a seqlock: the writer makes seq odd, writes the fields and makes seq even
+    again, and a reader that sees seq odd or changed across its copy reads the
+    row again. Readers attach by name and capacity and read the arrays in
+    place; only the rows they take a consistent copy of are copied.
+    """
+
+    def __init__(self, shm: SharedMemory, capacity: int, owner: bool):
+        self.shm = shm
+        self.capacity = capacity
+        self.owner = owner
+        self._count = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+        self._written_at = np.ndarray((1,), dtype=np.float64, buffer=shm.buf, offset=8)
+        self.rows = np.ndarray((capacity,), dtype=ROW, buffer=shm.buf, offset=HEADER)
+        self.seq = self.rows["seq"]
+        # Writer side only: robot_id -> row, and robots that did not fit
+        self.row_of: Dict[str, int] = {}
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, capacity: int) -> "RobotStateTable":
+        """New zeroed table for up to capacity robots"""
+        size = HEADER + capacity * ROW.itemsize
+        table = cls(SharedMemory(create=True, size=size), capacity, owner=True)
+        table.shm.buf[:size] = bytes(size)
+        return table
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "RobotStateTable":
+        """
+        Map a table created by another process, for reading. The block stays
+        the creator's: it is not tracked here, so this process exiting does
+        not free it.
+        """
+        if sys.version_info >= (3, 13):
+            return cls(SharedMemory(name=name, track=False), capacity, owner=False)
+        shm = SharedMemory(name=name)
+        # Attaching registered the block with this process's resource tracker,
+        # which unlinks what it tracks when the process exits
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, capacity, owner=False)
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self._count = self._written_at = self.rows = self.seq = None
+        self.shm.close()
+        if self.owner:
+            # Readers forked from this process share its resource tracker and
+            # dropped the block from it on attach; unlink unregisters it again
+            resource_tracker.register(self.shm._name, "shared_memory")
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                # Already freed by someone else
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+
+    ### WRITING
+
+    def _row(self, robot_id: str) -> int:
+        """Row of robot_id, taking the next free one for a new robot (-1 when full)"""
+        row = self.row_of.get(robot_id)
+        if row is None:
+            count = len(self.row_of)
+            if count == self.capacity:
+                self.dropped += 1
+                return -1
+            row = self.row_of[robot_id] = count
+            self.rows["robot_id"][row] = robot_id.encode()[:16]
+            # Publish the row count after the id, so readers never see an unnamed row
+            self._count[0] = count + 1
+        return row
+
+    def write_robots(self, robots: Sequence, positions: Sequence[tuple], now: float,
+                     lanes: Optional[Sequence[int]] = None):
+        """Write the state of robots (at their given positions and lanes, when known) as of now"""
+        with self.lock:
+            rows = [self._row(robot.robot_id) for robot in robots]
+            kept = [i for i, row in enumerate(rows) if row >= 0]
+            if not kept:
+                return
+            index = np.array([rows[i] for i in kept], dtype=np.int64)
+            table = self.rows
+            self.seq[index] += 1
+            table["x"][index] = [positions[i][0] for i in kept]
+            table["y"][index] = [positions[i][1] if len(positions[i]) > 1 else 0.0 for i in kept]
+            table["battery"][index] = [robots[i].battery_level for i in kept]
+            table["lane"][index] = [lanes[i] if lanes is not None else robots[i].current_lane(now) for i in kept]
+            table["status"][index] = [STATUS_CODES.get(robots[i].status, 0) for i in kept]
+            self.seq[index] += 1
+            self._written_at[0] = now
+
+    ### OBSERVER
+
+    def robot_spawned(self, robot):
+        self.robot_changed(robot)
+
+    def robot_changed(self, robot):
+        """Write one robot's row as of the fleet clock"""
+        self.write_robots([robot], [robot.position], robot.fleet_manager.clock())
+
+    ### READING
+
+    def count(self) -> int:
+        """Rows in use"""
+        return int(self._count[0])
+
+    def written_at(self) -> float:
+        """Writer clock time of the last write"""
+        return float(self._written_at[0])
+
+    def read(self, row: int) -> np.void:
+        """Consistent copy of one row"""
+        seq = self.seq
+        while True:
+            before = seq[row]
+            if not before & 1:
+                copy = self.rows[row].copy()
+                if seq[row] == before:
+                    return copy
+            time.sleep(0)
+
+    def snapshot(self) -> np.ndarray:
+        """
+        Consistent copy of every row in use (each row as of one write; rows
+        may be from different writes). Rows caught mid-write are read again.
+        """
+        count = self.count()
+        seq = self.seq[:count]
+        before = seq.copy()
+        copy = self.rows[:count].copy()
+        torn = np.flatnonzero((before & 1).astype(bool) | (seq != before))
+        for row in torn.tolist():
+            copy[row] = self.read(row)
+        return copy
+
+    def find(self, robot_id: str) -> int:
+        """Row of robot_id, from a reader (-1 when absent)"""
+        rows = np.flatnonzero(self.rows["robot_id"][:self.count()] == robot_id.encode())
+        return int(rows[0]) if len(rows) else -1
+
+    @staticmethod
+    def statuses(codes: np.ndarray) -> List[str]:
+        """Status names of status codes"""
+        return [STATUSES[code] for code in codes.tolist()]
@@ -0,0 +1,94 @@
+import threading
+from typing import Dict, Iterable, List
+import numpy as np
+from src.models.robot_state_table import STATUS_CODES, STATUSES
+
+
+class PathHistory(list):
+    """List of recent path vertices that keeps only the last maxlen on extend"""
+    __slots__ = ()
+    maxlen = 256
+
+    def extend(self, vertices: Iterable[int]):
+        super().extend(vertices)
+        if len(self) > self.maxlen:
+            del self[:len(self) - self.maxlen]
+
+
+class RobotStore:
+    """
+    Columnar state of every robot in a fleet: NumPy arrays of positions,
+    status codes, battery levels (whole percent), current lanes and
+    trajectory start times, one row per robot.
+
+    Robot objects are thin views holding their row, so a fleet of thousands
+    of robots costs a few arrays rather than thousands of attribute dicts,
+    and whole-fleet readers can work on the columns directly. x and y hold
+    each robot's position as of the last scheduler tick (or when it was last
+    placed or started a trajectory); lane is the lane it was driving then
+    (-1 when stopped).
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.status = np.zeros(capacity, dtype=np.uint8)
+        self.battery = np.zeros(capacity, dtype=np.uint8)
+        self.lane = np.full(capacity, -1, dtype=np.int32)
+        self.departure = np.zeros(capacity)
+        self.ids: List[str] = []
+        # Row -> recent path vertices, only for robots that have any
+        self.path_histories: Dict[int, PathHistory] = {}
+        # Serializes writers: moves that set a robot's position and trajectory
+        # together, the scheduler's per-tick update, and rows added (which may
+        # reallocate the columns)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, robot_id: str, position: tuple, status: str = "waiting", battery: int = 100) -> int:
+        """
+        Row for a new robot. Takes the lock: growing reallocates every column,
+        and a tick writing into the old arrays meanwhile would be lost.
+        """
+        with self.lock:
+            row = len(self.ids)
+            if row == len(self.x):
+                grow = len(self.x)
+                self.x = np.concatenate((self.x, np.zeros(grow)))
+                self.y = np.concatenate((self.y, np.zeros(grow)))
+                self.status = np.concatenate((self.status, np.zeros(grow, dtype=np.uint8)))
+                self.battery = np.concatenate((self.battery, np.zeros(grow, dtype=np.uint8)))
+                self.lane = np.concatenate((self.lane, np.full(grow, -1, dtype=np.int32)))
+                self.departure = np.concatenate((self.departure, np.zeros(grow)))
+            self.ids.append(robot_id)
+            self.x[row], self.y[row] = position
+            self.status[row] = self.status_code(status)
+            self.battery[row] = battery
+            self.lane[row] = -1
+            return row
+
+    def update(self, rows: List[int], positions: List[tuple], lanes: List[int]):
+        """Write positions and current lanes of rows at once; needs lock"""
+        index = np.array(rows, dtype=np.int64)
+        self.x[index] = [position[0] for position in positions]
+        self.y[index] = [position[1] for position in positions]
+        self.lane[index] = lanes
+
+    def path_history(self, row: int) -> PathHistory:
+        history = self.path_histories.get(row)
+        if history is None:
+            history = self.path_histories[row] = PathHistory()
+        return history
+
+    @staticmethod
+    def status_code(status: str) -> int:
+        code = STATUS_CODES.get(status)
+        if code is None:
+            raise ValueError(f"Unknown robot status: {status}")
+        return code
+
+    @staticmethod
+    def status_name(code: int) -> str:
+        return STATUSES[code]
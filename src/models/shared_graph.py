@@ -0,0 +1,63 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+
+# (array name, byte offset, dtype, shape) of each array in the block
+Layout = List[Tuple[str, int, str, Tuple[int, ...]]]
+
+
+class SharedGraph:
+    """
+    The arrays of a CompiledGraph packed into one shared memory block.
+
+    The owning process creates the block once per graph; worker processes
+    attach by name and layout and wrap the arrays in place, so the graph is
+    never pickled per task. Call close() in every process that is done with
+    it; the owner's close() also frees the block.
+    """
+
+    ALIGNMENT = 8
+
+    def __init__(self, shm: SharedMemory, layout: Layout, owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, offset, dtype, shape in layout
+        }
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, graph: CompiledGraph) -> "SharedGraph":
+        """Copy graph's arrays into a new shared block"""
+        sources = {name: np.ascontiguousarray(getattr(graph, name)) for name in CompiledGraph.ARRAYS}
+        layout: Layout = []
+        size = 0
+        for name, array in sources.items():
+            layout.append((name, size, array.dtype.str, array.shape))
+            size += -(-array.nbytes // cls.ALIGNMENT) * cls.ALIGNMENT
+        shared = cls(SharedMemory(create=True, size=max(size, 1)), layout, owner=True)
+        for name, array in sources.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, layout: Layout) -> "SharedGraph":
+        """Map a block created by another process"""
+        return cls(SharedMemory(name=name), layout, owner=False)
+
+    def graph(self, default_speed: float = 1.0) -> CompiledGraph:
+        """A CompiledGraph over the shared arrays"""
+        return CompiledGraph.from_arrays(self.arrays, default_speed)
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
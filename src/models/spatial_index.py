@@ -0,0 +1,94 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+class SpatialIndex:
+    """Grid hash over vertex coordinates for position-to-vertex lookups"""
+
+    def __init__(self, coords: List[Tuple[float, float]], tolerance: float = 0.001):
+        self.coords = coords
+        self.tolerance = tolerance
+
+        # Exact lookups: cells the size of the match tolerance, so a match can
+        # only live in the query cell or one of its 8 neighbours.
+        self._exact: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for idx, (x, y) in enumerate(coords):
+            self._exact[(math.floor(x / tolerance), math.floor(y / tolerance))].append(idx)
+
+        # Nearest lookups: coarse cells holding roughly one vertex each
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.cell_size = 1.0
+        if coords:
+            xs = [c[0] for c in coords]
+            ys = [c[1] for c in coords]
+            width = max(xs) - min(xs)
+            height = max(ys) - min(ys)
+            area = width * height
+            if area > 0:
+                self.cell_size = math.sqrt(area / len(coords))
+            elif max(width, height) > 0:
+                self.cell_size = max(width, height) / len(coords)
+            for idx, (x, y) in enumerate(coords):
+                self._grid[self._cell(x, y)].append(idx)
+            cells = list(self._grid)
+            self._min_cell = (min(c[0] for c in cells), min(c[1] for c in cells))
+            self._max_cell = (max(c[0] for c in cells), max(c[1] for c in cells))
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    ### QUERIES
+
+    def find(self, position: tuple) -> int:
+        """Index of the vertex at position (within tolerance), or -1"""
+        px = position[0]
+        py = position[1] if len(position) > 1 else 0
+        cx = math.floor(px / self.tolerance)
+        cy = math.floor(py / self.tolerance)
+
+        found = -1
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for idx in self._exact.get((cx + dx, cy + dy), ()):
+                    vx, vy = self.coords[idx]
+                    if (abs(vx - px) < self.tolerance and abs(vy - py) < self.tolerance
+                            and (found == -1 or idx < found)):
+                        found = idx
+        return found
+
+    def nearest(self, position: tuple) -> Tuple[int, float]:
+        """Closest vertex to an arbitrary position as (index, distance)"""
+        if not self.coords:
+            return -1, float('inf')
+
+        px = position[0]
+        py = position[1] if len(position) > 1 else 0
+        cx, cy = self._cell(px, py)
+        max_ring = max(abs(cx - self._min_cell[0]), abs(cx - self._max_cell[0]),
+                       abs(cy - self._min_cell[1]), abs(cy - self._max_cell[1]))
+
+        best_idx, best_dist = -1, float('inf')
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(cx, cy, ring):
+                for idx in self._grid.get(cell, ()):
+                    vx, vy = self.coords[idx]
+                    dist = math.hypot(vx - px, vy - py)
+                    if dist < best_dist or (dist == best_dist and idx < best_idx):
+                        best_idx, best_dist = idx, dist
+            # Anything in the next ring is at least ring * cell_size away
+            if best_idx != -1 and best_dist <= ring * self.cell_size:
+                break
+        return best_idx, best_dist
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
@@ -0,0 +1,147 @@
+import math
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+
+
+class Trajectory:
+    """
+    Time-parameterized motion along a polyline, stored as (t, x, y) samples.
+
+    Each segment is driven with a trapezoidal speed profile bounded by its
+    speed limit and the acceleration limit. The robot starts and ends at rest
+    and slows for the lower limit at each junction.
+    """
+    SAMPLE_DT = 0.05
+
+    def __init__(self, times: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                 segment_times: List[Tuple[float, float]], lane_ids: Optional[List[int]] = None):
+        self.times = times
+        self.xs = xs
+        self.ys = ys
+        self.segment_times = segment_times
+        # Segment end times, ascending, for segment_at
+        self.segment_ends = [end for _, end in segment_times]
+        self.lane_ids = lane_ids or []
+        self.duration = float(times[-1])
+        self.start_position = (float(xs[0]), float(ys[0]))
+        self.end_position = (float(xs[-1]), float(ys[-1]))
+
+    ### BUILDING
+
+    @classmethod
+    def from_path(cls, graph: CompiledGraph, vertex_path: List[int], max_accel: float = 1.0,
+                  default_speed: Optional[float] = None) -> "Trajectory":
+        """Trajectory along a vertex path using lane lengths and speed_limit metadata"""
+        points = [graph.coords[idx] for idx in vertex_path]
+        lane_ids = graph.path_lanes(vertex_path)
+        default_speed = default_speed or graph.default_speed
+        speeds = [float(graph.speed_limits[lane]) or default_speed for lane in lane_ids]
+        trajectory = cls.from_polyline(points, speeds, max_accel)
+        trajectory.lane_ids = lane_ids
+        return trajectory
+
+    @classmethod
+    def from_polyline(cls, points: Sequence[Tuple[float, float]], speed_limits: Sequence[float],
+                      max_accel: float = 1.0) -> "Trajectory":
+        """Trajectory through waypoints, one speed limit per segment"""
+        points = [(float(p[0]), float(p[1]) if len(p) > 1 else 0.0) for p in points]
+        if len(points) < 2:
+            x, y = points[0] if points else (0.0, 0.0)
+            return cls(np.zeros(1), np.array([x]), np.array([y]), [])
+
+        lengths = [math.dist(points[i], points[i + 1]) for i in range(len(points) - 1)]
+        junction_speeds = cls._junction_speeds(lengths, speed_limits, max_accel)
+
+        times, xs, ys, segment_times = [], [], [], []
+        t0 = 0.0
+        for i, length in enumerate(lengths):
+            seg_t, seg_s, seg_duration = cls._segment_profile(
+                length, speed_limits[i], junction_speeds[i], junction_speeds[i + 1], max_accel)
+            ratio = seg_s / length if length > 0 else np.zeros_like(seg_s)
+            (x0, y0), (x1, y1) = points[i], points[i + 1]
+            times.append(t0 + seg_t)
+            xs.append(x0 + (x1 - x0) * ratio)
+            ys.append(y0 + (y1 - y0) * ratio)
+            segment_times.append((t0, t0 + seg_duration))
+            t0 += seg_duration
+
+        times.append(np.array([t0]))
+        xs.append(np.array([points[-1][0]]))
+        ys.append(np.array([points[-1][1]]))
+        return cls(np.concatenate(times), np.concatenate(xs), np.concatenate(ys), segment_times)
+
+    @classmethod
+    def from_schedule(cls, graph: CompiledGraph, schedule: Sequence[Tuple[int, float, float]]) -> "Trajectory":
+        """
+        Trajectory through timed (vertex, arrival, departure) waypoints, e.g.
+        from the batch planner: the robot waits at each vertex until its
+        departure and drives each lane at constant speed.
+        """
+        times, xs, ys, segment_times = [], [], [], []
+        for i, (vertex, arrive, depart) in enumerate(schedule):
+            x, y = graph.coords[vertex]
+            times.append(arrive)
+            xs.append(x)
+            ys.append(y)
+            if i + 1 < len(schedule):
+                if depart > arrive:
+                    times.append(depart)
+                    xs.append(x)
+                    ys.append(y)
+                segment_times.append((depart, schedule[i + 1][1]))
+        lane_ids = graph.path_lanes([vertex for vertex, _, _ in schedule])
+        return cls(np.array(times, dtype=float), np.array(xs, dtype=float), np.array(ys, dtype=float),
+                   segment_times, lane_ids)
+
+    @staticmethod
+    def _junction_speeds(lengths: List[float], limits: Sequence[float], accel: float) -> List[float]:
+        """Highest feasible speed at each waypoint: at rest at both ends, within both lane limits"""
+        speeds = [0.0] + [min(limits[i], limits[i + 1]) for i in range(len(lengths) - 1)] + [0.0]
+        for i, length in enumerate(lengths):
+            speeds[i + 1] = min(speeds[i + 1], math.sqrt(speeds[i] ** 2 + 2 * accel * length))
+        for i in range(len(lengths) - 1, -1, -1):
+            speeds[i] = min(speeds[i], math.sqrt(speeds[i + 1] ** 2 + 2 * accel * lengths[i]))
+        return speeds
+
+    @classmethod
+    def _segment_profile(cls, length: float, limit: float, v_in: float, v_out: float,
+                         accel: float) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Sample times and distances of an accelerate/cruise/decelerate profile"""
+        if length <= 0:
+            return np.zeros(1), np.zeros(1), 0.0
+        peak = min(limit, math.sqrt((2 * accel * length + v_in ** 2 + v_out ** 2) / 2))
+        peak = max(peak, v_in, v_out)
+        accel_dist = (peak ** 2 - v_in ** 2) / (2 * accel)
+        decel_dist = (peak ** 2 - v_out ** 2) / (2 * accel)
+        cruise_dist = max(0.0, length - accel_dist - decel_dist)
+        t_accel = (peak - v_in) / accel
+        t_cruise = cruise_dist / peak if peak > 0 else 0.0
+        t_decel = (peak - v_out) / accel
+        duration = t_accel + t_cruise + t_decel
+
+        t = np.arange(0.0, duration, cls.SAMPLE_DT)
+        in_cruise = t - t_accel
+        in_decel = t - t_accel - t_cruise
+        s = np.where(
+            t < t_accel,
+            v_in * t + 0.5 * accel * t ** 2,
+            np.where(
+                t < t_accel + t_cruise,
+                accel_dist + peak * in_cruise,
+                accel_dist + cruise_dist + peak * in_decel - 0.5 * accel * in_decel ** 2,
+            ),
+        )
+        return t, np.clip(s, 0.0, length), duration
+
+    ### EVALUATION
+
+    def position_at(self, t: float) -> Tuple[float, float]:
+        """Position t seconds after the trajectory started"""
+        return (float(np.interp(t, self.times, self.xs)), float(np.interp(t, self.times, self.ys)))
+
+    def segment_at(self, t: float) -> int:
+        """Index of the segment (lane) being driven at time t, -1 once finished"""
+        i = bisect_right(self.segment_ends, t)
+        return i if i < len(self.segment_ends) else -1
@@ -0,0 +1,122 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+INF = float('inf')
+OFF_GRAPH = -1
+
+
+class VertexOccupancy:
+    """
+    Which robots stand on which vertex, kept up to date as robots move
+    instead of being rebuilt by scanning every robot.
+
+    Robots report where they are placed and, when they start a trajectory,
+    the timed moves it implies (leaving the start vertex at departure,
+    reaching the goal at arrival). Scheduled moves are applied on the first
+    read after they fall due, so the index is exact even though robot
+    positions themselves are only evaluated lazily.
+
+    Writers serialize on a lock. Each vertex maps to an immutable tuple that
+    is swapped as a whole, so readers never need the lock except to apply a
+    scheduled move that has fallen due.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self._occupants: Dict[int, Tuple[str, ...]] = {}
+        self._vertex_of: Dict[str, int] = {}
+        # (time, seq, robot_id, generation, vertex); entries of an older generation are stale
+        self._scheduled: List[Tuple[float, int, str, int, int]] = []
+        self._generation: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._next_due = INF
+        self.version = 0
+
+    ### UPDATES
+
+    def place(self, robot_id: str, vertex: int, moves: Iterable[Tuple[float, int]] = ()):
+        """
+        Put robot_id on vertex (OFF_GRAPH between vertices) now, replacing
+        any moves scheduled for it, then schedule the (time, vertex) moves.
+        """
+        with self.lock:
+            generation = self._generation.get(robot_id, 0) + 1
+            self._generation[robot_id] = generation
+            self._move(robot_id, vertex)
+            for at, next_vertex in moves:
+                heapq.heappush(self._scheduled, (at, next(self._seq), robot_id, generation, next_vertex))
+            self._next_due = self._scheduled[0][0] if self._scheduled else INF
+
+    def remove(self, robot_id: str):
+        with self.lock:
+            self._move(robot_id, OFF_GRAPH)
+            self._generation.pop(robot_id, None)
+
+    def clear(self):
+        with self.lock:
+            self._occupants = {}
+            self._vertex_of = {}
+            self._scheduled = []
+            self._generation = {}
+            self._next_due = INF
+            self.version += 1
+
+    def _move(self, robot_id: str, vertex: int):
+        old = self._vertex_of.pop(robot_id, OFF_GRAPH)
+        if old == vertex:
+            if vertex != OFF_GRAPH:
+                self._vertex_of[robot_id] = vertex
+            return
+        if old != OFF_GRAPH:
+            remaining = tuple(r for r in self._occupants.get(old, ()) if r != robot_id)
+            if remaining:
+                self._occupants[old] = remaining
+            else:
+                self._occupants.pop(old, None)
+        if vertex != OFF_GRAPH:
+            self._occupants[vertex] = self._occupants.get(vertex, ()) + (robot_id,)
+            self._vertex_of[robot_id] = vertex
+        self.version += 1
+
+    def _settle(self):
+        """Apply scheduled moves that have fallen due"""
+        if self._next_due > self.clock():
+            return
+        with self.lock:
+            now = self.clock()
+            scheduled = self._scheduled
+            while scheduled and scheduled[0][0] <= now:
+                _, _, robot_id, generation, vertex = heapq.heappop(scheduled)
+                if self._generation.get(robot_id) == generation:
+                    self._move(robot_id, vertex)
+            self._next_due = scheduled[0][0] if scheduled else INF
+
+    ### READS
+
+    def occupants(self, vertex: int) -> Tuple[str, ...]:
+        """Robots standing on vertex"""
+        self._settle()
+        return self._occupants.get(vertex, ())
+
+    def occupant(self, vertex: int) -> Optional[str]:
+        """A robot standing on vertex, or None"""
+        occupants = self.occupants(vertex)
+        return occupants[0] if occupants else None
+
+    def is_free(self, vertex: int) -> bool:
+        return not self.occupants(vertex)
+
+    def vertex_of(self, robot_id: str) -> int:
+        """Vertex robot_id stands on, OFF_GRAPH while between vertices or unknown"""
+        self._settle()
+        return self._vertex_of.get(robot_id, OFF_GRAPH)
+
+    def as_dict(self) -> Dict[int, Tuple[str, ...]]:
+        """Copy of every occupied vertex and its robots"""
+        self._settle()
+        with self.lock:
+            return dict(self._occupants)
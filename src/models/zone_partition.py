@@ -0,0 +1,52 @@
+from typing import List, Tuple
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+
+
+class ZonePartition:
+    """
+    Split of a CompiledGraph into the cells of a columns x rows spatial grid.
+
+    Every vertex belongs to the zone its coordinates fall in. A lane belongs
+    to the zone of its lower-numbered vertex, so lanes that cross a border
+    still have exactly one owner.
+    """
+
+    def __init__(self, graph: CompiledGraph, columns: int = 2, rows: int = 2):
+        self.graph = graph
+        self.columns = columns
+        self.rows = rows
+        self.num_zones = columns * rows
+        xs, ys = graph.xs, graph.ys
+        if graph.num_vertices:
+            cx = self._cells(xs, columns)
+            cy = self._cells(ys, rows)
+            self.vertex_zone = (cy * columns + cx).astype(np.int32)
+        else:
+            self.vertex_zone = np.zeros(0, dtype=np.int32)
+        keys = graph.lane_key_array
+        self.lane_zone = self.vertex_zone[keys[:, 0]]
+        self.border_lanes = np.flatnonzero(self.vertex_zone[keys[:, 0]] != self.vertex_zone[keys[:, 1]])
+
+    @staticmethod
+    def _cells(values: np.ndarray, count: int) -> np.ndarray:
+        low, span = values.min(), values.max() - values.min()
+        if span <= 0:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - low) / span * count).astype(np.int64), count - 1)
+
+    def zone_lanes(self, zone: int) -> np.ndarray:
+        """Lane ids owned by zone"""
+        return np.flatnonzero(self.lane_zone == zone)
+
+    def split_lanes(self, lane_ids: List[int]) -> List[Tuple[int, List[int]]]:
+        """A path's lane ids as consecutive runs by owning zone: [(zone, lane_ids)]"""
+        segments: List[Tuple[int, List[int]]] = []
+        lane_zone = self.lane_zone
+        for lane_id in lane_ids:
+            zone = int(lane_zone[lane_id])
+            if segments and segments[-1][0] == zone:
+                segments[-1][1].append(lane_id)
+            else:
+                segments.append((zone, [lane_id]))
+        return segments
@@ -0,0 +1,142 @@
+import hashlib
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+
+
+class DistanceTable:
+    """All-pairs shortest distances and next hops for an uncongested graph"""
+    FLOYD_WARSHALL_LIMIT = 400
+    DIJKSTRA_CHUNK = 64
+
+    def __init__(self, dist: np.ndarray, next_hop: np.ndarray):
+        self.dist = dist
+        self.next_hop = next_hop
+
+    ### BUILDING
+
+    @classmethod
+    def build(cls, graph: CompiledGraph, workers: Optional[int] = None) -> "DistanceTable":
+        """Floyd-Warshall for small maps, repeated Dijkstra in a process pool otherwise"""
+        if graph.num_vertices <= cls.FLOYD_WARSHALL_LIMIT:
+            return cls(*cls._floyd_warshall(graph))
+        return cls(*cls._parallel_dijkstra(graph, workers))
+
+    @staticmethod
+    def _floyd_warshall(graph: CompiledGraph) -> Tuple[np.ndarray, np.ndarray]:
+        n = graph.num_vertices
+        dist = np.full((n, n), np.inf)
+        next_hop = np.full((n, n), -1, dtype=np.int32)
+        sources = np.repeat(np.arange(n, dtype=np.int32), np.diff(graph.offsets))
+        dist[sources, graph.targets] = graph.arc_lengths
+        next_hop[sources, graph.targets] = graph.targets
+        np.fill_diagonal(dist, 0.0)
+        np.fill_diagonal(next_hop, np.arange(n, dtype=np.int32))
+
+        for k in range(n):
+            via_k = dist[:, k, None] + dist[None, k, :]
+            shorter = via_k < dist
+            dist = np.where(shorter, via_k, dist)
+            next_hop = np.where(shorter, next_hop[:, k, None], next_hop)
+        return dist, next_hop
+
+    @classmethod
+    def _parallel_dijkstra(cls, graph: CompiledGraph, workers: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        n = graph.num_vertices
+        dist = np.empty((n, n))
+        next_hop = np.empty((n, n), dtype=np.int32)
+        chunks = [list(range(i, min(i + cls.DIJKSTRA_CHUNK, n)))
+                  for i in range(0, n, cls.DIJKSTRA_CHUNK)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(graph.adjacency,)) as pool:
+            for sources, (dist_rows, hop_rows) in zip(chunks, pool.map(_dijkstra_rows, chunks)):
+                dist[sources[0]:sources[-1] + 1] = dist_rows
+                next_hop[sources[0]:sources[-1] + 1] = hop_rows
+        return dist, next_hop
+
+    ### DISK CACHE
+
+    @staticmethod
+    def graph_hash(nav_graph: dict) -> str:
+        """Stable hash of a nav_graph level, used as the cache key"""
+        payload = json.dumps(nav_graph, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    @classmethod
+    def load_or_build(cls, nav_graph: dict, graph: CompiledGraph, cache_dir: str = "cache",
+                      workers: Optional[int] = None) -> Tuple["DistanceTable", bool]:
+        """Memory-map cached tables for this graph, building and saving them on a miss"""
+        key = cls.graph_hash(nav_graph)
+        dist_path = os.path.join(cache_dir, f"apsp_{key}_dist.npy")
+        hop_path = os.path.join(cache_dir, f"apsp_{key}_next.npy")
+
+        if os.path.exists(dist_path) and os.path.exists(hop_path):
+            return cls(np.load(dist_path, mmap_mode="r"), np.load(hop_path, mmap_mode="r")), True
+
+        table = cls.build(graph, workers)
+        os.makedirs(cache_dir, exist_ok=True)
+        for path, array in ((dist_path, table.dist), (hop_path, table.next_hop)):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        return cls(np.load(dist_path, mmap_mode="r"), np.load(hop_path, mmap_mode="r")), False
+
+    ### QUERIES
+
+    def cost(self, start_idx: int, end_idx: int) -> float:
+        """Shortest path length, inf when unreachable"""
+        return float(self.dist[start_idx, end_idx])
+
+    def path(self, start_idx: int, end_idx: int) -> List[int]:
+        """Walk the next-hop table from start to end"""
+        if self.next_hop[start_idx, end_idx] == -1:
+            return []
+        path = [start_idx]
+        current = start_idx
+        while current != end_idx:
+            current = int(self.next_hop[current, end_idx])
+            path.append(current)
+        return path
+
+
+### PROCESS POOL WORKERS
+
+_worker_adjacency = None
+
+
+def _init_worker(adjacency):
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+
+def _dijkstra_rows(sources: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Single-source Dijkstra from each source, recording the first hop of every path"""
+    adjacency = _worker_adjacency
+    n = len(adjacency)
+    dist_rows = np.full((len(sources), n), np.inf)
+    hop_rows = np.full((len(sources), n), -1, dtype=np.int32)
+
+    for row, source in enumerate(sources):
+        dist = [float('inf')] * n
+        first_hop = [-1] * n
+        dist[source] = 0.0
+        first_hop[source] = source
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, _, length in adjacency[u]:
+                nd = d + length
+                if nd < dist[v]:
+                    dist[v] = nd
+                    first_hop[v] = v if u == source else first_hop[u]
+                    heapq.heappush(heap, (nd, v))
+        dist_rows[row] = dist
+        hop_rows[row] = first_hop
+    return dist_rows, hop_rows
@@ -1,119 +1,230 @@
 import heapq
-from typing import Dict, List, Tuple, Optional
-from functools import lru_cache
+import numpy as np
+from typing import Callable, Dict, List, Sequence, Tuple, Optional
+from src.models.compiled_graph import CompiledGraph
+from src.utils.path_cache import PathCache
 
 class PathFinder:
     _CACHE_SIZE = 1000  
+    _cache = PathCache(maxsize=_CACHE_SIZE)
     
     @classmethod
-    @lru_cache(maxsize=_CACHE_SIZE)
     def find_path(
         cls,
-        nav_graph_tuple: tuple,  
+        graph: CompiledGraph,
         start_idx: int,
         end_idx: int,
-        congestion_tuple: Optional[tuple] = None  
+        congestion: Optional[Sequence[float]] = None,
+        congestion_epoch: int = 0
     ) -> List[int]:
-       
-        nav_graph = {
-            "vertices": nav_graph_tuple[0],
-            "lanes": nav_graph_tuple[1]
-        }
-        congestion_data = dict(congestion_tuple) if congestion_tuple else None
-        
+        """
+        Find a path on a CompiledGraph, reusing cached results.
+
+        congestion holds a cost factor per lane id (CongestionSnapshot.factors)
+        that scales lane lengths. Entries are keyed by (graph version, start,
+        end, congestion epoch); callers that change congestion must either bump
+        the epoch or call invalidate_lanes.
+        """
         if start_idx == end_idx:
             return []
 
-        if len(nav_graph["vertices"]) > 100:
-            return cls._bidirectional_search(nav_graph, start_idx, end_idx, congestion_data)
-            
-        return cls._a_star_search(nav_graph, start_idx, end_idx, congestion_data)
+        key = (graph.version, start_idx, end_idx, congestion_epoch)
+        path = cls._cache.get(key)
+        if path is not None:
+            return path
+
+        path = cls.search(graph, start_idx, end_idx, congestion)
+        cls._cache.put(key, path)
+        return path
+
+    @classmethod
+    def search(
+        cls,
+        graph: CompiledGraph,
+        start_idx: int,
+        end_idx: int,
+        congestion: Optional[Sequence[float]] = None
+    ) -> List[int]:
+        """Uncached search: bidirectional A* on graphs over 100 vertices, A* otherwise"""
+        if graph.num_vertices > 100:
+            return cls._bidirectional_search(graph, start_idx, end_idx, congestion)
+        return cls._a_star_search(graph, start_idx, end_idx, congestion)
+
+    @classmethod
+    def invalidate_lanes(cls, lanes: List[Tuple[int, int]]) -> int:
+        """Drop cached paths that use any of the given lanes"""
+        return cls._cache.invalidate_lanes(lanes)
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        return cls._cache.stats()
 
     @staticmethod
     def _a_star_search(
-        nav_graph: Dict,
+        graph: CompiledGraph,
         start_idx: int,
         end_idx: int,
-        congestion_data: Optional[Dict[Tuple[int, int], float]] = None
+        congestion: Optional[Sequence[float]] = None,
+        stats: Optional[Dict[str, int]] = None
     ) -> List[int]:
         """Optimized A* implementation with micro-optimizations"""
-        vertices = nav_graph["vertices"]
-        lanes = nav_graph["lanes"]
-        
-        end_pos = vertices[end_idx]
-        heuristic_cache = [0] * len(vertices)
-        for i, pos in enumerate(vertices):
-            dx = pos[0] - end_pos[0]
-            dy = pos[1] - end_pos[1]
-            heuristic_cache[i] = (dx*dx + dy*dy)**0.5
+        adjacency = graph.adjacency
+        heuristic_cache = PathFinder._heuristic_to(graph, end_idx)
 
         open_set = []
         heapq.heappush(open_set, (0, start_idx))
         came_from = {}
         g_score = {start_idx: 0}
-        open_set_hash = {start_idx}
+        closed = set()
+        expanded = 0
 
         while open_set:
             current = heapq.heappop(open_set)[1]
-            open_set_hash.remove(current)
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
 
             if current == end_idx:
+                if stats is not None:
+                    stats["expanded"] = expanded
                 path = [current]
                 while current in came_from:
                     current = came_from[current]
                     path.append(current)
                 return path[::-1]
 
-            neighbors = set()
-            for lane in lanes:
-                if lane[0] == current:
-                    neighbors.add(lane[1])
-                elif lane[1] == current:
-                    neighbors.add(lane[0])
-
-            current_pos = vertices[current]
             current_g = g_score[current]
-            
-            for neighbor in neighbors:
-                neighbor_pos = vertices[neighbor]
-                dx = current_pos[0] - neighbor_pos[0]
-                dy = current_pos[1] - neighbor_pos[1]
-                base_cost = (dx*dx + dy*dy)**0.5
-                
-                if congestion_data:
-                    congestion = congestion_data.get((current, neighbor), 0)
-                    congestion += congestion_data.get((neighbor, current), 0)
-                    base_cost *= (1 + congestion)
-                
+
+            for neighbor, lane_id, base_cost in adjacency[current]:
+                if congestion is not None:
+                    base_cost *= congestion[lane_id]
+
                 tentative_g = current_g + base_cost
-                
+
                 if neighbor not in g_score or tentative_g < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic_cache[neighbor]
-                    if neighbor not in open_set_hash:
-                        heapq.heappush(open_set, (f_score, neighbor))
-                        open_set_hash.add(neighbor)
+                    heapq.heappush(open_set, (tentative_g + heuristic_cache[neighbor], neighbor))
 
+        if stats is not None:
+            stats["expanded"] = expanded
         return []
 
     @staticmethod
     def _bidirectional_search(
-        nav_graph: Dict,
+        graph: CompiledGraph,
         start_idx: int,
         end_idx: int,
-        congestion_data: Optional[Dict[Tuple[int, int], float]] = None
+        congestion: Optional[Sequence[float]] = None,
+        stats: Optional[Dict[str, int]] = None
     ) -> List[int]:
-        """Bidirectional A* for large graphs"""
+        """
+        Bidirectional A* for large graphs.
+
+        Both searches use the average potential p(v) = (h_end(v) - h_start(v)) / 2
+        (negated for the backward search), which keeps reduced lane costs
+        non-negative in both directions. With those keys the search can stop as
+        soon as the two queue minimums sum to at least the best meeting cost.
+        """
+        if start_idx == end_idx:
+            if stats is not None:
+                stats["expanded"] = 0
+            return [start_idx]
+
+        adjacency = graph.adjacency
+        to_end = np.hypot(graph.xs - graph.xs[end_idx], graph.ys - graph.ys[end_idx])
+        to_start = np.hypot(graph.xs - graph.xs[start_idx], graph.ys - graph.ys[start_idx])
+        potential = ((to_end - to_start) * 0.5).tolist()
+
+        dist = ({start_idx: 0.0}, {end_idx: 0.0})
+        came_from = ({}, {})
+        closed = (set(), set())
+        open_sets = ([(potential[start_idx], start_idx)], [(-potential[end_idx], end_idx)])
+        direction = (1.0, -1.0)
+
+        best_cost = float('inf')
+        meeting = None
+        expanded = 0
+
+        while open_sets[0] and open_sets[1]:
+            if open_sets[0][0][0] + open_sets[1][0][0] >= best_cost:
+                break
 
-        pass
+            side = 0 if open_sets[0][0][0] <= open_sets[1][0][0] else 1
+            current = heapq.heappop(open_sets[side])[1]
+            if current in closed[side]:
+                continue
+            closed[side].add(current)
+            expanded += 1
+
+            side_dist, other_dist = dist[side], dist[1 - side]
+            current_g = side_dist[current]
+            sign = direction[side]
+
+            for neighbor, lane_id, base_cost in adjacency[current]:
+                if congestion is not None:
+                    base_cost *= congestion[lane_id]
+
+                tentative_g = current_g + base_cost
+                if tentative_g < side_dist.get(neighbor, float('inf')):
+                    side_dist[neighbor] = tentative_g
+                    came_from[side][neighbor] = current
+                    heapq.heappush(open_sets[side], (tentative_g + sign * potential[neighbor], neighbor))
+
+                    if neighbor in other_dist and tentative_g + other_dist[neighbor] < best_cost:
+                        best_cost = tentative_g + other_dist[neighbor]
+                        meeting = neighbor
+
+        if stats is not None:
+            stats["expanded"] = expanded
+        if meeting is None:
+            return []
+
+        path = [meeting]
+        current = meeting
+        while current in came_from[0]:
+            current = came_from[0][current]
+            path.append(current)
+        path.reverse()
+        current = meeting
+        while current in came_from[1]:
+            current = came_from[1][current]
+            path.append(current)
+        return path
+
+    @staticmethod
+    def shortest_path_tree(
+        graph: CompiledGraph,
+        target_idx: int,
+        lane_cost: Optional[Callable[[int, int, float], float]] = None
+    ) -> Tuple[List[float], List[int]]:
+        """
+        Reverse Dijkstra from target_idx. Returns the cost from every vertex to the
+        target and the next hop towards it (-1 when unreachable).
+        """
+        adjacency = graph.adjacency
+        dist = [float('inf')] * graph.num_vertices
+        next_hop = [-1] * graph.num_vertices
+        dist[target_idx] = 0.0
+        next_hop[target_idx] = target_idx
+        open_set = [(0.0, target_idx)]
+
+        while open_set:
+            current_g, current = heapq.heappop(open_set)
+            if current_g > dist[current]:
+                continue
+            for neighbor, _, length in adjacency[current]:
+                # Cost of driving neighbor -> current, the direction robots travel
+                cost = lane_cost(neighbor, current, length) if lane_cost else length
+                tentative_g = current_g + cost
+                if tentative_g < dist[neighbor]:
+                    dist[neighbor] = tentative_g
+                    next_hop[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g, neighbor))
+        return dist, next_hop
 
     @staticmethod
-    def prepare_for_caching(nav_graph: Dict, congestion_data: Optional[Dict] = None) -> tuple:
-        """Convert nav_graph and congestion_data to hashable types for caching"""
-        nav_graph_tuple = (
-            tuple(tuple(v) for v in nav_graph["vertices"]),
-            tuple(tuple(l) for l in nav_graph["lanes"])
-        )
-        congestion_tuple = tuple(congestion_data.items()) if congestion_data else None
-        return nav_graph_tuple, congestion_tuple
\ No newline at end of file
+    def _heuristic_to(graph: CompiledGraph, end_idx: int) -> List[float]:
+        """Straight line distance from every vertex to end_idx"""
+        return np.hypot(graph.xs - graph.xs[end_idx], graph.ys - graph.ys[end_idx]).tolist()
@@ -0,0 +1,133 @@
+import heapq
+import threading
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from src.models.compiled_graph import CompiledGraph
+
+INF = float('inf')
+# cost(u, v, lane_length) -> cost of driving the lane from u to v
+LaneCost = Callable[[int, int, float], float]
+
+
+class DStarLite:
+    """
+    D* Lite search state for one robot.
+
+    The search runs backwards from the goal, so when the robot advances or lane
+    costs change only the affected vertices are re-expanded instead of
+    repeating the whole search. Lane changes may be reported from any thread;
+    they are queued and applied on the next plan() call.
+    """
+
+    def __init__(self, graph: CompiledGraph, start_idx: int, goal_idx: int, lane_cost: LaneCost):
+        self.graph = graph
+        self.start = start_idx
+        self.goal = goal_idx
+        self.lane_cost = lane_cost
+        self.km = 0.0
+        self.g: Dict[int, float] = {}
+        self.rhs: Dict[int, float] = {goal_idx: 0.0}
+        self._queue: List[Tuple[Tuple[float, float], int]] = []
+        self._open: Dict[int, Tuple[float, float]] = {}
+        self._pending_lanes: Set[int] = set()
+        self._pending_lock = threading.Lock()
+        self.expanded = 0
+        self._push(goal_idx)
+
+    ### PUBLIC API
+
+    def notify_lanes(self, lane_ids: Iterable[int]):
+        """Record lanes whose cost changed; repaired lazily on the next plan"""
+        with self._pending_lock:
+            self._pending_lanes.update(lane_ids)
+
+    def plan(self, start_idx: int) -> List[int]:
+        """Repair the search for the current start and return the path to the goal"""
+        if start_idx != self.start:
+            self.km += self.graph.distance(self.start, start_idx)
+            self.start = start_idx
+
+        with self._pending_lock:
+            changed, self._pending_lanes = self._pending_lanes, set()
+        for lane_id in changed:
+            u, v = self.graph.lane_keys[lane_id]
+            self._update_vertex(u)
+            self._update_vertex(v)
+
+        self._compute_shortest_path()
+        return self._extract_path()
+
+    ### D* LITE CORE
+
+    def _key(self, vertex: int) -> Tuple[float, float]:
+        best = min(self.g.get(vertex, INF), self.rhs.get(vertex, INF))
+        return (best + self.graph.distance(self.start, vertex) + self.km, best)
+
+    def _push(self, vertex: int):
+        key = self._key(vertex)
+        self._open[vertex] = key
+        heapq.heappush(self._queue, (key, vertex))
+
+    def _top_key(self) -> Tuple[float, float]:
+        while self._queue:
+            key, vertex = self._queue[0]
+            if self._open.get(vertex) == key:
+                return key
+            heapq.heappop(self._queue)
+        return (INF, INF)
+
+    def _update_vertex(self, vertex: int):
+        if vertex != self.goal:
+            best = INF
+            for neighbor, _, length in self.graph.adjacency[vertex]:
+                cost = self.lane_cost(vertex, neighbor, length) + self.g.get(neighbor, INF)
+                if cost < best:
+                    best = cost
+            self.rhs[vertex] = best
+        if self.g.get(vertex, INF) != self.rhs.get(vertex, INF):
+            self._push(vertex)
+        else:
+            self._open.pop(vertex, None)
+
+    def _compute_shortest_path(self):
+        start = self.start
+        while (self._top_key() < self._key(start)
+               or self.rhs.get(start, INF) != self.g.get(start, INF)):
+            if not self._queue:
+                break
+            old_key, vertex = heapq.heappop(self._queue)
+            if self._open.get(vertex) != old_key:
+                continue
+            if old_key == (INF, INF):
+                break
+            del self._open[vertex]
+            self.expanded += 1
+
+            new_key = self._key(vertex)
+            if old_key < new_key:
+                self._push(vertex)
+            elif self.g.get(vertex, INF) > self.rhs.get(vertex, INF):
+                self.g[vertex] = self.rhs[vertex]
+                for neighbor in self.graph.neighbors(vertex):
+                    self._update_vertex(neighbor)
+            else:
+                self.g[vertex] = INF
+                self._update_vertex(vertex)
+                for neighbor in self.graph.neighbors(vertex):
+                    self._update_vertex(neighbor)
+
+    def _extract_path(self) -> List[int]:
+        if self.g.get(self.start, INF) == INF:
+            return []
+        path = [self.start]
+        current = self.start
+        while current != self.goal and len(path) <= self.graph.num_vertices:
+            best, best_next = INF, None
+            for neighbor, _, length in self.graph.adjacency[current]:
+                cost = self.lane_cost(current, neighbor, length) + self.g.get(neighbor, INF)
+                if cost < best:
+                    best, best_next = cost, neighbor
+            if best_next is None:
+                return []
+            current = best_next
+            path.append(current)
+        return path if current == self.goal else []
@@ -0,0 +1,36 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterable
+
+
+class LockStripes:
+    """
+    Fixed pool of locks shared by many keys, picked by key hash.
+
+    Callers holding several keys always take their stripes in ascending order,
+    so any two callers agree on the order and cannot deadlock.
+    """
+
+    def __init__(self, count: int = 64):
+        self.count = count
+        self.locks = [threading.Lock() for _ in range(count)]
+        self._stats_lock = threading.Lock()
+        self.contentions = 0
+
+    @contextmanager
+    def hold(self, keys: Iterable[Hashable]):
+        """Hold the stripes guarding all of keys for the duration of the block"""
+        stripes = sorted({hash(key) % self.count for key in keys})
+        held = []
+        try:
+            for stripe in stripes:
+                lock = self.locks[stripe]
+                if not lock.acquire(blocking=False):
+                    with self._stats_lock:
+                        self.contentions += 1
+                    lock.acquire()
+                held.append(lock)
+            yield
+        finally:
+            for lock in reversed(held):
+                lock.release()
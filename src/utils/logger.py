@@ -1,14 +1,17 @@
 import os
+import time
 from datetime import datetime
 
 class RobotLogger:
     def __init__(self, log_dir="logs"):
         self.log_dir = log_dir
+        # Epoch seconds stamped on each entry; the event simulator swaps in its virtual clock
+        self.clock = time.time
         os.makedirs(self.log_dir, exist_ok=True)
         
-    def log_event(self, robot_id, action, path="", status="", battery=100, source_vertex=None, destination_vertex=None):
-        """Universal logging method for all robot events"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    def log_event(self, robot_id, action, path="", status="", battery=100, source_vertex=None, destination_vertex=None, **details):
+        """Universal logging method for all robot events; extra details are appended as Key:value"""
+        timestamp = datetime.fromtimestamp(self.clock()).strftime("%Y-%m-%d %H:%M:%S.%f")
         log_path = os.path.join(self.log_dir, f"robot_{robot_id}.log")
         
         log_entry_parts = [
@@ -24,6 +27,9 @@ class RobotLogger:
             log_entry_parts.append(f"From:{source_vertex}")
         if destination_vertex:
             log_entry_parts.append(f"To:{destination_vertex}")
+        for key, value in details.items():
+            if value is not None:
+                log_entry_parts.append(f"{key.capitalize()}:{value}")
         
         log_entry = " | ".join(log_entry_parts) + "\n"
         
@@ -0,0 +1,194 @@
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+from src.utils.distance_table import DistanceTable
+from src.utils.helper import PathFinder
+from src.utils.reservation_table import ReservationTable
+
+INF = float('inf')
+TIME_EPS = 1e-6
+# (vertex, arrival time, departure time) for every vertex a robot visits
+Schedule = List[Tuple[int, float, float]]
+
+
+class PrioritizedPlanner:
+    """
+    Centralized planner for a batch of robots using prioritized planning.
+
+    Robots are planned one at a time in priority order with Safe Interval Path
+    Planning (space-time A* over the free intervals of each vertex). Every
+    finished plan is booked in a ReservationTable, so later robots route and
+    wait around it: lanes are booked while driven, vertices while waited on,
+    and a robot's goal from its arrival onwards. A robot that cannot be
+    planned is moved to the front of the order and the batch restarts, until
+    the time budget runs out or the reordering starts to repeat itself.
+    """
+
+    def __init__(self, graph: CompiledGraph, default_speed: float = 1.0, margin: float = 0.5,
+                 time_budget: float = 1.0, max_wait: float = 60.0,
+                 distance_table: Optional[DistanceTable] = None):
+        self.graph = graph
+        self.distance_table = distance_table
+        self.default_speed = default_speed
+        self.margin = margin
+        self.time_budget = time_budget
+        self.max_wait = max_wait
+        self.lane_times = [
+            float(graph.lane_lengths[lane_id]) / self._speed(lane_id) for lane_id in range(graph.num_lanes)
+        ]
+        self.max_speed = max((self._speed(lane_id) for lane_id in range(graph.num_lanes)), default=default_speed)
+        self.expanded = 0
+        self.restarts = 0
+
+    def _speed(self, lane_id: int) -> float:
+        speed = self.graph.speed_limits[lane_id]
+        return float(speed) if speed > 0 else self.default_speed
+
+    def _time_to_goal(self, end_idx: int) -> List[float]:
+        """Lower bound on the driving time from every vertex to end_idx"""
+        if self.distance_table is not None:
+            dist = self.distance_table.dist[:, end_idx]
+        else:
+            dist = np.asarray(PathFinder.shortest_path_tree(self.graph, end_idx)[0])
+        return (dist / self.max_speed).tolist()
+
+    ### BATCH PLANNING
+
+    def plan(self, requests: Dict[str, Tuple[int, int]],
+             priorities: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Schedule]]:
+        """
+        Collision-free schedules for every robot_id -> (start_idx, end_idx),
+        times in seconds from a common departure. Higher priority robots plan
+        first; ties go to robots standing on another robot's goal, then to
+        the longer trip. Returns None if no complete set of
+        plans was found within the time budget.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        self.expanded = 0
+        self.restarts = 0
+        priorities = priorities or {}
+
+        to_goal = {}
+        for _, end_idx in requests.values():
+            if end_idx not in to_goal:
+                to_goal[end_idx] = self._time_to_goal(end_idx)
+        if any(to_goal[end_idx][start_idx] == INF for start_idx, end_idx in requests.values()):
+            return None
+
+        # Robots parked on another robot's goal must clear it first, so they go early
+        goals = {end_idx for _, end_idx in requests.values()}
+        order = sorted(requests, key=lambda robot_id: (
+            -priorities.get(robot_id, 0.0),
+            requests[robot_id][0] not in goals,
+            -to_goal[requests[robot_id][1]][requests[robot_id][0]]))
+        tried = {tuple(order)}
+        while time.perf_counter() < deadline:
+            table = ReservationTable(self.margin)
+            # Robots not planned yet stay parked on their start vertex
+            for robot_id, (start_idx, _) in requests.items():
+                if not table.book(robot_id, [(start_idx, 0.0, INF)]):
+                    # Two robots start on one vertex: no schedule can keep them apart
+                    return None
+
+            plans, failed = {}, None
+            for robot_id in order:
+                start_idx, end_idx = requests[robot_id]
+                table.release(robot_id)
+                schedule = self._plan_one(table, robot_id, start_idx, end_idx, to_goal[end_idx], deadline)
+                if schedule is None or not table.book(robot_id, self.schedule_windows(schedule)):
+                    failed = robot_id
+                    break
+                plans[robot_id] = schedule
+            if failed is None:
+                return plans
+            order.remove(failed)
+            order.insert(0, failed)
+            if tuple(order) in tried:
+                # The reordering cycles (or the robot fails even when planned first)
+                return None
+            tried.add(tuple(order))
+            self.restarts += 1
+        return None
+
+    def schedule_windows(self, schedule: Schedule) -> List[Tuple[object, float, float]]:
+        """Reservation windows of a schedule: its vertex waits and lane traversals"""
+        windows = [(vertex, arrive, depart) for vertex, arrive, depart in schedule]
+        for (u, _, depart), (v, arrive, _) in zip(schedule, schedule[1:]):
+            windows.append(((min(u, v), max(u, v)), depart, arrive))
+        return windows
+
+    ### SAFE INTERVAL PATH PLANNING
+
+    def _plan_one(self, table: ReservationTable, robot_id: str, start_idx: int, end_idx: int,
+                  to_goal: List[float], deadline: float) -> Optional[Schedule]:
+        adjacency = self.graph.adjacency
+        start_free = table.free_until(start_idx, 0.0, robot_id)
+        if start_free is None:
+            return None
+
+        # State: (vertex, end of its safe interval); earliest arrival dominates within an interval
+        start_state = (start_idx, start_free)
+        best = {start_state: 0.0}
+        came_from: Dict[Tuple[int, float], Tuple[Tuple[int, float], float]] = {}
+        open_set = [(to_goal[start_idx], 0.0, start_state)]
+
+        while open_set:
+            _, arrive, state = heapq.heappop(open_set)
+            if arrive > best.get(state, INF):
+                continue
+            self.expanded += 1
+            if self.expanded % 256 == 0 and time.perf_counter() > deadline:
+                return None
+
+            vertex, free_end = state
+            if vertex == end_idx and free_end == INF:
+                return self._reconstruct(came_from, best, state)
+
+            latest_departure = min(free_end, arrive + self.max_wait)
+            for neighbor, lane_id, _ in adjacency[vertex]:
+                duration = self.lane_times[lane_id]
+                lane = (min(vertex, neighbor), max(vertex, neighbor))
+                for depart, free_end_next in self._departures(table, robot_id, lane, neighbor, arrive,
+                                                              duration, latest_departure):
+                    next_arrive = depart + duration
+                    next_state = (neighbor, free_end_next)
+                    if next_arrive < best.get(next_state, INF):
+                        best[next_state] = next_arrive
+                        came_from[next_state] = (state, depart)
+                        heapq.heappush(open_set, (next_arrive + to_goal[neighbor], next_arrive, next_state))
+        return None
+
+    @staticmethod
+    def _departures(table: ReservationTable, robot_id: str, lane, neighbor: int,
+                    earliest: float, duration: float, latest: float):
+        """
+        Earliest departure in [earliest, latest] into each safe interval of the
+        neighbor, as (departure, end of the neighbor's safe interval) pairs.
+        """
+        depart = earliest
+        while depart <= latest:
+            booking = table.conflict(lane, depart, depart + duration, robot_id)
+            if booking is not None:
+                depart = booking[1]
+                continue
+            free_end = table.free_until(neighbor, depart + duration, robot_id)
+            if free_end is not None:
+                yield depart, free_end
+                if free_end == INF:
+                    return
+                booking = table.conflict(neighbor, free_end, free_end, robot_id)
+            else:
+                booking = table.conflict(neighbor, depart + duration, depart + duration, robot_id)
+            # Nudge past rounding so the arrival lands after the booking, not on it
+            depart = booking[1] - duration + TIME_EPS
+
+    @staticmethod
+    def _reconstruct(came_from, best, state) -> Schedule:
+        schedule = [(state[0], best[state], INF)]
+        while state in came_from:
+            state, depart = came_from[state]
+            schedule.append((state[0], best[state], depart))
+        schedule.reverse()
+        return schedule
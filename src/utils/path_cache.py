@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CacheKey = Tuple[int, int, int, int]
+
+
+class PathCache:
+    """Bounded LRU cache of paths keyed by (graph version, start, end, congestion epoch)"""
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, Tuple[int, ...]]" = OrderedDict()
+        self._keys_by_lane: Dict[Tuple[int, int], Set[CacheKey]] = defaultdict(set)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _lanes(path: Iterable[int]) -> List[Tuple[int, int]]:
+        path = list(path)
+        return [(min(u, v), max(u, v)) for u, v in zip(path, path[1:])]
+
+    def get(self, key: CacheKey) -> Optional[List[int]]:
+        """Cached path for key (most recently used), or None on a miss"""
+        with self.lock:
+            path = self._entries.get(key)
+            if path is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(path)
+
+    def put(self, key: CacheKey, path: List[int]):
+        """Store a path, evicting the least recently used entry when full"""
+        with self.lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = tuple(path)
+            for lane in self._lanes(path):
+                self._keys_by_lane[lane].add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_lanes(self, lanes: Iterable[Tuple[int, int]]) -> int:
+        """Drop only the entries whose paths use one of the given lanes"""
+        with self.lock:
+            keys = set()
+            for u, v in lanes:
+                keys |= self._keys_by_lane.get((min(u, v), max(u, v)), set())
+            for key in keys:
+                self._discard(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._keys_by_lane.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _discard(self, key: CacheKey):
+        path = self._entries.pop(key, None)
+        if path is None:
+            return
+        for lane in self._lanes(path):
+            keys = self._keys_by_lane.get(lane)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_lane[lane]
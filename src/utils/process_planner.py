@@ -0,0 +1,124 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+import numpy as np
+from src.models.compiled_graph import CompiledGraph
+from src.models.congestion_map import CongestionSnapshot, cost_factors
+from src.models.shared_graph import Layout, SharedGraph
+from src.utils.helper import PathFinder
+
+
+class ProcessPlanner:
+    """
+    Plans batches of (start_idx, end_idx) queries with PathFinder in a pool
+    of worker processes, so large planning waves are not serialized by the GIL.
+
+    The compiled graph lives in shared memory and every worker attaches to it
+    once, when it starts. Lane cost factors for the congestion (the same
+    cost_factors the in-process planners use) are published to a second shared
+    block under an epoch that only changes when the snapshot does, so each
+    task sent to a worker is just (start, end, congestion epoch). Workers
+    search uncached: wave queries rarely repeat, and the PathCache
+    bookkeeping costs more than it saves.
+    """
+
+    # Queries sent to a worker at a time, at most
+    CHUNK = 64
+
+    def __init__(self, graph: CompiledGraph, workers: Optional[int] = None):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.shared = SharedGraph.create(graph)
+        # int64 epoch followed by one float64 cost factor per lane
+        self._congestion_shm = SharedMemory(create=True, size=8 * (graph.num_lanes + 1))
+        self._epoch = np.ndarray((1,), dtype=np.int64, buffer=self._congestion_shm.buf)
+        self._factors = np.ndarray((graph.num_lanes,), dtype=np.float64,
+                                   buffer=self._congestion_shm.buf, offset=8)
+        self._epoch[0] = 0
+        self.epoch = 0
+        self._published: Optional[CongestionSnapshot] = None
+        # Held for a whole batch, so factors are never rewritten while workers read them
+        self.lock = threading.Lock()
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.shared.name, self.shared.layout, self._congestion_shm.name,
+                      graph.num_lanes, graph.default_speed)
+        )
+
+    def plan_batch(self, queries: List[Tuple[int, int]],
+                   congestion: Optional[CongestionSnapshot] = None) -> List[List[int]]:
+        """Path per query ([] when unreachable or start == end), with lanes scaled by congestion"""
+        if not queries:
+            return []
+        with self.lock:
+            epoch = self._publish(congestion)
+            tasks = [(start_idx, end_idx, epoch) for start_idx, end_idx in queries]
+            chunksize = max(1, min(self.CHUNK, len(tasks) // (4 * self.workers)))
+            return list(self.pool.map(_plan_query, tasks, chunksize=chunksize))
+
+    def _publish(self, congestion: Optional[CongestionSnapshot]) -> int:
+        """Epoch of congestion's cost factors in shared memory; 0 means no congestion"""
+        if congestion is None or congestion.is_clear():
+            return 0
+        if congestion is not self._published:
+            self.epoch += 1
+            self._factors[:] = cost_factors(congestion.levels)
+            self._epoch[0] = self.epoch
+            self._published = congestion
+        return self.epoch
+
+    def close(self):
+        """Stop the workers and free the shared blocks"""
+        self.pool.shutdown()
+        self._epoch = self._factors = None
+        self._congestion_shm.close()
+        self._congestion_shm.unlink()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+### PROCESS POOL WORKERS
+
+_worker_graph: Optional[CompiledGraph] = None
+_worker_shared: Optional[SharedGraph] = None
+_worker_congestion: Optional[SharedMemory] = None
+_worker_epoch: Optional[np.ndarray] = None
+_worker_factors: Optional[np.ndarray] = None
+# (epoch, factors as a list) last read by this worker
+_worker_values: Tuple[int, Optional[List[float]]] = (0, None)
+
+
+def _init_worker(graph_name: str, layout: Layout, congestion_name: str,
+                 num_lanes: int, default_speed: float):
+    global _worker_graph, _worker_shared, _worker_congestion, _worker_epoch, _worker_factors
+    _worker_shared = SharedGraph.attach(graph_name, layout)
+    _worker_graph = _worker_shared.graph(default_speed)
+    _worker_congestion = SharedMemory(name=congestion_name)
+    _worker_epoch = np.ndarray((1,), dtype=np.int64, buffer=_worker_congestion.buf)
+    _worker_factors = np.ndarray((num_lanes,), dtype=np.float64, buffer=_worker_congestion.buf, offset=8)
+
+
+def _congestion_values(epoch: int) -> Optional[List[float]]:
+    global _worker_values
+    if epoch == 0:
+        return None
+    if _worker_values[0] != epoch:
+        if int(_worker_epoch[0]) != epoch:
+            raise RuntimeError(f"Congestion epoch {epoch} is no longer published")
+        _worker_values = (epoch, _worker_factors.tolist())
+    return _worker_values[1]
+
+
+def _plan_query(query: Tuple[int, int, int]) -> List[int]:
+    start_idx, end_idx, epoch = query
+    if start_idx == end_idx:
+        return []
+    return PathFinder.search(_worker_graph, start_idx, end_idx, _congestion_values(epoch))
@@ -0,0 +1,144 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from src.utils.lock_stripes import LockStripes
+
+# (lane, enter time, exit time) of one planned lane traversal
+Window = Tuple[Hashable, float, float]
+
+
+class ReservationTable:
+    """
+    Space-time lane bookings: each robot holds a lane only for the interval it
+    is planned to be on it, padded by a safety margin on both sides.
+
+    Bookings per lane are kept sorted by start time. A whole route is booked
+    atomically under the lock stripes of its lanes.
+    """
+
+    def __init__(self, margin: float = 1.0, stripes: int = 64):
+        self.margin = margin
+        self.locks = LockStripes(stripes)
+        # lane -> sorted [(start, end, robot_id)], margin already applied
+        self._bookings: Dict[Hashable, List[Tuple[float, float, str]]] = defaultdict(list)
+        # lane -> booking start times, parallel to _bookings for bisecting
+        self._starts: Dict[Hashable, List[float]] = defaultdict(list)
+        self._lanes_by_robot: Dict[str, set] = defaultdict(set)
+
+    ### QUERIES
+
+    def conflict(self, lane: Hashable, start: float, end: float,
+                 robot_id: Optional[str] = None) -> Optional[Tuple[float, float, str]]:
+        """First booking of another robot overlapping [start, end] on lane, or None"""
+        bookings = self._bookings.get(lane, ())
+        # Bookings starting after `end` cannot overlap
+        hi = bisect.bisect_right(self._starts.get(lane, ()), end)
+        for booking in bookings[:hi]:
+            if booking[1] > start and booking[2] != robot_id:
+                return booking
+        return None
+
+    def is_free(self, lane: Hashable, start: float, end: float, robot_id: Optional[str] = None) -> bool:
+        return self.conflict(lane, start, end, robot_id) is None
+
+    def free_until(self, key: Hashable, t: float, robot_id: Optional[str] = None) -> Optional[float]:
+        """End of the free interval containing t (inf if never booked again), None if t is booked"""
+        bookings = self._bookings.get(key, ())
+        hi = bisect.bisect_right(self._starts.get(key, ()), t)
+        for booking in bookings[:hi]:
+            if booking[1] > t and booking[2] != robot_id:
+                return None
+        for booking in bookings[hi:]:
+            if booking[2] != robot_id:
+                return booking[0]
+        return float('inf')
+
+    def earliest_delay(self, windows: Iterable[Window], robot_id: Optional[str] = None,
+                       max_delay: float = float('inf')) -> Optional[float]:
+        """
+        Smallest delay so that every window, shifted by it, is conflict free.
+        Returns None if no such delay exists within max_delay.
+        """
+        windows = list(windows)
+        delay = 0.0
+        while delay <= max_delay:
+            pushed = False
+            for lane, start, end in windows:
+                booking = self.conflict(lane, start + delay, end + delay, robot_id)
+                if booking is not None:
+                    # Enter this lane only once the blocking booking, margin included, has passed
+                    delay = booking[1] - start
+                    pushed = True
+                    break
+            if not pushed:
+                return delay
+        return None
+
+    def bookings(self, lane: Hashable) -> List[Tuple[float, float, str]]:
+        """Bookings on a lane with their margins, ordered by start time"""
+        return list(self._bookings.get(lane, ()))
+
+    ### BOOKING
+
+    def book(self, robot_id: str, windows: Iterable[Window]) -> bool:
+        """Book every window for robot_id, or none of them if any conflicts"""
+        windows = list(windows)
+        lanes = {lane for lane, _, _ in windows}
+        with self.locks.hold(lanes):
+            if any(self.conflict(lane, start, end, robot_id) for lane, start, end in windows):
+                return False
+            for lane, start, end in windows:
+                booking = (start - self.margin, end + self.margin, robot_id)
+                i = bisect.bisect_right(self._bookings[lane], booking)
+                self._bookings[lane].insert(i, booking)
+                self._starts[lane].insert(i, booking[0])
+            self._lanes_by_robot[robot_id].update(lanes)
+        return True
+
+    def book_earliest(self, robot_id: str, windows: Iterable[Window],
+                      max_delay: float = float('inf')) -> Optional[float]:
+        """Book the windows at the earliest conflict-free delay; returns the delay or None"""
+        windows = list(windows)
+        while True:
+            delay = self.earliest_delay(windows, robot_id, max_delay)
+            if delay is None:
+                return None
+            shifted = [(lane, start + delay, end + delay) for lane, start, end in windows]
+            if self.book(robot_id, shifted):
+                return delay
+
+    def release(self, robot_id: str, lanes: Optional[Iterable[Hashable]] = None):
+        """Drop robot_id's bookings, on all its lanes or only the given ones"""
+        lanes = set(self._lanes_by_robot.get(robot_id, ()) if lanes is None else lanes)
+        with self.locks.hold(lanes):
+            for lane in lanes:
+                bookings = self._bookings.get(lane)
+                if bookings:
+                    self._replace(lane, [b for b in bookings if b[2] != robot_id])
+            held = self._lanes_by_robot.get(robot_id)
+            if held is not None:
+                held.difference_update(lanes)
+                if not held:
+                    del self._lanes_by_robot[robot_id]
+
+    def expire(self, now: float) -> int:
+        """Drop bookings that ended before now; returns how many were removed"""
+        removed = 0
+        for lane in list(self._bookings):
+            with self.locks.hold([lane]):
+                bookings = self._bookings.get(lane)
+                if not bookings:
+                    continue
+                kept = [b for b in bookings if b[1] >= now]
+                removed += len(bookings) - len(kept)
+                self._replace(lane, kept)
+        return removed
+
+    def _replace(self, lane: Hashable, bookings: List[Tuple[float, float, str]]):
+        """Swap in a lane's (still sorted) bookings, dropping the lane when empty"""
+        if bookings:
+            self._bookings[lane] = bookings
+            self._starts[lane] = [b[0] for b in bookings]
+        else:
+            self._bookings.pop(lane, None)
+            self._starts.pop(lane, None)
@@ -0,0 +1,50 @@
+import random
+import pytest
+from src.models.compiled_graph import CompiledGraph
+from src.utils.helper import PathFinder
+from src.utils.incremental_planner import DStarLite
+
+
+def jittered_grid(side, seed):
+    """side x side grid with jittered coordinates, so shortest paths are rarely tied"""
+    rng = random.Random(seed)
+    vertices = [[x * 10.0 + rng.uniform(-2, 2), y * 10.0 + rng.uniform(-2, 2)]
+                for y in range(side) for x in range(side)]
+    lanes = []
+    for y in range(side):
+        for x in range(side):
+            v = y * side + x
+            if x + 1 < side:
+                lanes.append([v, v + 1])
+            if y + 1 < side:
+                lanes.append([v, v + side])
+    return CompiledGraph(vertices, lanes)
+
+
+def path_cost(graph, path, factors):
+    return sum(graph.lane_length(u, v) * factors[graph.lane_id(u, v)] for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replan_after_notify_lanes_matches_fresh_search(seed):
+    rng = random.Random(seed)
+    graph = jittered_grid(8, seed)
+    factors = [1.0] * graph.num_lanes
+    planner = DStarLite(graph, 0, graph.num_vertices - 1,
+                        lambda u, v, length: length * factors[graph.lane_id(u, v)])
+    path = planner.plan(0)
+    assert path_cost(graph, path, factors) == pytest.approx(
+        path_cost(graph, PathFinder._a_star_search(graph, 0, graph.num_vertices - 1), factors))
+
+    for _ in range(4):
+        # Congest part of the current path, then advance the robot one step along it
+        changed = rng.sample(graph.path_lanes(path), max(1, len(path) // 3))
+        for lane_id in changed:
+            factors[lane_id] += rng.uniform(1.0, 5.0)
+        planner.notify_lanes(changed)
+        start_idx = path[1] if len(path) > 2 else path[0]
+
+        path = planner.plan(start_idx)
+        expected = PathFinder._a_star_search(graph, start_idx, graph.num_vertices - 1, factors)
+        assert path[0] == start_idx and path[-1] == graph.num_vertices - 1
+        assert path_cost(graph, path, factors) == pytest.approx(path_cost(graph, expected, factors))
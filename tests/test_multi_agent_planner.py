@@ -0,0 +1,59 @@
+import itertools
+from src.models.compiled_graph import CompiledGraph
+from src.utils.multi_agent_planner import PrioritizedPlanner
+
+
+def corridor(siding=True):
+    """0 - 1 - ... - 6 along x, with a siding 7 off vertex 4"""
+    vertices = [[10.0 * i, 0.0] for i in range(7)]
+    lanes = [[i, i + 1] for i in range(6)]
+    if siding:
+        vertices.append([40.0, 10.0])
+        lanes.append([4, 7])
+    return CompiledGraph(vertices, lanes)
+
+
+# Robots driving head-on through the corridor; neither ends on the other's start
+HEAD_ON = {"A": (0, 5), "B": (6, 1)}
+
+
+def overlaps(a, b):
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def occupancy(schedule):
+    """(resource, start, end) of a schedule: its vertex stays and lane traversals"""
+    for vertex, arrive, depart in schedule:
+        yield vertex, arrive, depart
+    for (u, _, depart), (v, arrive, _) in zip(schedule, schedule[1:]):
+        yield (min(u, v), max(u, v)), depart, arrive
+
+
+def test_head_on_corridor_plans_without_conflicts():
+    graph = corridor()
+    planner = PrioritizedPlanner(graph, default_speed=1.0, margin=0.5)
+    plans = planner.plan(HEAD_ON)
+
+    assert plans is not None
+    # One of them has to pull into the siding to let the other pass
+    assert any(7 in [vertex for vertex, _, _ in schedule] for schedule in plans.values())
+    for robot_id, (start_idx, end_idx) in HEAD_ON.items():
+        schedule = plans[robot_id]
+        assert schedule[0][0] == start_idx and schedule[-1][0] == end_idx
+        for (u, arrive, depart), (v, next_arrive, _) in zip(schedule, schedule[1:]):
+            assert graph.lane_id(u, v) is not None
+            assert arrive <= depart < next_arrive
+
+    for (resource_a, *span_a), (resource_b, *span_b) in itertools.product(
+            occupancy(plans["A"]), occupancy(plans["B"])):
+        assert not (resource_a == resource_b and overlaps(span_a, span_b)), (resource_a, span_a, span_b)
+
+
+def test_head_on_corridor_without_siding_has_no_plan():
+    planner = PrioritizedPlanner(corridor(siding=False), default_speed=1.0, margin=0.5, time_budget=0.5)
+    assert planner.plan(HEAD_ON) is None
+
+
+def test_robots_sharing_a_start_vertex_have_no_plan():
+    planner = PrioritizedPlanner(corridor(), default_speed=1.0, margin=0.5)
+    assert planner.plan({"A": (0, 5), "B": (0, 6)}) is None
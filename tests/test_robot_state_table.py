@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from src.models.robot_state_table import RobotStateTable
+
+ROBOTS = 200
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubRobot:
+    """The attributes of a Robot the table writes"""
+
+    def __init__(self, robot_id):
+        self.robot_id = robot_id
+        self.status = "moving"
+        self.battery_level = 100
+        self.lane = 0
+
+    def current_lane(self, now):
+        return self.lane
+
+
+def write_until_done(name, done):
+    """Rewrite every row, keeping y == -x and lane == x % 1000 within each write"""
+    table = RobotStateTable.attach(name, ROBOTS)
+    robots = [StubRobot(f"R{i}") for i in range(ROBOTS)]
+    table.row_of = {robot.robot_id: i for i, robot in enumerate(robots)}
+    k = 0
+    while not done.is_set():
+        k += 1
+        for robot in robots:
+            robot.lane = k % 1000
+        table.write_robots(robots, [(float(k), float(-k))] * ROBOTS, float(k))
+    table.close()
+
+
+def torn_rows(rows):
+    return int(np.count_nonzero((rows["y"] != -rows["x"]) |
+                                (rows["lane"] != rows["x"].astype(np.int64) % 1000) |
+                                (rows["seq"] & 1).astype(bool)))
+
+
+def test_concurrent_reader_never_sees_a_torn_row():
+    table = RobotStateTable.create(ROBOTS)
+    try:
+        table.write_robots([StubRobot(f"R{i}") for i in range(ROBOTS)], [(0.0, 0.0)] * ROBOTS, 0.0)
+        done = multiprocessing.Event()
+        writer = multiprocessing.Process(target=write_until_done, args=(table.name, done))
+        writer.start()
+        try:
+            deadline = time.monotonic() + 1.0
+            snapshots = torn = 0
+            versions = set()
+            while time.monotonic() < deadline:
+                rows = table.snapshot()
+                torn += torn_rows(rows)
+                versions.add(float(rows["x"][0]))
+                snapshots += 1
+        finally:
+            done.set()
+            writer.join()
+        assert snapshots > 0 and len(versions) > 1
+        assert torn == 0
+    finally:
+        table.close()
+
+
+def test_snapshot_waits_for_a_row_being_written():
+    table = RobotStateTable.create(4)
+    try:
+        robots = [StubRobot(f"R{i}") for i in range(4)]
+        table.write_robots(robots, [(1000.0, -1000.0)] * 4, 1.0)
+        # Leave row 2 half written: seq odd and y not yet matching x
+        table.seq[2] += 1
+        table.rows["x"][2] = 2000.0
+
+        def finish_write():
+            time.sleep(0.05)
+            table.rows["y"][2] = -2000.0
+            table.seq[2] += 1
+
+        finisher = threading.Thread(target=finish_write)
+        finisher.start()
+        rows = table.snapshot()
+        finisher.join()
+        assert (rows["x"][2], rows["y"][2]) == (2000.0, -2000.0)
+        assert torn_rows(rows[[0, 1, 3]]) == 0 and not rows["seq"][2] & 1
+        assert table.find("R2") == 2 and table.statuses(rows["status"]) == ["moving"] * 4
+    finally:
+        table.close()
+
+
+READER = """
+import sys
+from src.models.robot_state_table import RobotStateTable
+table = RobotStateTable.attach(sys.argv[1], int(sys.argv[2]))
+row = table.read(table.find("R1"))
+print(row["x"], row["y"])
+table.close()
+"""
+
+
+def test_reader_process_exit_leaves_the_table_to_its_owner():
+    table = RobotStateTable.create(4)
+    try:
+        robots = [StubRobot(f"R{i}") for i in range(4)]
+        table.write_robots(robots, [(3.0, -3.0)] * 4, 1.0)
+        # A reader that is not a multiprocessing child has its own resource tracker
+        reader = subprocess.run([sys.executable, "-c", READER, table.name, "4"],
+                                cwd=ROOT, capture_output=True, text=True, timeout=30)
+        assert reader.returncode == 0, reader.stderr
+        assert reader.stdout.split() == ["3.0", "-3.0"]
+        again = RobotStateTable.attach(table.name, 4)
+        assert again.read(again.find("R1"))["x"] == 3.0
+        again.close()
+    finally:
+        table.close()
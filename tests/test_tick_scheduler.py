@@ -0,0 +1,106 @@
+import pytest
+from src.controllers.simulator import VirtualClock
+from src.controllers.fleet_manager import FleetManager
+from src.controllers.tick_scheduler import DRIVE, IDLE, RESERVE, SCHEDULED
+from src.utils.logger import robot_logger
+
+START = 1000.0
+# 0 - 1 - 2 - 3 along x: every route from one end to the other uses lane (1, 2)
+CORRIDOR = {
+    "vertices": [[10.0 * i, 0.0, {"name": f"V{i}"}] for i in range(4)],
+    "lanes": [[i, i + 1, {"speed_limit": 0}] for i in range(3)],
+}
+LANE = (1, 2)
+
+
+@pytest.fixture
+def fleet(tmp_path, monkeypatch):
+    monkeypatch.setattr(robot_logger, "log_dir", str(tmp_path))
+    fleet = FleetManager(VirtualClock(START))
+    fleet.scheduler.autostart = False
+    fleet.set_nav_graph(CORRIDOR)
+    yield fleet
+    fleet.shutdown()
+
+
+def tick_at(fleet, t):
+    fleet.clock.advance_to(t)
+    fleet.scheduler.tick()
+
+
+def test_queued_robots_are_granted_their_lanes_in_fifo_order(fleet):
+    scheduler, traffic = fleet.scheduler, fleet.traffic_manager
+    # Patient enough to wait out the first robot's whole trip
+    fleet.reservation_wait_timeout = 60.0
+    first, _ = fleet.spawn_robot(0)
+    second, _ = fleet.spawn_robot(3)
+    # Held by a robot the scheduler does not drive
+    assert traffic.reserve_path("X", [1, 2])
+
+    scheduler.add(first, fleet.graph.coords[3])
+    tick_at(fleet, START)
+    scheduler.add(second, fleet.graph.coords[0])
+    tick_at(fleet, START + 0.05)
+
+    slots = [scheduler.slots[first.robot_id], scheduler.slots[second.robot_id]]
+    assert list(scheduler.phase[slots]) == [RESERVE, RESERVE]
+    assert list(traffic.waiting_queues[LANE]) == [first.robot_id, second.robot_id]
+    assert traffic.wait_for == {first.robot_id: {"X"}, second.robot_id: {"X"}}
+    assert first.status == second.status == "waiting"
+
+    traffic.release_path("X", [1, 2])
+    tick_at(fleet, START + 0.1)
+
+    # The robot queued first gets the lane; the other now waits for it
+    assert list(scheduler.phase[slots]) == [DRIVE, RESERVE]
+    assert traffic.lane_reservations[LANE] == first.robot_id
+    assert list(traffic.waiting_queues[LANE]) == [second.robot_id]
+    assert traffic.wait_for == {second.robot_id: {first.robot_id}}
+
+    tick_at(fleet, fleet.clock() + first.eta())
+    assert list(scheduler.phase[slots]) == [IDLE, DRIVE]
+    assert traffic.lane_reservations[LANE] == second.robot_id
+    assert not traffic.waiting_queues and not traffic.wait_for
+
+
+def test_queued_robot_replans_when_out_of_patience(fleet):
+    scheduler, traffic = fleet.scheduler, fleet.traffic_manager
+    robot, _ = fleet.spawn_robot(0)
+    assert traffic.reserve_path("X", [1, 2])
+
+    scheduler.add(robot, fleet.graph.coords[3])
+    tick_at(fleet, START)
+    assert list(traffic.waiting_queues[LANE]) == [robot.robot_id]
+
+    tick_at(fleet, START + fleet.reservation_wait_timeout)
+    # Left the queue to replan; it queues again on its next attempt
+    assert robot.robot_id not in traffic.waiting_queues.get(LANE, ())
+    assert robot.robot_id not in traffic.wait_for
+    assert traffic.lane_reservations[LANE] == "X"
+
+
+def test_assigned_task_is_driven_on_the_fleet_clock(fleet):
+    robot, _ = fleet.spawn_robot(0)
+    completed = []
+    robot.assign_task(fleet.graph.coords[3], lambda robot_id, task: completed.append(robot_id))
+
+    tick_at(fleet, START)
+    assert robot.status == "moving" and not completed
+    tick_at(fleet, fleet.clock() + robot.eta())
+    assert robot.status == "idle" and robot.current_task is None
+    assert completed == [robot.robot_id]
+
+
+def test_schedule_whose_lanes_were_booked_meanwhile_is_replanned(fleet):
+    scheduler, traffic = fleet.scheduler, fleet.traffic_manager
+    robot, _ = fleet.spawn_robot(0)
+    schedule = [(0, 0.0, 0.0), (1, 10.0, 10.0), (2, 20.0, 20.0), (3, 30.0, 30.0)]
+    assert traffic.reservation_table.book("X", [(LANE, START, START + 100.0)])
+
+    scheduler.add_schedule(robot, schedule, START)
+    tick_at(fleet, START)
+    slot = scheduler.slots[robot.robot_id]
+    # Planned and reserved on its own instead of driving the stale schedule
+    assert scheduler.legs[slot] != SCHEDULED
+    assert scheduler.targets[slot] == fleet.graph.coords[3]
+    assert traffic.reservation_table.bookings(LANE) == [(START - 1.0, START + 101.0, "X")]
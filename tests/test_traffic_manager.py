@@ -0,0 +1,37 @@
+import pytest
+from src.controllers.simulator import VirtualClock
+from src.controllers.fleet_manager import FleetManager
+from src.utils.logger import robot_logger
+
+START = 1000.0
+# Two routes from 0 to 3: via 1 (slightly shorter) and via 2
+SQUARE = {
+    "vertices": [[0.0, 0.0, {"name": "A"}], [10.0, 0.0, {"name": "B"}],
+                 [0.0, 11.0, {"name": "C"}], [10.0, 10.0, {"name": "D"}]],
+    "lanes": [[0, 1, {}], [1, 3, {}], [0, 2, {}], [2, 3, {}]],
+}
+
+
+@pytest.fixture
+def fleet(tmp_path, monkeypatch):
+    monkeypatch.setattr(robot_logger, "log_dir", str(tmp_path))
+    fleet = FleetManager(VirtualClock(START))
+    fleet.scheduler.autostart = False
+    fleet.set_nav_graph(SQUARE)
+    yield fleet
+    fleet.shutdown()
+
+
+def test_cached_paths_return_to_lanes_once_their_congestion_decays(fleet):
+    traffic = fleet.traffic_manager
+    assert traffic.find_least_congested_path(fleet.nav_graph, 0, 3) == [0, 1, 3]
+    assert traffic.plan_incremental("R1", 0, 3) == [0, 1, 3]
+
+    for _ in range(20):
+        traffic.record_traversal([0, 1])
+    assert traffic.find_least_congested_path(fleet.nav_graph, 0, 3) == [0, 2, 3]
+    assert traffic.plan_incremental("R1", 0, 3) == [0, 2, 3]
+
+    fleet.clock.advance_to(START + 10 * traffic.CONGESTION_HALF_LIFE)
+    assert traffic.find_least_congested_path(fleet.nav_graph, 0, 3) == [0, 1, 3]
+    assert traffic.plan_incremental("R1", 0, 3) == [0, 1, 3]
@@ -0,0 +1,30 @@
+import pytest
+from src.controllers.zone_traffic import ZonedTrafficManager
+from src.models.compiled_graph import CompiledGraph
+
+
+def grid(side):
+    vertices = [[x * 10.0, y * 10.0] for y in range(side) for x in range(side)]
+    lanes = []
+    for y in range(side):
+        for x in range(side):
+            v = y * side + x
+            if x + 1 < side:
+                lanes.append([v, v + 1])
+            if y + 1 < side:
+                lanes.append([v, v + side])
+    return CompiledGraph(vertices, lanes)
+
+
+def test_reserve_raises_instead_of_hanging_when_a_zone_worker_dies():
+    graph = grid(6)
+    path = list(range(6))
+    with ZonedTrafficManager(graph, 2, 1) as traffic:
+        traffic.POLL_INTERVAL = 0.05
+        assert traffic.reserve_path("R1", path)
+        traffic.release_path("R1")
+
+        traffic.processes[0].kill()
+        traffic.processes[0].join()
+        with pytest.raises(RuntimeError, match="zone-0"):
+            traffic.reserve_path("R2", path)